@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Low-memory article loading for streaming builds (generator.py --stream)
+
+A normal build holds every article, including its full HTML content, for
+the whole run. Only the article pages need the content; the homepage,
+category pages, related-article cards, sitemap, images and social cards
+only use a few short fields. A streaming build therefore reads the data
+twice:
+
+1. scan(): every JSON file is parsed incrementally and each article is
+   reduced to a compact listing record (LISTING_FIELDS) that the indexes
+   and listing pages are built from
+2. chunks(): full articles are parsed again, file by file, and handed to
+   the renderer in chunks whose estimated size stays within the memory
+   budget; each chunk is released before the next one is read
+
+Files are never loaded whole: iter_json_records() decodes one array
+element at a time from a fixed-size read buffer. Memory is then bounded by
+the budget plus the listing index (a few hundred bytes per article), not
+by the size of the corpus.
+"""
+
+import os
+import re
+import glob
+import json
+
+
+# Article fields kept in the listing index (everything but the article page)
+LISTING_FIELDS = (
+    'id', 'title', 'slug', 'category', 'category_slug', 'excerpt',
+    'source', 'published_date', 'updated_date', 'image_url',
+)
+
+# Characters read from a file at a time
+BUFFER_SIZE = 64 * 1024
+
+# Default budget for full articles held at once
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+# Estimated memory of a parsed article beyond its JSON text (dict and
+# string object headers)
+RECORD_OVERHEAD = 2048
+
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2,
+              'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+
+def parse_size(value):
+    """Parse a size such as '64MB', '512K' or '1000000' into bytes."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*', str(value))
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value!r} (expected e.g. 64MB, 512K)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def iter_json_records(path, buffer_size=BUFFER_SIZE):
+    """
+    Decode a JSON file holding an array of records, one record at a time
+
+    A file holding a single object yields that object.
+
+    Yields:
+        (record, size): the decoded element and the length of its JSON text
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = f.read(buffer_size)
+        eof = not buf
+        pos = 0
+
+        def refill():
+            nonlocal buf, pos, eof
+            more = f.read(buffer_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+        while not eof and not buf[pos:].lstrip():
+            refill()
+        start = buf[pos:].lstrip()[:1]
+        if start == '{':
+            text = buf[pos:] + f.read()
+            yield json.loads(text), len(text)
+            return
+        if start != '[':
+            raise ValueError(f"{path}: expected a JSON array or object")
+        pos = buf.index('[', pos) + 1
+
+        while True:
+            # Skip separators, refilling the buffer as needed
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                refill()
+                continue
+            if buf[pos] == ']':
+                return
+
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            if end == len(buf) and not eof:
+                # A number or literal may continue in the next block
+                refill()
+                continue
+
+            yield record, end - pos
+            pos = end
+            if pos >= buffer_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+class ArticleStream:
+    """Listing index plus chunked access to the full articles on disk"""
+
+    def __init__(self, data_dir='data/articles', budget=DEFAULT_BUDGET, prepare=None):
+        """
+        Args:
+            data_dir: Directory of article JSON files
+            budget: Bytes of full articles to hold at once (estimated)
+            prepare: Optional function applied to every article and listing
+                record after it is read (e.g. to add formatted dates)
+        """
+        self.data_dir = data_dir
+        self.budget = budget
+        self.prepare = prepare
+        # Same order as load_articles(), so related articles match a normal build
+        self.files = glob.glob(os.path.join(data_dir, '*.json'))
+        self.chunk_sizes = []
+
+    def scan(self):
+        """
+        First pass: build the compact listing records
+
+        Returns:
+            List of dicts holding LISTING_FIELDS (fields the article lacks
+            are left out), in file order
+        """
+        listings = []
+        for json_file in self.files:
+            try:
+                for article, _ in iter_json_records(json_file):
+                    listing = {k: article[k] for k in LISTING_FIELDS if k in article}
+                    if self.prepare is not None:
+                        self.prepare(listing)
+                    listings.append(listing)
+                print(f"Scanned {json_file}")
+            except (OSError, ValueError) as e:
+                print(f"Error loading {json_file}: {e}")
+        return listings
+
+    def chunks(self, ids=None):
+        """
+        Second pass: yield lists of full articles within the memory budget
+
+        Args:
+            ids: Only yield articles whose id is in this set (None: all)
+
+        Yields:
+            Lists of article dicts; an article larger than the budget is
+            yielded alone
+        """
+        chunk = []
+        chunk_bytes = 0
+        for json_file in self.files:
+            try:
+                for article, size in iter_json_records(json_file):
+                    if ids is not None and article.get('id') not in ids:
+                        continue
+                    cost = size + RECORD_OVERHEAD
+                    if chunk and chunk_bytes + cost > self.budget:
+                        yield self._emit(chunk, chunk_bytes)
+                        chunk, chunk_bytes = [], 0
+                    if self.prepare is not None:
+                        self.prepare(article)
+                    chunk.append(article)
+                    chunk_bytes += cost
+            except (OSError, ValueError) as e:
+                print(f"Error loading {json_file}: {e}")
+        if chunk:
+            yield self._emit(chunk, chunk_bytes)
+
+    def _emit(self, chunk, chunk_bytes):
+        self.chunk_sizes.append(chunk_bytes)
+        return chunk
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Brand asset rendering pipeline (favicons and logos)
+
+Shared by generate_favicons.py, generate_favicons_simple.py,
+generate_logos.py, generate_square_logos.py and generate_official_logos.py.
+
+Each asset describes one source and every file derived from it:
+
+    {
+        'name': 'favicon',
+        'renderer': 'svg',                   # 'svg', 'html' or 'draw'
+        'source': '<svg ...>...</svg>',      # SVG/HTML markup
+        'outputs': {'static/favicon/favicon-16x16.png': 16, ...},
+        'ico': {'path': 'static/favicon/favicon.ico', 'sizes': [16, 32, 48]},
+    }
+
+Renderers:
+- svg:  rasterized with cairosvg
+- html: markup loaded in headless Chromium (needed when the SVG relies on
+        system fonts); 'viewport' gives the CSS size, 'transparent' drops
+        the page background
+- draw: 'draw' is a module-level function(size) returning a PIL image
+
+The source is rasterized once at the largest output size and every smaller
+size is derived with Lanczos downscaling. Independent assets render in
+parallel, and an asset whose source and size list hash to the value stored
+in .build_cache/brand_assets.json is skipped, as long as its output files
+are still the ones written by that run.
+"""
+
+import os
+import io
+import json
+import inspect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+MANIFEST_PATH = os.path.join('.build_cache', 'brand_assets.json')
+
+# Bump when rendering changes in a way that should invalidate every asset
+PIPELINE_VERSION = 1
+
+
+def output_size(size):
+    """Normalize an output size (int for square, or (width, height))."""
+    if isinstance(size, int):
+        return (size, size)
+    return tuple(size)
+
+
+def largest_size(asset):
+    """The size the source is rasterized at: the widest output or ICO entry."""
+    sizes = [output_size(s) for s in asset['outputs'].values()]
+    if asset.get('ico'):
+        sizes.extend(output_size(s) for s in asset['ico']['sizes'])
+    return max(sizes)
+
+
+def asset_key(asset):
+    """Hash the source together with everything that shapes the outputs."""
+    source = asset.get('source')
+    if asset['renderer'] == 'draw' and source is None:
+        source = inspect.getsource(asset['draw'])
+
+    payload = json.dumps({
+        'version': PIPELINE_VERSION,
+        'renderer': asset['renderer'],
+        'source': source,
+        'outputs': {path: output_size(size) for path, size in sorted(asset['outputs'].items())},
+        'ico': asset.get('ico'),
+        'viewport': asset.get('viewport'),
+        'transparent': asset.get('transparent', True),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def asset_paths(asset):
+    """Every file an asset writes."""
+    paths = list(asset['outputs'])
+    if asset.get('ico'):
+        paths.append(asset['ico']['path'])
+    return paths
+
+
+def file_signature(path):
+    """Size and mtime of a file, or None when it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_current(asset, key, entry):
+    """True when the manifest entry matches the asset and its files are untouched."""
+    if not entry or entry.get('key') != key:
+        return False
+    outputs = entry.get('outputs', {})
+    return all(
+        path in outputs and file_signature(path) == outputs[path]
+        for path in asset_paths(asset)
+    )
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def _rasterize_svg(asset, size):
+    try:
+        import cairosvg
+    except ImportError:
+        raise RuntimeError("cairosvg is required for SVG assets (pip install cairosvg)")
+
+    png_data = cairosvg.svg2png(
+        bytestring=asset['source'].encode('utf-8'),
+        output_width=size[0],
+        output_height=size[1]
+    )
+    return Image.open(io.BytesIO(png_data))
+
+
+def _rasterize_html(asset, size):
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        raise RuntimeError("playwright is required for HTML assets (pip install playwright)")
+
+    viewport_width, viewport_height = asset.get('viewport', size)
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(
+            viewport={'width': viewport_width, 'height': viewport_height},
+            device_scale_factor=size[0] / viewport_width
+        )
+        page.set_content(asset['source'])
+
+        # Wait for fonts to load
+        page.wait_for_timeout(500)
+
+        png_data = page.screenshot(omit_background=asset.get('transparent', True))
+        browser.close()
+
+    return Image.open(io.BytesIO(png_data))
+
+
+def _rasterize_draw(asset, size):
+    return asset['draw'](size[0])
+
+
+RASTERIZERS = {
+    'svg': _rasterize_svg,
+    'html': _rasterize_html,
+    'draw': _rasterize_draw,
+}
+
+
+def render_asset(asset):
+    """
+    Rasterize one asset at its largest size and derive every output
+
+    Args:
+        asset: Asset description (see module docstring)
+
+    Returns:
+        List of files written
+    """
+    master = RASTERIZERS[asset['renderer']](asset, largest_size(asset))
+    master.load()
+    if master.mode not in ('RGB', 'RGBA'):
+        master = master.convert('RGBA')
+
+    written = []
+    for path, size in asset['outputs'].items():
+        size = output_size(size)
+        image = master if master.size == size else master.resize(size, Image.LANCZOS)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        image.save(path, 'PNG')
+        written.append(path)
+
+    if asset.get('ico'):
+        ico = asset['ico']
+        os.makedirs(os.path.dirname(ico['path']) or '.', exist_ok=True)
+        master.save(ico['path'], format='ICO', sizes=[output_size(s) for s in ico['sizes']])
+        written.append(ico['path'])
+
+    return written
+
+
+def _render_job(asset):
+    try:
+        return asset['name'], render_asset(asset), None
+    except Exception as e:
+        return asset['name'], [], str(e)
+
+
+def render_assets(assets, manifest_path=MANIFEST_PATH, workers=None, force=False):
+    """
+    Render every asset whose source or sizes changed
+
+    Args:
+        assets: List of asset descriptions
+        manifest_path: Where source hashes from the last run are stored
+        workers: Process pool size (defaults to the CPU count)
+        force: Render even when the manifest says an asset is current
+
+    Returns:
+        Dictionary mapping asset name -> {'status': 'rendered' | 'skipped' |
+        'failed', 'files': [...], 'error': message or None}
+    """
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is required to render brand assets (pip install Pillow)")
+
+    manifest = load_manifest(manifest_path)
+    results = {}
+    pending = []
+
+    for asset in assets:
+        key = asset_key(asset)
+        if not force and is_current(asset, key, manifest.get(asset['name'])):
+            results[asset['name']] = {'status': 'skipped', 'files': asset_paths(asset), 'error': None}
+        else:
+            pending.append((asset, key))
+
+    if len(pending) == 1 or workers == 1:
+        outcomes = [_render_job(asset) for asset, _ in pending]
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_render_job, [asset for asset, _ in pending]))
+    else:
+        outcomes = []
+
+    keys = {asset['name']: key for asset, key in pending}
+    for name, files, error in outcomes:
+        if error:
+            manifest.pop(name, None)
+            results[name] = {'status': 'failed', 'files': files, 'error': error}
+        else:
+            manifest[name] = {
+                'key': keys[name],
+                'outputs': {path: file_signature(path) for path in files},
+            }
+            results[name] = {'status': 'rendered', 'files': files, 'error': None}
+
+    save_manifest(manifest, manifest_path)
+    return results
+
+
+def print_results(results):
+    """Print one line per asset and return the number of failures."""
+    failures = 0
+    for name, result in results.items():
+        if result['status'] == 'failed':
+            failures += 1
+            print(f"✗ {name}: {result['error']}")
+        elif result['status'] == 'skipped':
+            print(f"- {name}: unchanged, skipped")
+        else:
+            for path in result['files']:
+                print(f"✓ Generated: {path}")
+    return failures
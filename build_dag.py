@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Build graph for the site generators
+
+A build is a set of tasks, each declaring the tasks it takes its inputs
+from and the output files it writes. The scheduler runs them in dependency
+order, starting every task as soon as its inputs are ready, so independent
+tasks (homepage, sitemap, robots.txt, static copy, ...) overlap on a thread
+pool. Asking for one target builds only that task and what it depends on:
+
+    graph = BuildGraph('news')
+    graph.add('index', build_index)
+    graph.add('sitemap', write_sitemap, inputs=['index'], outputs=['sitemap.xml'])
+    graph.add('robots', write_robots, outputs=['robots.txt'])
+    results = graph.run(targets=['sitemap'])      # runs index, then sitemap
+
+A task function receives the results of its inputs as positional arguments,
+in the order the inputs were declared. Per-task start/end times are kept in
+graph.timings (and recorded as telemetry phases when a BuildTelemetry is
+passed to run()).
+
+Threads suit this build because page writing, image encoding and card
+drawing release the GIL or run in their own process pools; the CPU-bound
+template rendering of two tasks still shares one core. Tasks must not
+mutate data another task reads.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+# Worker threads used when the caller does not pass jobs
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+
+
+class BuildTask:
+    """One node of the build graph"""
+
+    def __init__(self, name, fn, inputs=(), outputs=()):
+        """
+        Args:
+            name: Task (and target) name
+            fn: Callable taking the results of `inputs` in order
+            inputs: Names of the tasks this task depends on
+            outputs: Files the task writes, relative to the output directory
+                (a trailing '/' stands for a whole directory)
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def __repr__(self):
+        return f'BuildTask({self.name!r}, inputs={self.inputs!r})'
+
+
+class BuildGraph:
+    """Tasks with declared inputs/outputs, run concurrently in dependency order"""
+
+    def __init__(self, build_name):
+        """
+        Args:
+            build_name: Name shown in reports ('news' or 'permits')
+        """
+        self.build_name = build_name
+        self.tasks = {}
+        self.timings = {}
+
+    def add(self, name, fn, inputs=(), outputs=()):
+        """Add a task; see BuildTask for the arguments."""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate build task: {name}")
+        task = BuildTask(name, fn, inputs, outputs)
+        self.tasks[name] = task
+        return task
+
+    def check(self):
+        """
+        Validate the graph
+
+        Raises:
+            ValueError: unknown input, dependency cycle, or two tasks declaring
+                the same output
+        """
+        writers = {}
+        for task in self.tasks.values():
+            for name in task.inputs:
+                if name not in self.tasks:
+                    raise ValueError(f"Task {task.name!r} depends on unknown task {name!r}")
+            for output in task.outputs:
+                if output in writers:
+                    raise ValueError(f"Tasks {writers[output]!r} and {task.name!r} both write {output}")
+                writers[output] = task.name
+
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                cycle = path[path.index(name):] + [name]
+                raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+            state[name] = 'visiting'
+            for dep in self.tasks[name].inputs:
+                visit(dep, path + [name])
+            state[name] = 'done'
+
+        for name in self.tasks:
+            visit(name, [])
+
+    def plan(self, targets=None):
+        """
+        Tasks needed for the given targets, in a valid (sequential) run order
+
+        Args:
+            targets: Task names to build (None builds every task)
+
+        Returns:
+            List of task names; dependencies always come before their users,
+            otherwise tasks keep the order they were added in
+        """
+        self.check()
+        if targets is None:
+            targets = list(self.tasks)
+        unknown = [t for t in targets if t not in self.tasks]
+        if unknown:
+            raise ValueError(f"Unknown build target(s): {', '.join(unknown)} "
+                             f"(available: {', '.join(self.tasks)})")
+
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.tasks[name].inputs)
+
+        order = []
+        placed = set()
+
+        def place(name):
+            if name in placed:
+                return
+            for dep in self.tasks[name].inputs:
+                place(dep)
+            placed.add(name)
+            order.append(name)
+
+        for name in self.tasks:
+            if name in needed:
+                place(name)
+        return order
+
+    def run(self, targets=None, jobs=DEFAULT_JOBS, telemetry=None):
+        """
+        Run the tasks needed for `targets`
+
+        Args:
+            targets: Task names to build (None builds every task)
+            jobs: Worker threads; 1 runs every task on the calling thread, in
+                plan order (needed by cProfile, which only sees that thread)
+            telemetry: Optional BuildTelemetry; each task runs in a phase of
+                the same name
+
+        Returns:
+            Dictionary of task name -> result for every task that ran
+
+        Raises:
+            The first exception raised by a task; tasks not yet started are
+            skipped, running ones are allowed to finish
+        """
+        order = self.plan(targets)
+        self.timings = {}
+        results = {}
+        origin = time.perf_counter()
+
+        def execute(name):
+            task = self.tasks[name]
+            args = [results[dep] for dep in task.inputs]
+            start = time.perf_counter()
+            try:
+                if telemetry is not None:
+                    with telemetry.phase(name):
+                        return task.fn(*args)
+                return task.fn(*args)
+            finally:
+                end = time.perf_counter()
+                self.timings[name] = {
+                    'start': start - origin,
+                    'end': end - origin,
+                    'seconds': end - start,
+                    'thread': threading.current_thread().name,
+                }
+
+        if jobs <= 1:
+            for name in order:
+                results[name] = execute(name)
+            return results
+
+        remaining = {name: set(self.tasks[name].inputs) for name in order}
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix=f'{self.build_name}-build') as pool:
+            while remaining or running:
+                if error is None:
+                    for name in [n for n in order if n in remaining and not remaining[n]]:
+                        del remaining[name]
+                        running[pool.submit(execute, name)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    results[name] = future.result()
+                    for deps in remaining.values():
+                        deps.discard(name)
+
+        if error is not None:
+            raise error
+        return results
+
+    def critical_path(self):
+        """
+        Longest chain of dependent tasks in the last run
+
+        Returns:
+            (task names from first to last, total seconds)
+        """
+        best = {}
+
+        def longest(name):
+            if name not in best:
+                chains = [longest(dep) for dep in self.tasks[name].inputs if dep in self.timings]
+                path, seconds = max(chains, key=lambda c: c[1], default=([], 0.0))
+                best[name] = (path + [name], seconds + self.timings[name]['seconds'])
+            return best[name]
+
+        return max((longest(name) for name in self.timings), key=lambda c: c[1], default=([], 0.0))
+
+    def print_timings(self):
+        """Print per-task start/end times of the last run and its critical path."""
+        if not self.timings:
+            return
+        print(f"\nBuild tasks ({self.build_name})")
+        print(f"  {'task':<32} {'start s':>9} {'end s':>9} {'wall s':>9}  thread")
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1]['start']):
+            print(f"  {name:<32} {timing['start']:>9.3f} {timing['end']:>9.3f} "
+                  f"{timing['seconds']:>9.3f}  {timing['thread']}")
+        path, seconds = self.critical_path()
+        elapsed = max(timing['end'] for timing in self.timings.values())
+        print(f"  Critical path: {' -> '.join(path)} ({seconds:.3f}s of {elapsed:.3f}s)")
+
+    def describe(self):
+        """Print every task with its inputs and outputs (for --list-targets)."""
+        for task in self.tasks.values():
+            inputs = ', '.join(task.inputs) or '-'
+            outputs = ', '.join(task.outputs) or '-'
+            print(f"  {task.name:<32} inputs: {inputs}")
+            print(f"  {'':<32} outputs: {outputs}")
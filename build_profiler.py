@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Profiling mode for the site generators (--profile)
+
+Two views of a build:
+
+- Hot-path timers around every page: time spent rendering the template
+  stream (including minification) and time spent writing it, aggregated per
+  template and ranked, so a slow template or a single pathological page
+  stands out
+- cProfile for the whole run, exported as a .prof file (pstats, snakeviz)
+  and as a speedscope file (https://www.speedscope.app) holding the call
+  tree plus a timeline of every page render
+
+Files are written to .build_cache/profile/<build>.prof,
+<build>.speedscope.json and <build>.pages.json.
+
+Timings under --profile include cProfile's overhead; compare them with each
+other, not with a normal build.
+"""
+
+import os
+import json
+import time
+import pstats
+import cProfile
+from contextlib import contextmanager
+
+
+PROFILE_DIR = os.path.join('.build_cache', 'profile')
+
+# Rows shown in the ranked report
+TOP_N = 10
+
+# Call tree depth exported to speedscope
+MAX_STACK_DEPTH = 60
+
+# Call tree branches smaller than this share of the run are not expanded
+MIN_BRANCH_SHARE = 0.0005
+
+
+class PageTimer:
+    """Times one page: template streaming vs. everything else (the write)"""
+
+    def __init__(self):
+        self.render_seconds = 0.0
+
+    def time_render(self, chunks):
+        """Wrap a chunk iterator, adding the time spent producing each chunk."""
+        chunks = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                self.render_seconds += time.perf_counter() - start
+                return
+            self.render_seconds += time.perf_counter() - start
+            yield chunk
+
+
+class RenderProfiler:
+    """Per-template and per-page render timings plus a whole-run cProfile"""
+
+    def __init__(self, build_name):
+        """
+        Args:
+            build_name: Name used for the exported files ('news' or 'permits')
+        """
+        self.build_name = build_name
+        self.pages = []
+        self.profile = cProfile.Profile()
+        self._origin = time.perf_counter()
+
+    def start(self):
+        self._origin = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    @contextmanager
+    def page(self, template_name, output_path):
+        """
+        Time one page
+
+        Usage:
+            with profiler.page(template.name, path) as timer:
+                chunks = timer.time_render(template.generate(**context))
+                ... write chunks ...
+        """
+        timer = PageTimer()
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            end = time.perf_counter()
+            self.pages.append({
+                'template': template_name,
+                'path': output_path,
+                'start': start - self._origin,
+                'end': end - self._origin,
+                'render_seconds': timer.render_seconds,
+                'write_seconds': max(0.0, end - start - timer.render_seconds),
+            })
+
+    def template_summary(self):
+        """Aggregate page timings per template, slowest total first."""
+        templates = {}
+        for page in self.pages:
+            entry = templates.setdefault(page['template'], {
+                'template': page['template'],
+                'pages': 0,
+                'render_seconds': 0.0,
+                'write_seconds': 0.0,
+                'max_seconds': 0.0,
+                'slowest_page': None,
+            })
+            total = page['render_seconds'] + page['write_seconds']
+            entry['pages'] += 1
+            entry['render_seconds'] += page['render_seconds']
+            entry['write_seconds'] += page['write_seconds']
+            if total >= entry['max_seconds']:
+                entry['max_seconds'] = total
+                entry['slowest_page'] = page['path']
+
+        for entry in templates.values():
+            entry['total_seconds'] = entry['render_seconds'] + entry['write_seconds']
+            entry['mean_seconds'] = entry['total_seconds'] / entry['pages']
+
+        return sorted(templates.values(), key=lambda e: e['total_seconds'], reverse=True)
+
+    def slowest_pages(self, limit=TOP_N):
+        return sorted(
+            self.pages,
+            key=lambda p: p['render_seconds'] + p['write_seconds'],
+            reverse=True
+        )[:limit]
+
+    def print_report(self, limit=TOP_N):
+        """Print the ranked templates and pages."""
+        print("\nRender profile - templates (slowest first)")
+        print(f"  {'template':<32} {'pages':>6} {'total s':>9} {'render s':>9} "
+              f"{'write s':>9} {'mean ms':>9} {'max ms':>9}")
+        for entry in self.template_summary()[:limit]:
+            print(f"  {entry['template']:<32} {entry['pages']:>6} {entry['total_seconds']:>9.3f} "
+                  f"{entry['render_seconds']:>9.3f} {entry['write_seconds']:>9.3f} "
+                  f"{entry['mean_seconds'] * 1000:>9.2f} {entry['max_seconds'] * 1000:>9.2f}")
+
+        print("\nRender profile - pages (slowest first)")
+        for page in self.slowest_pages(limit):
+            total = page['render_seconds'] + page['write_seconds']
+            print(f"  {total * 1000:>9.2f} ms  {page['template']:<28} {page['path']}")
+
+        print("\nHottest functions (cumulative)")
+        stats = pstats.Stats(self.profile)
+        stats.sort_stats('cumulative')
+        for func in stats.fcn_list[:limit]:
+            cc, nc, tt, ct, _ = stats.stats[func]
+            print(f"  {ct:>9.3f} s  {nc:>8} calls  {pstats.func_std_string(func)}")
+
+    def export(self, profile_dir=PROFILE_DIR):
+        """
+        Write the .prof, speedscope and per-page files
+
+        Returns:
+            List of paths written
+        """
+        os.makedirs(profile_dir, exist_ok=True)
+        base = os.path.join(profile_dir, self.build_name)
+
+        prof_path = f'{base}.prof'
+        self.profile.dump_stats(prof_path)
+
+        speedscope_path = f'{base}.speedscope.json'
+        with open(speedscope_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_speedscope(), f)
+
+        pages_path = f'{base}.pages.json'
+        with open(pages_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'templates': self.template_summary(),
+                'pages': self.pages,
+            }, f, indent=2)
+
+        return [prof_path, speedscope_path, pages_path]
+
+    def to_speedscope(self):
+        """
+        Build a speedscope document with two profiles
+
+        - 'cProfile call tree': cProfile only keeps caller/callee totals, so
+          the tree is reconstructed by splitting each function's time across
+          its callees in proportion to the recorded edge times
+        - 'Page renders': an evented timeline with one frame per template and
+          one per page
+        """
+        frames = []
+        frame_index = {}
+
+        def frame(name, file=None, line=None):
+            key = (name, file, line)
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                entry = {'name': name}
+                if file:
+                    entry['file'] = file
+                if line:
+                    entry['line'] = line
+                frames.append(entry)
+            return frame_index[key]
+
+        samples, weights = self._call_tree_samples(frame)
+        call_tree = {
+            'type': 'sampled',
+            'name': 'cProfile call tree',
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }
+
+        events = []
+        for page in sorted(self.pages, key=lambda p: p['start']):
+            template_frame = frame(page['template'])
+            page_frame = frame(page['path'])
+            events.append({'type': 'O', 'frame': template_frame, 'at': page['start']})
+            events.append({'type': 'O', 'frame': page_frame, 'at': page['start']})
+            events.append({'type': 'C', 'frame': page_frame, 'at': page['end']})
+            events.append({'type': 'C', 'frame': template_frame, 'at': page['end']})
+        timeline = {
+            'type': 'evented',
+            'name': 'Page renders',
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': max((p['end'] for p in self.pages), default=0),
+            'events': events,
+        }
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [call_tree, timeline],
+            'name': f'{self.build_name} build',
+            'exporter': 'build_profiler.py',
+        }
+
+    def _call_tree_samples(self, frame):
+        """Turn cProfile caller/callee totals into weighted stacks."""
+        stats = pstats.Stats(self.profile).stats
+        callees = {}
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, edge_ct) in callers.items():
+                callees.setdefault(caller, []).append((func, edge_ct))
+
+        def frame_for(func):
+            filename, line, name = func
+            return frame(name, filename if filename != '~' else None, line or None)
+
+        samples = []
+        weights = []
+        roots = [func for func, (_, _, _, _, callers) in stats.items() if not callers]
+        # Branches below this share of the run are folded into their parent
+        cutoff = sum(stats[root][3] for root in roots) * MIN_BRANCH_SHARE
+
+        def walk(func, seconds, stack, path):
+            total = stats[func][3]
+            stack = stack + [frame_for(func)]
+            child_seconds = 0.0
+            if total > 0 and len(stack) < MAX_STACK_DEPTH:
+                scale = seconds / total
+                for child, edge_ct in callees.get(func, []):
+                    child_time = edge_ct * scale
+                    # Recursion is folded into the first occurrence
+                    if child in path or child_time < cutoff or child_time <= 0:
+                        continue
+                    walk(child, child_time, stack, path | {child})
+                    child_seconds += child_time
+            own = seconds - child_seconds
+            if own > 0:
+                samples.append(stack)
+                weights.append(own)
+
+        for root in roots:
+            walk(root, stats[root][3], [], {root})
+
+        return samples, weights
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Build telemetry for the site generators
+
+Records wall and CPU time per build phase (load, index, render per
+template, sitemap, static copy, ...), pages per second, files and bytes
+written (files the output writer skipped as unchanged are counted apart,
+without bytes) and peak memory, and writes the result as JSON to .build_cache/telemetry/.
+A stored baseline can then be compared against the latest build to flag
+regressions.
+
+Phases may run concurrently (see build_dag.py): each thread tracks its own
+open phases, CPU time is per thread, and files are credited to the phases
+open on the thread that wrote them.
+
+Memory: the process peak RSS is always recorded; Python allocation peaks
+per phase come from tracemalloc, which is only switched on with
+--trace-memory because it slows rendering down noticeably.
+
+Usage:
+    python build_telemetry.py show [REPORT]
+    python build_telemetry.py save-baseline [REPORT] [--baseline PATH]
+    python build_telemetry.py compare [REPORT] [--baseline PATH] [--threshold 0.2]
+
+REPORT defaults to .build_cache/telemetry/news.json (generator.py); the
+PermitIndex generator writes .build_cache/telemetry/permits.json. The
+baseline defaults to the report path with a .baseline.json suffix.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import threading
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+TELEMETRY_DIR = os.path.join('.build_cache', 'telemetry')
+
+# Flag a metric when it is this much worse than the baseline (0.2 = 20%)
+DEFAULT_THRESHOLD = 0.20
+
+# Ignore timing changes smaller than this; short phases are mostly noise
+MIN_SECONDS = 0.05
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process, or None if unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class BuildTelemetry:
+    """Collects per-phase timings and output counters for one build"""
+
+    def __init__(self, build_name, trace_memory=False):
+        """
+        Args:
+            build_name: Report name ('news' or 'permits')
+            trace_memory: Track Python allocation peaks with tracemalloc
+        """
+        self.build_name = build_name
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.pages = 0
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self.started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._peak_traced = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a build phase
+
+        Phases with the same name (e.g. one render phase per template called
+        from several places) are accumulated. Nested phases each count the
+        files written inside them. With phases running on several threads,
+        the tracemalloc peak is process-wide and only an upper bound.
+        """
+        with self._lock:
+            entry = self.phases.setdefault(name, {
+                'calls': 0,
+                'wall_seconds': 0.0,
+                'cpu_seconds': 0.0,
+                'pages': 0,
+                'files_skipped': 0,
+                'bytes_written': 0,
+            })
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        open_phases = self._open_phases()
+        open_phases.append(entry)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            open_phases.pop()
+            with self._lock:
+                entry['calls'] += 1
+                entry['wall_seconds'] += wall
+                entry['cpu_seconds'] += cpu
+
+                if self.trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    entry['peak_traced_bytes'] = max(entry.get('peak_traced_bytes', 0), peak)
+                    self._peak_traced = max(self._peak_traced, peak)
+
+    def _open_phases(self):
+        """Phase entries currently open on the calling thread, outermost first."""
+        if not hasattr(self._local, 'phases'):
+            self._local.phases = []
+        return self._local.phases
+
+    def record_file(self, path, page=False, written=True):
+        """
+        Count a file the build produced
+
+        Args:
+            path: File that was written
+            page: True for rendered HTML pages
+            written: False if the output writer skipped it as unchanged
+                (counted in files_skipped, without bytes)
+        """
+        size = os.path.getsize(path) if written else 0
+        with self._lock:
+            if written:
+                self.files_written += 1
+            else:
+                self.files_skipped += 1
+            self.bytes_written += size
+            if page:
+                self.pages += 1
+            for entry in self._open_phases():
+                entry['bytes_written'] += size
+                if not written:
+                    entry['files_skipped'] += 1
+                if page:
+                    entry['pages'] += 1
+
+    def record_tree(self, path):
+        """Count every file below a directory (e.g. copied static assets)."""
+        for root, _, files in os.walk(path):
+            for filename in files:
+                self.record_file(os.path.join(root, filename))
+
+    def report(self):
+        """Return the telemetry as a JSON-serialisable dictionary."""
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+
+        phases = {}
+        for name, entry in self.phases.items():
+            phase = dict(entry)
+            phase['wall_seconds'] = round(entry['wall_seconds'], 6)
+            phase['cpu_seconds'] = round(entry['cpu_seconds'], 6)
+            if entry['pages'] and entry['wall_seconds']:
+                phase['pages_per_second'] = round(entry['pages'] / entry['wall_seconds'], 2)
+            phases[name] = phase
+
+        report = {
+            'build': self.build_name,
+            'started_at': self.started_at.isoformat(),
+            'python': platform.python_version(),
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'pages': self.pages,
+            'pages_per_second': round(self.pages / wall, 2) if wall else 0,
+            'files_written': self.files_written,
+            'files_skipped': self.files_skipped,
+            'bytes_written': self.bytes_written,
+            'max_rss_bytes': max_rss_bytes(),
+            'phases': phases,
+        }
+        if self.trace_memory:
+            report['peak_traced_bytes'] = max(self._peak_traced, tracemalloc.get_traced_memory()[1])
+        return report
+
+    def write(self, path=None):
+        """
+        Write the report as JSON
+
+        Args:
+            path: Destination (defaults to .build_cache/telemetry/<build>.json)
+
+        Returns:
+            Path that was written
+        """
+        path = path or default_report_path(self.build_name)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+def default_report_path(build_name='news'):
+    return os.path.join(TELEMETRY_DIR, f'{build_name}.json')
+
+
+def default_baseline_path(report_path):
+    root, _ = os.path.splitext(report_path)
+    return f'{root}.baseline.json'
+
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _metrics(report):
+    """Flatten a report into {metric: (value, higher_is_worse)}."""
+    metrics = {
+        'wall_seconds': (report.get('wall_seconds'), True),
+        'cpu_seconds': (report.get('cpu_seconds'), True),
+        'pages_per_second': (report.get('pages_per_second'), False),
+        'max_rss_bytes': (report.get('max_rss_bytes'), True),
+        'peak_traced_bytes': (report.get('peak_traced_bytes'), True),
+    }
+    for name, phase in report.get('phases', {}).items():
+        metrics[f'{name}.wall_seconds'] = (phase.get('wall_seconds'), True)
+        metrics[f'{name}.cpu_seconds'] = (phase.get('cpu_seconds'), True)
+    return metrics
+
+
+def compare_reports(current, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=MIN_SECONDS):
+    """
+    Compare two telemetry reports
+
+    Args:
+        current: Report from the build under test
+        baseline: Stored reference report
+        threshold: Relative change that counts as a regression
+        min_seconds: Timing changes below this are ignored as noise
+
+    Returns:
+        List of dicts (metric, baseline, current, change) for every metric
+        that got worse by more than the threshold
+    """
+    regressions = []
+    current_metrics = _metrics(current)
+
+    for metric, (base_value, higher_is_worse) in _metrics(baseline).items():
+        value = current_metrics.get(metric, (None, None))[0]
+        if not base_value or value is None:
+            continue
+
+        change = (value - base_value) / base_value
+        if not higher_is_worse:
+            change = -change
+
+        if metric.endswith('seconds') and abs(value - base_value) < min_seconds:
+            continue
+        if change > threshold:
+            regressions.append({
+                'metric': metric,
+                'baseline': base_value,
+                'current': value,
+                'change': round(change, 4),
+            })
+
+    return regressions
+
+
+def format_bytes(value):
+    if value is None:
+        return 'n/a'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024 or unit == 'GB':
+            return f'{value:,.0f} {unit}' if unit == 'B' else f'{value:,.1f} {unit}'
+        value /= 1024
+
+
+def print_report(report):
+    """Print a phase table for a telemetry report."""
+    print(f"\nBuild telemetry ({report['build']}, {report['started_at']})")
+    print(f"  {'phase':<32} {'wall s':>9} {'cpu s':>9} {'pages':>7} {'bytes':>12}")
+    for name, phase in report['phases'].items():
+        print(f"  {name:<32} {phase['wall_seconds']:>9.3f} {phase['cpu_seconds']:>9.3f} "
+              f"{phase['pages']:>7} {format_bytes(phase['bytes_written']):>12}")
+    print(f"  {'total':<32} {report['wall_seconds']:>9.3f} {report['cpu_seconds']:>9.3f} "
+          f"{report['pages']:>7} {format_bytes(report['bytes_written']):>12}")
+    print(f"  Pages/second: {report['pages_per_second']}")
+    print(f"  Files: {report['files_written']} written, {report.get('files_skipped', 0)} unchanged")
+    print(f"  Peak RSS: {format_bytes(report.get('max_rss_bytes'))}")
+    if 'peak_traced_bytes' in report:
+        print(f"  Peak traced (tracemalloc): {format_bytes(report['peak_traced_bytes'])}")
+
+
+def main():
+    """Command line interface: show, save-baseline, compare"""
+    parser = argparse.ArgumentParser(description='Build telemetry reports')
+    parser.add_argument('command', choices=['show', 'save-baseline', 'compare'])
+    parser.add_argument('report', nargs='?', default=default_report_path(),
+                        help='Telemetry report (default: %(default)s)')
+    parser.add_argument('--baseline', help='Baseline report (default: REPORT with .baseline.json suffix)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative regression threshold (default: %(default)s)')
+    parser.add_argument('--min-seconds', type=float, default=MIN_SECONDS,
+                        help='Ignore timing changes below this (default: %(default)s)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.report):
+        print(f"✗ Telemetry report not found: {args.report}")
+        print("  Run a generator first")
+        return 1
+
+    baseline_path = args.baseline or default_baseline_path(args.report)
+
+    if args.command == 'show':
+        print_report(load_report(args.report))
+        return 0
+
+    if args.command == 'save-baseline':
+        os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+        shutil.copyfile(args.report, baseline_path)
+        print(f"✓ Baseline saved: {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"✗ Baseline not found: {baseline_path}")
+        print(f"  Save one with: python build_telemetry.py save-baseline {args.report}")
+        return 1
+
+    regressions = compare_reports(
+        load_report(args.report),
+        load_report(baseline_path),
+        threshold=args.threshold,
+        min_seconds=args.min_seconds
+    )
+
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {baseline_path}")
+        return 0
+
+    print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} against {baseline_path}")
+    for item in regressions:
+        print(f"  - {item['metric']}: {item['baseline']} -> {item['current']} ({item['change']:+.1%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
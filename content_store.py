@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped store for article bodies
+
+An article's `content` (its full HTML) is most of its size but is only read
+when that article's page is rendered. load_articles(content_store=...)
+moves every body into a ContentStore and leaves a ContentHandle in the
+article, so the index, listing pages, sitemap, images and social cards
+never hold article bodies. Render worker processes read bodies straight
+from the blob through a BlobReader, given each body's ContentHandle.span().
+
+The store is two files under .build_cache/content/:
+    articles.blob        UTF-8 bodies, appended back to back
+    articles.index.json  id -> [offset, length, sha1 of the body]
+
+The blob is append-only: a body whose digest is unchanged since the last
+build is not written again, a changed body is appended and the index
+points at the new copy. Reads go through a read-only mmap of the blob.
+save() drops the ids not put() since loading (deleted articles), and when
+superseded copies make up more than half of the file, rewrites it with
+the live bodies only.
+"""
+
+import os
+import json
+import mmap
+import hashlib
+
+
+CONTENT_DIR = os.path.join('.build_cache', 'content')
+
+
+class ContentHandle:
+    """Stands in for an article body; reads it from the store when rendered"""
+
+    __slots__ = ('store', 'id')
+
+    def __init__(self, store, record_id):
+        self.store = store
+        self.id = record_id
+
+    def __str__(self):
+        return self.store.get(self.id)
+
+    def span(self):
+        """(offset, length) of the body in the store's blob."""
+        return self.store.span(self.id)
+
+    # Jinja's |safe and Markup() use __html__
+    __html__ = __str__
+
+    def __repr__(self):
+        return f'<ContentHandle {self.id!r}>'
+
+
+class ContentStore:
+    """Append-only blob of article bodies with an offset index keyed by id"""
+
+    def __init__(self, directory=CONTENT_DIR, name='articles'):
+        self.blob_path = os.path.join(directory, f'{name}.blob')
+        self.index_path = os.path.join(directory, f'{name}.index.json')
+        self.index = {}
+        self.appended = 0
+        self.reused = 0
+        self.used = set()
+        self._writer = None
+        self._map = None
+
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            blob_size = os.path.getsize(self.blob_path)
+            # Drop an index that points past the blob (e.g. a truncated file)
+            if all(offset + length <= blob_size for offset, length, _ in index.values()):
+                self.index = index
+        except (OSError, ValueError):
+            pass
+
+    def put(self, record_id, content):
+        """
+        Store an article body (appended only if it changed)
+
+        Returns:
+            ContentHandle for the body
+        """
+        record_id = str(record_id)
+        self.used.add(record_id)
+        data = content.encode('utf-8')
+        digest = hashlib.sha1(data).hexdigest()
+        entry = self.index.get(record_id)
+        if entry is not None and entry[2] == digest:
+            self.reused += 1
+        else:
+            if self._writer is None:
+                self._writer = open(self.blob_path, 'ab')
+            self.index[record_id] = [self._writer.tell(), len(data), digest]
+            self._writer.write(data)
+            self.appended += 1
+        return ContentHandle(self, record_id)
+
+    def get(self, record_id):
+        """Read one body."""
+        offset, length, _ = self.index[str(record_id)]
+        if self._map is None or offset + length > len(self._map):
+            self._remap()
+        return self._map[offset:offset + length].decode('utf-8')
+
+    def span(self, record_id):
+        """
+        Where a body is in the blob, for readers in other processes
+
+        Appended bodies are flushed first, so a BlobReader opened after
+        this call sees them.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        offset, length, _ = self.index[str(record_id)]
+        return offset, length
+
+    def _remap(self):
+        if self._writer is not None:
+            self._writer.flush()
+        if self._map is not None:
+            self._map.close()
+        with open(self.blob_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def live_bytes(self):
+        return sum(length for _, length, _ in self.index.values())
+
+    def save(self):
+        """
+        Flush appended bodies and write the index of the bodies put since
+        loading (compacting first if needed)
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        self.index = {record_id: entry for record_id, entry in self.index.items() if record_id in self.used}
+        if os.path.exists(self.blob_path) and os.path.getsize(self.blob_path) > 2 * self.live_bytes():
+            self.compact()
+
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def compact(self):
+        """Rewrite the blob with only the bodies the index points at."""
+        tmp_path = f'{self.blob_path}.tmp'
+        index = {}
+        with open(tmp_path, 'wb') as f:
+            for record_id in self.index:
+                data = self.get(record_id).encode('utf-8')
+                index[record_id] = [f.tell(), len(data), self.index[record_id][2]]
+                f.write(data)
+        self.close()
+        os.replace(tmp_path, self.blob_path)
+        self.index = index
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class BlobReader:
+    """Read-only mapping of a store's blob, for processes without the index"""
+
+    def __init__(self, blob_path):
+        self._handle = open(blob_path, 'rb')
+        # An empty file cannot be mapped (and holds no bodies)
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(blob_path) else b''
+
+    def read(self, offset, length):
+        """The body at a ContentHandle.span()."""
+        return self._map[offset:offset + length].decode('utf-8')
+
+    def close(self):
+        if self._handle is not None:
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+            self._handle.close()
+            self._handle = self._map = None
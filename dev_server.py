@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Development server: resident build with file watching and hot rebuilds
+
+Re-running generator.py for every edit pays interpreter startup, imports,
+JSON parsing and template compilation each time. This daemon does a full
+build once, then keeps the parsed articles, the listing index and the
+compiled Jinja2 templates in memory. It polls data/articles/ and
+templates/ and re-renders only what an edit affects:
+
+- an article whose listing fields (title, slug, category, excerpt, source,
+  dates) are unchanged: its own page only
+- listing changes, new and deleted articles: that page, the homepage, the
+  sitemap, and the category pages and article pages (related-article
+  cards) of every category involved; pages of deleted or moved articles
+  are removed
+- a template: the pages rendered from it, directly or through
+  {% include %}/{% extends %}
+
+`serve` also serves output/ over HTTP. Refresh the browser after the
+"rebuilt" line appears.
+
+Usage:
+    python dev_server.py serve [--port 8000]   # watch, rebuild and serve output/
+    python dev_server.py watch                 # watch and rebuild only
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from jinja2 import Environment, FileSystemLoader, TemplateError, meta
+
+import article_stream
+from build_dag import DEFAULT_JOBS
+from build_telemetry import BuildTelemetry
+from generator import (
+    article_path,
+    build_graph,
+    build_index,
+    generate_article_pages,
+    generate_category_pages,
+    generate_homepage,
+    generate_sitemap,
+    load_article_file,
+)
+from image_pipeline import build_responsive_images
+from og_cards import render_cards
+
+
+# Seconds between scans of the watched directories
+POLL_INTERVAL = 0.1
+
+# Wait this long after a change so multi-file saves land in one rebuild
+SETTLE_SECONDS = 0.02
+
+# Article fields shown outside the article's own page (homepage, category
+# listings, related-article cards, sitemap, stats): the streamed build's
+# listing records, plus the date formatted when articles are loaded
+LISTING_FIELDS = article_stream.LISTING_FIELDS + ('published_date_formatted',)
+
+# Templates the build renders pages from
+PAGE_TEMPLATES = ('index.html', 'article_page.html', 'category_page.html')
+
+
+class SourceWatcher:
+    """Polls directories for added, modified and deleted files"""
+
+    def __init__(self, directories):
+        """
+        Args:
+            directories: Directories to watch (recursively)
+        """
+        self.directories = list(directories)
+        self.snapshot = self.scan()
+
+    def scan(self):
+        files = {}
+        for directory in self.directories:
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # Deleted while scanning
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self):
+        """Return the set of paths that changed since the last poll."""
+        current = self.scan()
+        changed = {
+            path for path in current.keys() | self.snapshot.keys()
+            if current.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = current
+        return changed
+
+
+class SiteSession:
+    """Articles, listing index and compiled templates kept between rebuilds"""
+
+    def __init__(self, data_dir='data/articles', templates_dir='templates', output_dir='output',
+                 minify=True, jobs=DEFAULT_JOBS):
+        """
+        Args:
+            data_dir: Article JSON directory
+            templates_dir: Jinja2 templates directory
+            output_dir: Site output directory
+            minify: Minify rendered HTML
+            jobs: Build tasks run concurrently in the initial build
+        """
+        self.data_dir = data_dir
+        self.templates_dir = templates_dir
+        self.output_dir = output_dir
+        self.minify = minify
+        self.jobs = jobs
+        self.env = Environment(loader=FileSystemLoader(templates_dir))
+        self.minify_report = None
+        self.files = {}
+        self.index = None
+        self.responsive_images = {}
+        self.og_cards = {}
+
+    @property
+    def articles(self):
+        """All articles, in file load order."""
+        return [article for articles in self.files.values() for article in articles]
+
+    def build(self):
+        """
+        Full build; loads every article file and renders the whole site
+
+        Returns:
+            Dictionary with 'pages' and 'seconds'
+        """
+        start = time.perf_counter()
+        self.files = {}
+        for json_file in glob.glob(os.path.join(self.data_dir, '*.json')):
+            try:
+                self.files[json_file] = load_article_file(json_file)
+            except (OSError, ValueError) as e:
+                print(f"Error loading {json_file}: {e}")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        telemetry = BuildTelemetry('dev')
+        graph, self.minify_report = build_graph(
+            self.articles, self.output_dir, self.minify, telemetry, env=self.env
+        )
+        results = graph.run(jobs=self.jobs, telemetry=telemetry)
+        self.index = results['index']
+        self.responsive_images = results['images'][0]
+        self.og_cards = results['og_cards'][0]
+        return {'pages': telemetry.pages, 'seconds': time.perf_counter() - start}
+
+    def update(self, paths):
+        """
+        Apply changed source files and re-render the pages they affect
+
+        Args:
+            paths: Changed, added or deleted files under the data and
+                templates directories (other paths are ignored)
+
+        Returns:
+            Dictionary with 'pages', 'seconds', and the article ids that were
+            'added', 'changed' and 'removed'
+        """
+        start = time.perf_counter()
+        telemetry = BuildTelemetry('dev')
+        data_paths = [p for p in paths if self._under(p, self.data_dir) and p.endswith('.json')]
+        template_names = {
+            os.path.relpath(p, self.templates_dir).replace(os.sep, '/')
+            for p in paths if self._under(p, self.templates_dir)
+        }
+
+        old = {article['id']: article for article in self.articles}
+        for path in data_paths:
+            if not os.path.exists(path):
+                self.files.pop(path, None)
+                continue
+            try:
+                self.files[path] = load_article_file(path)
+            except (OSError, ValueError) as e:
+                # Usually a save in progress; the next save triggers a rebuild
+                print(f"✗ Skipping {path}: {e}")
+        new = {article['id']: article for article in self.articles}
+
+        added = [i for i in new if i not in old]
+        removed = [i for i in old if i not in new]
+        changed = [i for i in new if i in old and new[i] != old[i]]
+        listing_changed = [i for i in changed if listing(old[i]) != listing(new[i])]
+
+        render_home = render_sitemap = False
+        article_ids = set(changed)
+        category_slugs = set()
+
+        if added or removed or changed:
+            self.index = build_index(self.articles)
+        if added or removed or listing_changed:
+            render_home = render_sitemap = True
+            for i in added + removed + listing_changed:
+                for article in (old.get(i), new.get(i)):
+                    if article is not None:
+                        category_slugs.add(article.get('category_slug', 'uncategorized'))
+            article_ids.update(
+                article['id'] for article in self.articles
+                if article.get('category_slug', 'uncategorized') in category_slugs
+            )
+            self._remove_stale_pages(old, new)
+
+        # Templates: re-render every page that uses an edited template
+        for page_template in self.templates_using(template_names):
+            if page_template == 'index.html':
+                render_home = True
+            elif page_template == 'article_page.html':
+                article_ids.update(new)
+            elif page_template == 'category_page.html':
+                category_slugs.update(c['slug'] for c in self.index['categories'])
+
+        articles = [new[i] for i in new if i in article_ids]
+        self._refresh_assets([new[i] for i in added + changed])
+
+        if render_home:
+            generate_homepage(self.env, self.index, self.output_dir, self.minify_report, telemetry)
+        if articles:
+            generate_article_pages(self.env, articles, self.output_dir, self.responsive_images,
+                                   self.og_cards, self.minify_report, telemetry,
+                                   related_pool=self.articles)
+        categories = [c for c in self.index['categories'] if c['slug'] in category_slugs]
+        if categories:
+            generate_category_pages(self.env, categories, self.output_dir, self.minify_report, telemetry)
+        if render_sitemap:
+            generate_sitemap(self.articles, self.index['categories'], self.output_dir)
+
+        return {
+            'pages': telemetry.pages,
+            'seconds': time.perf_counter() - start,
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+        }
+
+    def templates_using(self, names):
+        """Page templates that are, include or extend any of `names`."""
+        if not names:
+            return []
+        return [
+            page_template for page_template in PAGE_TEMPLATES
+            if self._template_closure(page_template) & set(names)
+        ]
+
+    def _template_closure(self, name, seen=None):
+        """A template plus everything it includes, extends or imports."""
+        seen = set() if seen is None else seen
+        if name in seen:
+            return seen
+        seen.add(name)
+        try:
+            source = self.env.loader.get_source(self.env, name)[0]
+            referenced = meta.find_referenced_templates(self.env.parse(source))
+        except TemplateError:
+            return seen
+        for child in referenced:
+            if child is not None:  # None: dynamic name, unknown until render time
+                self._template_closure(child, seen)
+        return seen
+
+    def _refresh_assets(self, articles):
+        """Responsive images and social cards of new or edited articles (cached)."""
+        if not articles:
+            return
+        images, _ = build_responsive_images([a.get('image_url') for a in articles], self.output_dir)
+        self.responsive_images.update(images)
+        cards, _ = render_cards(
+            [
+                {
+                    'id': article['id'],
+                    'title': article.get('title', ''),
+                    'label': article.get('category', ''),
+                    'theme': 'news',
+                }
+                for article in articles
+            ],
+            self.output_dir
+        )
+        self.og_cards.update(cards)
+
+    def _remove_stale_pages(self, old, new):
+        """Delete pages of removed or moved articles and of emptied categories."""
+        for article_id, article in old.items():
+            current = new.get(article_id)
+            if current is None or article_path(current) != article_path(article):
+                page_dir = os.path.join(self.output_dir, article_path(article).strip('/'))
+                shutil.rmtree(page_dir, ignore_errors=True)
+
+        live = {c['slug'] for c in self.index['categories']}
+        for article in old.values():
+            slug = article.get('category_slug', 'uncategorized')
+            if slug not in live:
+                shutil.rmtree(os.path.join(self.output_dir, 'category', slug), ignore_errors=True)
+
+    @staticmethod
+    def _under(path, directory):
+        return os.path.abspath(path).startswith(os.path.abspath(directory) + os.sep)
+
+
+def listing(article):
+    """The part of an article shown outside its own page."""
+    return tuple(article.get(field) for field in LISTING_FIELDS)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request logging"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(output_dir, host='127.0.0.1', port=8000):
+    """Serve output_dir over HTTP from a background thread."""
+    handler = partial(QuietHandler, directory=os.path.abspath(output_dir))
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name='dev-http', daemon=True)
+    thread.start()
+    return server
+
+
+def watch(session, interval=POLL_INTERVAL):
+    """Rebuild on every change until interrupted."""
+    watcher = SourceWatcher([session.data_dir, session.templates_dir])
+    while True:
+        time.sleep(interval)
+        changed = watcher.poll()
+        if not changed:
+            continue
+        time.sleep(SETTLE_SECONDS)
+        changed |= watcher.poll()
+
+        try:
+            summary = session.update(changed)
+        except Exception as e:
+            print(f"✗ Rebuild failed: {e}")
+            continue
+
+        names = ', '.join(sorted(os.path.relpath(p) for p in changed))
+        print(f"↻ {names}: rebuilt {summary['pages']} pages in {summary['seconds'] * 1000:.0f} ms")
+
+
+def main():
+    """Command line interface: serve, watch"""
+    parser = argparse.ArgumentParser(description='News123 development server')
+    parser.add_argument('command', choices=['serve', 'watch'])
+    parser.add_argument('--host', default='127.0.0.1', help='Address to serve on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to serve on (default: %(default)s)')
+    parser.add_argument('--output', default='output', help='Output directory (default: %(default)s)')
+    parser.add_argument('--no-minify', action='store_true', help='Write rendered HTML without minification')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help='Seconds between change scans (default: %(default)s)')
+    args = parser.parse_args()
+
+    session = SiteSession(output_dir=args.output, minify=not args.no_minify)
+    summary = session.build()
+    print(f"\n✓ Built {summary['pages']} pages from {len(session.articles)} articles "
+          f"in {summary['seconds']:.2f}s")
+
+    if args.command == 'serve':
+        server = start_server(args.output, args.host, args.port)
+        print(f"Serving {args.output}/ at http://{args.host}:{server.server_address[1]}/")
+    print("Watching data/articles/ and templates/ (Ctrl-C to stop)")
+
+    try:
+        watch(session, args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Bitmap facet index over permits
+
+Hubs, the states page and the homepage all count permits by the same few
+attributes (online, API, MCP, ...) within a state or city. FacetIndex
+keeps the permit IDs (row positions) of each facet value, so a conjunctive
+filter is an intersection of a few ID sets and a count is a popcount,
+without going back to the rows:
+
+    facets = FacetIndex.from_permits(df)
+    facets.count(state='texas', online=True)
+    facets.ids(facets.select(state='california', cost='free'))
+    facets.counts('cost', state='texas')     # {'free': 3, 'under-100': 12, ...}
+
+Each value's IDs are kept in the cheaper of two forms:
+    dense   a Python int where bit i is permit ID i (N/8 bytes), for values
+            that cover at least 1/SPARSE_DENSITY of the permits: online,
+            cost bands, states, ...
+    sparse  a sorted array('I') of IDs (4 bytes per ID), for rarer values:
+            most cities, jurisdictions and types
+so a facet takes at most about 4 bytes per permit however many values it
+has (a dense int per city would take N/8 bytes each). Dense sets are
+intersected with &, a sparse set with anything by testing its IDs;
+select() returns either form, and count(), counts(), ids() and the `base`
+arguments take both.
+
+Facets:
+    state       state slug ('' when the location did not resolve)
+    city        '<state slug>/<city slug>' ('' for statewide/unresolved)
+    jurisdiction  jurisdiction slug (legacy hubs)
+    type        canonical permit type (permit_type)
+    online, api, mcp  True when the column is 'Yes'
+    cost        cost band of cost_max (see COST_BANDS), 'varies' when unknown
+
+A filter value can also be a list or set, matching any of its values.
+
+FACET_PAGES defines the landing pages generated per state from the index
+("Online permits in Texas" at /texas/online-permits/).
+
+This module does not import pandas; it only calls DataFrame methods.
+"""
+
+import math
+from array import array
+
+
+# (band, upper bound of cost_max)
+COST_BANDS = (
+    ('free', 0),
+    ('under-100', 100),
+    ('100-500', 500),
+    ('over-500', math.inf),
+)
+
+# A value covering fewer than 1 in SPARSE_DENSITY permits is kept as an
+# array of IDs (4 bytes each) rather than a bitset (N/8 bytes)
+SPARSE_DENSITY = 32
+
+# Landing pages per state: (slug, title prefix, filter)
+FACET_PAGES = (
+    ('online-permits', 'Online', {'online': True}),
+    ('api-permits', 'API-Accessible', {'api': True}),
+    ('free-permits', 'Free', {'cost': 'free'}),
+)
+
+
+def cost_band(cost_max):
+    """COST_BANDS band of an upper cost, 'varies' when missing (NaN)."""
+    if cost_max is None or cost_max != cost_max:
+        return 'varies'
+    for band, upper in COST_BANDS:
+        if cost_max <= upper:
+            return band
+    return 'varies'
+
+
+def bitset(permit_ids):
+    """Bitset of a list of permit IDs."""
+    if not permit_ids:
+        return 0
+    bits = bytearray(max(permit_ids) // 8 + 1)
+    for permit_id in permit_ids:
+        bits[permit_id >> 3] |= 1 << (permit_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def to_bytes(bits):
+    """Little-endian bytes of a bitset, for testing single bits."""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def _filter_ids(ids, data):
+    """The IDs whose bit is set in `data` (to_bytes() of a bitset)."""
+    size = len(data)
+    return array('I', [i for i in ids if i >> 3 < size and data[i >> 3] >> (i & 7) & 1])
+
+
+def intersect(a, b):
+    """IDs in both sets (each a bitset or a sorted ID array)."""
+    if isinstance(a, int) and isinstance(b, int):
+        return a & b
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return _filter_ids(a, to_bytes(b))
+    if len(a) > len(b):
+        a, b = b, a
+    members = set(b)
+    return array('I', [i for i in a if i in members])
+
+
+def union(sets):
+    """IDs in any of the sets; a bitset unless all of them are ID arrays."""
+    if all(not isinstance(ids, int) for ids in sets):
+        return array('I', sorted(set().union(*sets)))
+    result = 0
+    for ids in sets:
+        result |= ids if isinstance(ids, int) else bitset(ids)
+    return result
+
+
+def id_count(ids):
+    """Number of IDs in a bitset or ID array."""
+    return ids.bit_count() if isinstance(ids, int) else len(ids)
+
+
+class FacetIndex:
+    """Permit IDs per facet value (dense or sparse); conjunctive selects and counts"""
+
+    def __init__(self, size):
+        self.size = size
+        self.all = (1 << size) - 1
+        self.facets = {}
+
+    @classmethod
+    def from_permits(cls, df):
+        """Index a normalized permits DataFrame (see permit_fields.normalize_permits)."""
+        cost_max = df['cost_max'].tolist() if 'cost_max' in df.columns else [None] * len(df)
+        cities = [
+            f'{state}/{city}' if city else ''
+            for state, city in zip(df['state_slug'], df['city_slug'])
+        ]
+        values = {
+            'state': df['state_slug'].tolist(),
+            'city': cities,
+            'jurisdiction': df['jurisdiction_slug'].tolist(),
+            'type': df['permit_type'].tolist(),
+            'cost': [cost_band(value) for value in cost_max],
+        }
+        for name, source in (('online', 'online_available'), ('api', 'api_available'), ('mcp', 'mcp_available')):
+            values[name] = (df[source] == 'Yes').tolist() if source in df.columns else [False] * len(df)
+
+        index = cls(len(df))
+        for name, column_values in values.items():
+            index.add_facet(name, column_values)
+        return index
+
+    def add_facet(self, name, values):
+        """Add a facet from one value per permit, in permit ID order."""
+        ids = {}
+        for permit_id, value in enumerate(values):
+            ids.setdefault(value, []).append(permit_id)
+        self.facets[name] = {
+            value: bitset(permit_ids) if len(permit_ids) * SPARSE_DENSITY >= self.size else array('I', permit_ids)
+            for value, permit_ids in ids.items()
+        }
+
+    def bits(self, name, value):
+        """IDs of one facet value (a list/set/tuple ORs its values)."""
+        facet = self.facets[name]
+        if isinstance(value, (list, set, tuple)):
+            return union([facet[item] for item in value if item in facet])
+        return facet.get(value, 0)
+
+    def select(self, base=None, **filters):
+        """
+        Permits matching every filter (facet=value)
+
+        Args:
+            base: Optional bitset or ID array to start from (e.g.
+                bitset(ids))
+
+        Returns:
+            Bitset or sorted ID array
+        """
+        result = self.all if base is None else base
+        for name, value in filters.items():
+            result = intersect(result, self.bits(name, value))
+            if not result:
+                break
+        return result
+
+    def count(self, base=None, **filters):
+        """Number of permits matching every filter."""
+        return id_count(self.select(base, **filters))
+
+    def counts(self, name, base=None, **filters):
+        """{value: count} of one facet within the filters (zero counts omitted)."""
+        selected = self.select(base, **filters)
+        # Bits of a dense selection are tested once per sparse value's ID
+        data = to_bytes(selected) if isinstance(selected, int) else None
+        counts = {}
+        for value, ids in self.facets[name].items():
+            if data is None:
+                count = len(intersect(selected, ids))
+            elif isinstance(ids, int):
+                count = (ids & selected).bit_count()
+            else:
+                count = len(_filter_ids(ids, data))
+            if count:
+                counts[value] = count
+        return counts
+
+    @staticmethod
+    def ids(bits):
+        """Permit IDs of a bitset or ID array, ascending."""
+        if not isinstance(bits, int):
+            return list(bits)
+        ids = []
+        data = to_bytes(bits)
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                ids.append(byte_index * 8 + low.bit_length() - 1)
+                byte ^= low
+        return ids
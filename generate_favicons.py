@@ -2,65 +2,46 @@
 """
 Generate favicon files from SVG source
 Requires: pip install Pillow cairosvg
+
+The SVG is rasterized once at the largest size and the smaller favicons are
+downscaled from it (see brand_assets.py); nothing is re-rendered while the
+SVG and size list are unchanged.
 """
 
-import os
 from pathlib import Path
 
 # Try importing required libraries
 try:
     from PIL import Image
     import cairosvg
-    import io
 except ImportError as e:
     print(f"Error: Missing required library: {e}")
     print("Please install: pip install Pillow cairosvg")
     exit(1)
 
-def svg_to_png(svg_path, png_path, size):
-    """Convert SVG to PNG at specified size"""
-    try:
-        # Read SVG content
-        with open(svg_path, 'r') as f:
-            svg_content = f.read()
-
-        # Convert SVG to PNG using cairosvg
-        png_data = cairosvg.svg2png(
-            bytestring=svg_content.encode('utf-8'),
-            output_width=size,
-            output_height=size
-        )
+from brand_assets import render_assets, print_results
 
-        # Save PNG
-        with open(png_path, 'wb') as f:
-            f.write(png_data)
 
-        print(f"✓ Generated: {png_path.name} ({size}x{size})")
-        return True
-    except Exception as e:
-        print(f"✗ Failed to generate {png_path.name}: {e}")
-        return False
+def favicon_asset(svg_source, favicon_dir):
+    """Describe every favicon file derived from the SVG source"""
+    # Define favicon sizes to generate
+    sizes = {
+        'favicon-16x16.png': 16,
+        'favicon-32x32.png': 32,
+        'android-chrome-192x192.png': 192,
+        'android-chrome-512x512.png': 512,
+        'apple-touch-icon.png': 180,
+    }
 
-def create_ico(png_paths, ico_path):
-    """Create multi-size .ico file from PNG images"""
-    try:
-        images = []
-        for png_path in png_paths:
-            if png_path.exists():
-                img = Image.open(png_path)
-                images.append(img)
+    return {
+        'name': 'favicon',
+        'renderer': 'svg',
+        'source': svg_source.read_text(encoding='utf-8'),
+        'outputs': {str(favicon_dir / filename): size for filename, size in sizes.items()},
+        # Multi-size .ico file
+        'ico': {'path': str(favicon_dir / 'favicon.ico'), 'sizes': [16, 32, 48]},
+    }
 
-        if images:
-            images[0].save(
-                ico_path,
-                format='ICO',
-                sizes=[(img.size[0], img.size[1]) for img in images]
-            )
-            print(f"✓ Generated: {ico_path.name} (multi-size)")
-            return True
-    except Exception as e:
-        print(f"✗ Failed to generate {ico_path.name}: {e}")
-        return False
 
 def main():
     # Paths
@@ -80,49 +61,20 @@ def main():
         print(f"Error: SVG source not found at {svg_source}")
         return 1
 
-    # Ensure output directory exists
-    favicon_dir.mkdir(parents=True, exist_ok=True)
-
-    # Define favicon sizes to generate
-    sizes = {
-        'favicon-16x16.png': 16,
-        'favicon-32x32.png': 32,
-        'android-chrome-192x192.png': 192,
-        'android-chrome-512x512.png': 512,
-        'apple-touch-icon.png': 180,
-    }
-
-    # Generate PNG files
-    print("Generating PNG files...")
-    png_files = []
-    for filename, size in sizes.items():
-        png_path = favicon_dir / filename
-        if svg_to_png(svg_source, png_path, size):
-            png_files.append(png_path)
-
-    print()
-
-    # Generate .ico file (multi-size)
-    print("Generating .ico file...")
-    ico_sizes = [16, 32, 48]
-    ico_pngs = []
-    for size in ico_sizes:
-        png_path = favicon_dir / f'temp_{size}.png'
-        if svg_to_png(svg_source, png_path, size):
-            ico_pngs.append(png_path)
-
-    if ico_pngs:
-        ico_path = favicon_dir / 'favicon.ico'
-        create_ico(ico_pngs, ico_path)
-
-        # Clean up temporary files
-        for png_path in ico_pngs:
-            png_path.unlink()
+    # Rasterize once at 512px and derive the smaller sizes
+    print("Generating favicon files...")
+    asset = favicon_asset(svg_source, favicon_dir)
+    results = render_assets([asset])
+    failures = print_results(results)
 
     print()
     print("============================================================")
+    if failures:
+        print("✗ Favicon generation failed")
+        print("============================================================")
+        return 1
     print(f"✅ Favicon generation completed!")
-    print(f"Generated {len(png_files) + 1} files")
+    print(f"{len(results['favicon']['files'])} files up to date")
     print("============================================================")
     return 0
 
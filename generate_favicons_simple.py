@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """
 Generate favicon files using PIL directly
+
+The icon is drawn once at the largest size and the smaller favicons are
+downscaled from it (see brand_assets.py).
 """
 
-import os
 from pathlib import Path
 
 try:
@@ -13,8 +15,11 @@ except ImportError as e:
     print("Please install: pip install Pillow")
     exit(1)
 
-def create_p_icon(size, output_path):
-    """Create a simple 'P' icon with star cutout"""
+from brand_assets import render_assets, print_results
+
+
+def draw_p_icon(size):
+    """Draw a simple 'P' icon with star cutout"""
     # Create image with navy blue background
     img = Image.new('RGB', (size, size), '#003366')
     draw = ImageDraw.Draw(img)
@@ -71,9 +76,6 @@ def create_p_icon(size, output_path):
         ]
         draw.polygon(star_points, fill='#F8F9FA')
 
-    # Save
-    img.save(output_path, 'PNG')
-    print(f"✓ Generated: {output_path.name} ({size}x{size})")
     return img
 
 def main():
@@ -98,45 +100,23 @@ def main():
         'apple-touch-icon.png': 180,
     }
 
-    # Generate PNG files
-    print("Generating PNG files...")
-    images = {}
-    for filename, size in sizes_to_generate.items():
-        output_path = favicon_dir / filename
-        img = create_p_icon(size, output_path)
-        images[size] = img
-
-    print()
-
-    # Generate .ico file (multi-size)
-    print("Generating .ico file...")
-    ico_path = favicon_dir / 'favicon.ico'
-    ico_sizes = [16, 32, 48]
-    ico_images = []
-
-    for size in ico_sizes:
-        img = create_p_icon(size, favicon_dir / f'temp_{size}.png')
-        ico_images.append(img)
-
-    # Save as .ico
-    if ico_images:
-        ico_images[0].save(
-            ico_path,
-            format='ICO',
-            sizes=[(img.size[0], img.size[1]) for img in ico_images]
-        )
-        print(f"✓ Generated: {ico_path.name} (multi-size)")
-
-        # Clean up temporary files
-        for size in ico_sizes:
-            temp_file = favicon_dir / f'temp_{size}.png'
-            if temp_file.exists():
-                temp_file.unlink()
+    # Draw once at 512px; smaller sizes and the .ico are downscaled
+    print("Generating favicon files...")
+    asset = {
+        'name': 'favicon-simple',
+        'renderer': 'draw',
+        'draw': draw_p_icon,
+        'outputs': {str(favicon_dir / filename): size for filename, size in sizes_to_generate.items()},
+        'ico': {'path': str(favicon_dir / 'favicon.ico'), 'sizes': [16, 32, 48]},
+    }
+    results = render_assets([asset])
+    if print_results(results):
+        return 1
 
     print()
     print("============================================================")
     print(f"✅ Favicon generation completed!")
-    print(f"Generated {len(sizes_to_generate) + 1} files")
+    print(f"{len(sizes_to_generate) + 1} files up to date")
     print("============================================================")
     return 0
 
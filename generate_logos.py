@@ -2,11 +2,15 @@
 """
 Generate PNG logo variations for PermitIndex
 Creates 4 versions: Primary (Navy), Accent (Orange), White, and Black
+
+Variations render in parallel through brand_assets.py and are skipped
+while their markup is unchanged.
 """
 
-from playwright.sync_api import sync_playwright
 import os
 
+from brand_assets import render_assets, print_results
+
 # Logo variations with different colors
 LOGO_VARIATIONS = {
     'primary': {
@@ -73,6 +77,22 @@ def create_logo_html(color, bg_color='transparent'):
 </html>
 """
 
+def logo_assets(output_dir):
+    """Describe one brand asset per logo variation"""
+    return [
+        {
+            'name': f'logo-{variant_name}',
+            'renderer': 'html',
+            'source': create_logo_html(config['color'], config['bg']),
+            'viewport': (600, 200),
+            'outputs': {os.path.join(output_dir, config['name']): (600, 200)},
+            # Screenshot with transparent background (except for white version)
+            'transparent': config['bg'] == 'transparent',
+        }
+        for variant_name, config in LOGO_VARIATIONS.items()
+    ]
+
+
 def generate_logo_pngs():
     """Generate PNG files for all logo variations"""
 
@@ -81,43 +101,17 @@ def generate_logo_pngs():
 
     print("🎨 Generating PermitIndex logo variations...\n")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(viewport={'width': 600, 'height': 200})
-
-        for variant_name, config in LOGO_VARIATIONS.items():
-            print(f"Creating {variant_name} logo ({config['color']})...")
-
-            # Create HTML with the logo
-            html_content = create_logo_html(config['color'], config['bg'])
-
-            # Load the HTML
-            page.set_content(html_content)
-
-            # Wait for fonts to load
-            page.wait_for_timeout(500)
-
-            # Take screenshot
-            output_path = os.path.join(output_dir, config['name'])
-
-            # Screenshot with transparent background (except for white version)
-            if config['bg'] == 'transparent':
-                page.screenshot(
-                    path=output_path,
-                    omit_background=True
-                )
-            else:
-                page.screenshot(path=output_path)
-
-            print(f"✓ Saved: {output_path}")
-
-        browser.close()
+    results = render_assets(logo_assets(output_dir))
+    if print_results(results):
+        print("\n✗ Some logo variations failed")
+        return 1
 
     print("\n✅ All logo variations generated successfully!")
     print(f"📁 Output directory: {output_dir}/")
     print("\nGenerated files:")
     for config in LOGO_VARIATIONS.values():
         print(f"  - {config['name']}")
+    return 0
 
 if __name__ == '__main__':
-    generate_logo_pngs()
+    exit(generate_logo_pngs())
@@ -6,11 +6,15 @@ Creates 6 versions total:
 - Icon (Square P): primary, white, black
 - Horizontal: primary, white, black
 Outputs to ~/Downloads/news123-logos/
+
+Logos render in parallel through brand_assets.py and are skipped while
+their markup is unchanged.
 """
 
-from playwright.sync_api import sync_playwright
 import os
 
+from brand_assets import render_assets, print_results
+
 # Output to user's Downloads folder, outside the project
 OUTPUT_DIR = os.path.expanduser('~/Downloads/news123-logos')
 
@@ -140,51 +144,42 @@ def create_horizontal_html(color, bg_color):
 </html>
 """
 
+def official_logo_assets():
+    """Describe one brand asset per official logo"""
+    assets = []
+    for config in LOGO_CONFIGS:
+        # Choose appropriate viewport size
+        if config['type'] == 'icon':
+            viewport = (500, 500)
+            html_content = create_icon_html(config['color'], config['bg'])
+        else:  # horizontal
+            viewport = (600, 200)
+            html_content = create_horizontal_html(config['color'], config['bg'])
+
+        assets.append({
+            'name': config['name'],
+            'renderer': 'html',
+            'source': html_content,
+            'viewport': viewport,
+            'outputs': {os.path.join(OUTPUT_DIR, config['name']): viewport},
+            # Screenshot with transparent background (except for white versions)
+            'transparent': config['bg'] == 'transparent',
+        })
+    return assets
+
+
 def generate_logos():
     """Generate all PNG logo variations"""
 
-    # Clean and create output directory
-    if os.path.exists(OUTPUT_DIR):
-        import shutil
-        shutil.rmtree(OUTPUT_DIR)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print("🎨 Generating official PermitIndex logo PNGs...\n")
     print(f"📁 Output location: {OUTPUT_DIR}\n")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-
-        for config in LOGO_CONFIGS:
-            print(f"Creating {config['desc']}...")
-
-            # Choose appropriate viewport size
-            if config['type'] == 'icon':
-                page = browser.new_page(viewport={'width': 500, 'height': 500})
-                html_content = create_icon_html(config['color'], config['bg'])
-            else:  # horizontal
-                page = browser.new_page(viewport={'width': 600, 'height': 200})
-                html_content = create_horizontal_html(config['color'], config['bg'])
-
-            # Load the HTML
-            page.set_content(html_content)
-
-            # Wait for fonts to load
-            page.wait_for_timeout(500)
-
-            # Take screenshot
-            output_path = os.path.join(OUTPUT_DIR, config['name'])
-
-            # Screenshot with transparent background (except for white versions)
-            if config['bg'] == 'transparent':
-                page.screenshot(path=output_path, omit_background=True)
-            else:
-                page.screenshot(path=output_path)
-
-            print(f"✓ Saved: {config['name']}")
-            page.close()
-
-        browser.close()
+    results = render_assets(official_logo_assets())
+    if print_results(results):
+        print("\n✗ Some official logos failed")
+        return 1
 
     print("\n✅ All 6 official logo PNGs generated successfully!")
     print(f"\n📂 Files saved to: {OUTPUT_DIR}/\n")
@@ -198,6 +193,7 @@ def generate_logos():
     print("  - news123-horizontal-white.png")
     print("  - news123-horizontal-black.png")
     print(f"\n⚠️  These files are OUTSIDE the project directory and will NOT be committed to git")
+    return 0
 
 if __name__ == '__main__':
-    generate_logos()
+    exit(generate_logos())
@@ -3,11 +3,15 @@
 Generate square PNG logo variations for PermitIndex (just the P)
 Creates 4 versions: Primary (Navy), Accent (Orange), White, and Black
 Outputs to ~/Downloads/news123-logos/
+
+Variations render in parallel through brand_assets.py and are skipped
+while their markup is unchanged.
 """
 
-from playwright.sync_api import sync_playwright
 import os
 
+from brand_assets import render_assets, print_results
+
 # Output to user's Downloads folder, outside the project
 OUTPUT_DIR = os.path.expanduser('~/Downloads/news123-logos')
 
@@ -77,6 +81,22 @@ def create_square_logo_html(color, bg_color='transparent'):
 </html>
 """
 
+def square_logo_assets():
+    """Describe one brand asset per square logo variation"""
+    return [
+        {
+            'name': f'logo-square-{variant_name}',
+            'renderer': 'html',
+            'source': create_square_logo_html(config['color'], config['bg']),
+            'viewport': (500, 500),
+            'outputs': {os.path.join(OUTPUT_DIR, config['name']): (500, 500)},
+            # Screenshot with transparent background (except for white version)
+            'transparent': config['bg'] == 'transparent',
+        }
+        for variant_name, config in LOGO_VARIATIONS.items()
+    ]
+
+
 def generate_square_logo_pngs():
     """Generate square PNG files for all logo variations"""
 
@@ -85,37 +105,10 @@ def generate_square_logo_pngs():
     print(f"🎨 Generating PermitIndex square logo variations...\n")
     print(f"📁 Output location: {OUTPUT_DIR}\n")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(viewport={'width': 500, 'height': 500})
-
-        for variant_name, config in LOGO_VARIATIONS.items():
-            print(f"Creating {variant_name} square logo ({config['color']})...")
-
-            # Create HTML with the logo
-            html_content = create_square_logo_html(config['color'], config['bg'])
-
-            # Load the HTML
-            page.set_content(html_content)
-
-            # Wait for fonts to load
-            page.wait_for_timeout(500)
-
-            # Take screenshot
-            output_path = os.path.join(OUTPUT_DIR, config['name'])
-
-            # Screenshot with transparent background (except for white version)
-            if config['bg'] == 'transparent':
-                page.screenshot(
-                    path=output_path,
-                    omit_background=True
-                )
-            else:
-                page.screenshot(path=output_path)
-
-            print(f"✓ Saved: {output_path}")
-
-        browser.close()
+    results = render_assets(square_logo_assets())
+    if print_results(results):
+        print("\n✗ Some square logo variations failed")
+        return 1
 
     print("\n✅ All square logo variations generated successfully!")
     print(f"\n📂 Files saved to: {OUTPUT_DIR}/")
@@ -123,6 +116,7 @@ def generate_square_logo_pngs():
     for config in LOGO_VARIATIONS.values():
         print(f"  - {config['name']}")
     print(f"\n⚠️  These files are OUTSIDE the project directory and will NOT be committed to git")
+    return 0
 
 if __name__ == '__main__':
-    generate_square_logo_pngs()
+    exit(generate_square_logo_pngs())
@@ -14,15 +14,43 @@ Directory Structure:
 
 Usage:
     python generator.py
+    python generator.py --no-minify    # Write rendered HTML unminified
+    python generator.py --trace-memory # Record per-phase Python memory peaks
+    python generator.py --profile      # Rank slow templates/pages, export cProfile + speedscope
+    python generator.py --shard 2/4    # Render one slice of the pages (see sharding.py)
+    python generator.py --target sitemap  # Build one task and its dependencies (see build_dag.py)
+    python generator.py --jobs 1       # Run the build tasks one after another
+    python generator.py --stream --memory-budget 32MB  # Low-memory build (see article_stream.py)
+    python generator.py --no-content-store  # Keep article bodies in memory (see content_store.py)
+    python generator.py --render-workers 4  # Render article pages on 4 processes (see render_pool.py)
+
+Each build writes per-phase timings to .build_cache/telemetry/news.json
+(see build_telemetry.py for comparing against a baseline).
 """
 
 import os
 import json
 import glob
+import argparse
 from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 import re
 
+from article_stream import ArticleStream, DEFAULT_BUDGET, parse_size
+from build_dag import BuildGraph, DEFAULT_JOBS
+from build_profiler import RenderProfiler
+from build_telemetry import BuildTelemetry, format_bytes
+from content_store import ContentStore
+from html_minifier import MinifyReport
+from image_pipeline import build_responsive_images, PILLOW_AVAILABLE
+from og_cards import render_cards
+from output_writer import OutputWriter
+from render_pool import render_article_pages
+from sharding import Shard, keep_all
+
+# Writes every output file atomically and skips files whose bytes are
+# unchanged (counts are reset by each generate_site() call)
+output_writer = OutputWriter()
 
 # Required fields for article records
 REQUIRED_FIELDS = [
@@ -69,8 +97,13 @@ def format_date(date_str):
         return date_str
 
 
-def load_articles(data_dir='data/articles'):
-    """Load all article data from JSON files."""
+def load_articles(data_dir='data/articles', content_store=None):
+    """
+    Load all article data from JSON files.
+
+    With a ContentStore, each article's `content` is moved into the store
+    and replaced by a ContentHandle that reads it back when rendered.
+    """
     articles = []
 
     if not os.path.exists(data_dir):
@@ -82,23 +115,34 @@ def load_articles(data_dir='data/articles'):
 
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    articles.extend(data)
-                else:
-                    articles.append(data)
+            loaded = load_article_file(json_file)
+            if content_store is not None:
+                for article in loaded:
+                    if isinstance(article.get('content'), str):
+                        article['content'] = content_store.put(article['id'], article['content'])
+            articles.extend(loaded)
             print(f"Loaded {json_file}")
         except Exception as e:
             print(f"Error loading {json_file}: {e}")
 
-    # Add formatted date to each article
-    for article in articles:
-        article['published_date_formatted'] = format_date(article.get('published_date', ''))
+    return articles
+
 
+def load_article_file(json_file):
+    """Load the articles of one JSON file (a list or a single record)."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    articles = data if isinstance(data, list) else [data]
+    for article in articles:
+        prepare_article(article)
     return articles
 
 
+def prepare_article(article):
+    """Add derived fields (formatted date) to a loaded article."""
+    article['published_date_formatted'] = format_date(article.get('published_date', ''))
+
+
 def get_categories(articles):
     """Extract unique categories from articles."""
     categories = {}
@@ -160,91 +204,314 @@ def calculate_stats(articles, categories):
     }
 
 
-def generate_site(articles, output_dir='output'):
-    """Generate all static pages."""
-    # Setup Jinja2 environment
-    env = Environment(loader=FileSystemLoader('templates'))
+def render_page(template, output_path, minify_report=None, telemetry=None, profiler=None, **context):
+    """
+    Render a template straight to disk.
 
-    # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
+    The template is rendered as a stream of chunks; when a MinifyReport is
+    given, each chunk is minified on the way to the file. A RenderProfiler
+    (--profile) times the rendering and the write separately.
 
-    # Get categories and stats
-    categories = get_categories(articles)
-    stats = calculate_stats(articles, categories)
-    featured_topics = get_featured_topics(articles)
-
-    # Sort articles by date (newest first)
-    articles_sorted = sorted(
-        articles,
-        key=lambda x: x.get('published_date', ''),
-        reverse=True
-    )
-    latest_articles = articles_sorted[:9]  # Get 9 latest for homepage
-
-    # Generate homepage
-    print("Generating homepage...")
-    template = env.get_template('index.html')
-    html = template.render(
-        stats=stats,
-        categories=categories,
-        latest_articles=latest_articles,
-        featured_topics=featured_topics
-    )
-    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(html)
+    Returns True if the file was written, False if it was unchanged.
+    """
+    chunks = template.generate(**context)
+    if minify_report is not None:
+        chunks = minify_report.stream(template.name, chunks)
 
-    # Generate article pages
-    print("Generating article pages...")
-    article_template = env.get_template('article_page.html')
+    if profiler is None:
+        written = write_chunks(output_path, chunks)
+    else:
+        with profiler.page(template.name, output_path) as timer:
+            written = write_chunks(output_path, timer.time_render(chunks))
 
-    for article in articles:
-        # Create category directory
-        cat_dir = os.path.join(output_dir, article.get('category_slug', 'uncategorized'))
-        os.makedirs(cat_dir, exist_ok=True)
+    if telemetry is not None:
+        telemetry.record_file(output_path, page=True, written=written)
+    return written
 
-        # Create article directory
-        article_dir = os.path.join(cat_dir, article.get('slug', article['id']))
-        os.makedirs(article_dir, exist_ok=True)
 
-        # Find related articles (same category, different article)
-        related = [
-            a for a in articles
-            if a.get('category_slug') == article.get('category_slug')
-            and a['id'] != article['id']
-        ][:4]
+def write_chunks(output_path, chunks):
+    """Write rendered chunks to a file (skipped if its bytes are unchanged); True if written."""
+    return output_writer.write_chunks(output_path, chunks)
 
-        # Render article page
-        html = article_template.render(
-            article=article,
-            related_articles=related
-        )
 
-        with open(os.path.join(article_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
+def article_path(article):
+    """Site path of an article page."""
+    return f"/{article.get('category_slug', 'uncategorized')}/{article.get('slug', article['id'])}/"
+
+
+def build_index(articles, shard=None):
+    """
+    Global listing indexes for the homepage, category pages and sitemap.
+
+    Always computed from every article; with a Shard, also the subset of
+    article and category pages the shard renders.
+    """
+    # Get categories and stats
+    categories = get_categories(articles)
+    index = {
+        'categories': categories,
+        'stats': calculate_stats(articles, categories),
+        'featured_topics': get_featured_topics(articles),
+        # 9 latest articles for the homepage (newest first)
+        'latest_articles': sorted(
+            articles,
+            key=lambda x: x.get('published_date', ''),
+            reverse=True
+        )[:9],
+    }
+
+    # Pages this build renders
+    if shard is not None:
+        print(f"Shard {shard}: rendering pages whose URL hashes to this shard")
+        index['articles_to_render'] = [a for a in articles if shard.owns(article_path(a))]
+        index['categories_to_render'] = [c for c in categories if shard.owns(f"/category/{c['slug']}/")]
+    else:
+        index['articles_to_render'] = articles
+        index['categories_to_render'] = categories
+    return index
+
+
+def build_graph(articles, output_dir='output', minify=True, telemetry=None, profiler=None, shard=None,
+                env=None, stream=None, render_workers=0):
+    """
+    Describe the build as a graph of tasks (see build_dag.py).
+
+    Every task depends only on the global index computed from all articles
+    (or on nothing), so the page, image, sitemap and static tasks can run
+    side by side. With a Shard, only the pages (and sitemap entries) owned
+    by the shard are written. Pass `env` to reuse already compiled
+    templates (dev_server.py).
+
+    With an ArticleStream, `articles` are its compact listing records and
+    the article pages read the full articles from disk in chunks. With
+    render_workers > 1, article pages are rendered on that many processes.
+
+    Returns:
+        (BuildGraph, MinifyReport or None)
+    """
+    # Setup Jinja2 environment
+    env = env or Environment(loader=FileSystemLoader('templates'))
+    minify_report = MinifyReport() if minify else None
+
+    graph = BuildGraph('news')
+
+    def homepage(index):
+        print("Generating homepage...")
+        generate_homepage(env, index, output_dir, minify_report, telemetry, profiler, shard)
+
+    def images(index):
+        # Build responsive WebP variants for local article images
+        print("Processing images...")
+        if not PILLOW_AVAILABLE:
+            print("  Pillow not installed, skipping responsive images and social cards (pip install Pillow)")
+        return build_responsive_images(
+            [article.get('image_url') for article in index['articles_to_render']],
+            output_dir
+        )
 
-    # Generate category pages
-    print("Generating category pages...")
-    generate_category_pages(env, categories, output_dir)
+    def social_cards(index):
+        # Draw per-article social cards (only cards whose text changed are redrawn)
+        print("Rendering social cards...")
+        return render_cards(
+            [
+                {
+                    'id': article['id'],
+                    'title': article.get('title', ''),
+                    'label': article.get('category', ''),
+                    'theme': 'news',
+                }
+                for article in index['articles_to_render']
+            ],
+            output_dir
+        )
 
-    # Generate sitemap
-    print("Generating sitemap...")
-    generate_sitemap(articles, categories, output_dir)
+    def article_pages(index, images, cards):
+        print("Generating article pages...")
+        if stream is None:
+            generate_article_pages(env, index['articles_to_render'], output_dir, images[0], cards[0],
+                                   minify_report, telemetry, profiler, related_pool=articles,
+                                   workers=render_workers)
+            return
+
+        # Related-article cards only need the listing records
+        wanted = {a['id'] for a in index['articles_to_render']} if shard is not None else None
+        for chunk in stream.chunks(wanted):
+            generate_article_pages(env, chunk, output_dir, images[0], cards[0],
+                                   minify_report, telemetry, profiler, related_pool=articles,
+                                   workers=render_workers)
+
+    def category_pages(index):
+        print("Generating category pages...")
+        generate_category_pages(env, index['categories_to_render'], output_dir,
+                                minify_report, telemetry, profiler)
+
+    def sitemap(index):
+        print("Generating sitemap...")
+        written = generate_sitemap(articles, index['categories'], output_dir, shard)
+        if telemetry is not None:
+            telemetry.record_file(os.path.join(output_dir, 'sitemap.xml'), written=written)
+
+    def robots():
+        print("Generating robots.txt...")
+        written = generate_robots(output_dir)
+        if telemetry is not None:
+            telemetry.record_file(os.path.join(output_dir, 'robots.txt'), written=written)
+
+    def static():
+        print("Copying static files...")
+        copy_static_files(output_dir, telemetry)
+
+    graph.add('index', lambda: build_index(articles, shard))
+    graph.add('render:index.html', homepage, inputs=['index'], outputs=['index.html'])
+    graph.add('images', images, inputs=['index'], outputs=['images/'])
+    graph.add('og_cards', social_cards, inputs=['index'], outputs=['og/'])
+    graph.add('render:article_page.html', article_pages, inputs=['index', 'images', 'og_cards'],
+              outputs=['<category>/<slug>/index.html'])
+    graph.add('render:category_page.html', category_pages, inputs=['index'], outputs=['category/'])
+    graph.add('sitemap', sitemap, inputs=['index'], outputs=['sitemap.xml'])
+    graph.add('robots', robots, outputs=['robots.txt'])
+    graph.add('static', static, outputs=static_outputs())
+    return graph, minify_report
+
+
+def generate_site(articles, output_dir='output', minify=True, telemetry=None, profiler=None, shard=None,
+                  targets=None, jobs=DEFAULT_JOBS, stream=None, render_workers=0):
+    """
+    Generate all static pages (or only `targets` and the tasks they need).
+
+    Independent tasks run on `jobs` threads; a profiled build always runs
+    on one thread so cProfile sees every task. With an ArticleStream
+    (--stream), `articles` are listing records and article content is read
+    from disk within the stream's memory budget. render_workers > 1 renders
+    article pages on a process pool (not when profiling).
+
+    Returns:
+        The BuildGraph that ran (per-task timings in graph.timings)
+    """
+    telemetry = telemetry or BuildTelemetry('news')
 
-    # Generate robots.txt
-    print("Generating robots.txt...")
-    generate_robots(output_dir)
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+    output_writer.reset()
 
-    # Copy static files
-    print("Copying static files...")
-    copy_static_files(output_dir)
+    graph, minify_report = build_graph(articles, output_dir, minify, telemetry, profiler, shard,
+                                       stream=stream, render_workers=render_workers)
+    results = graph.run(targets, jobs=1 if profiler is not None else jobs, telemetry=telemetry)
+    index = results.get('index')
 
     print(f"\nSite generation complete!")
+    if targets:
+        print(f"  - Targets: {', '.join(targets)} ({len(results)} tasks run)")
     print(f"  - {len(articles)} articles")
-    print(f"  - {len(categories)} categories")
+    if index is not None:
+        print(f"  - {len(index['categories'])} categories")
+    if 'images' in results and results['images'][1]['images']:
+        image_stats = results['images'][1]
+        print(f"  - {image_stats['images']} images ({image_stats['encoded']} encoded, {image_stats['cached']} cached)")
+    if 'og_cards' in results and results['og_cards'][1]['cards']:
+        card_stats = results['og_cards'][1]
+        print(f"  - {card_stats['cards']} social cards ({card_stats['drawn']} drawn, {card_stats['cached']} cached)")
+    if shard is not None:
+        if index is not None:
+            print(f"  - Shard {shard}: {len(index['articles_to_render'])} article pages, "
+                  f"{len(index['categories_to_render'])} category pages")
+        shard.write_manifest(output_dir, 'news')
+    if stream is not None and stream.chunk_sizes:
+        print(f"  - Streamed articles in {len(stream.chunk_sizes)} chunks "
+              f"(largest {format_bytes(max(stream.chunk_sizes))}, budget {format_bytes(stream.budget)})")
+    print(f"  - Output files: {output_writer.summary()}")
     print(f"  - Output directory: {output_dir}/")
 
+    if minify_report is not None:
+        minify_report.print_summary()
+    graph.print_timings()
+    return graph
+
+
+def generate_homepage(env, index, output_dir, minify_report=None, telemetry=None, profiler=None, shard=None):
+    """Generate the homepage from the listing index (skipped by shards that don't own '/')."""
+    if shard is not None and not shard.owns('/'):
+        return
+    render_page(
+        env.get_template('index.html'),
+        os.path.join(output_dir, 'index.html'),
+        minify_report,
+        telemetry,
+        profiler,
+        stats=index['stats'],
+        categories=index['categories'],
+        latest_articles=index['latest_articles'],
+        featured_topics=index['featured_topics']
+    )
+
+
+def related_articles(article, related_pool):
+    """Up to 4 articles from related_pool in the same category (not the article itself)."""
+    return [
+        a for a in related_pool
+        if a.get('category_slug') == article.get('category_slug')
+        and a['id'] != article['id']
+    ][:4]
+
+
+def generate_article_pages(env, articles, output_dir, responsive_images, og_cards,
+                           minify_report=None, telemetry=None, profiler=None, related_pool=None,
+                           workers=0):
+    """
+    Generate one page per article.
+
+    Related articles are picked from related_pool (defaults to `articles`),
+    so a shard links to the same related articles as a full build. With
+    workers > 1 (and no profiler), pages are rendered on a process pool
+    that reads the articles from shared memory-mapped files (render_pool.py).
+    """
+    related_pool = articles if related_pool is None else related_pool
+
+    if workers > 1 and profiler is None and articles:
+        render_article_pages(
+            [
+                {
+                    'article': article,
+                    'article_image': responsive_images.get(article.get('image_url')),
+                    'og_image': og_cards.get(article['id']),
+                    'related': [a['id'] for a in related_articles(article, related_pool)],
+                }
+                for article in articles
+            ],
+            related_pool,
+            output_dir,
+            workers,
+            minify_report,
+            telemetry,
+            templates_dir=env.loader.searchpath
+        )
+        return
+
+    article_template = env.get_template('article_page.html')
+
+    for article in articles:
+        # Article directory (created by the output writer)
+        article_dir = os.path.join(
+            output_dir,
+            article.get('category_slug', 'uncategorized'),
+            article.get('slug', article['id'])
+        )
+
+        # Render article page
+        render_page(
+            article_template,
+            os.path.join(article_dir, 'index.html'),
+            minify_report,
+            telemetry,
+            profiler,
+            article=article,
+            article_image=responsive_images.get(article.get('image_url')),
+            og_image=og_cards.get(article['id']),
+            related_articles=related_articles(article, related_pool)
+        )
 
-def generate_category_pages(env, categories, output_dir):
+
+def generate_category_pages(env, categories, output_dir, minify_report=None, telemetry=None, profiler=None):
     """Generate category listing pages."""
     # Create a simple category template inline if it doesn't exist
     category_template_content = '''<!DOCTYPE html>
@@ -319,17 +586,15 @@ def generate_category_pages(env, categories, output_dir):
 </body>
 </html>'''
 
-    # Write category template
-    with open('templates/category_page.html', 'w', encoding='utf-8') as f:
-        f.write(category_template_content)
+    # Write category template (only when it changed, so the compiled
+    # template stays cached and file watchers are not triggered)
+    # (a writer of its own: templates are not counted as build output)
+    OutputWriter().write(os.path.join('templates', 'category_page.html'), category_template_content)
 
-    # Reload environment to pick up new template
-    env = Environment(loader=FileSystemLoader('templates'))
+    # The environment reloads templates whose file changed
     category_template = env.get_template('category_page.html')
 
-    # Create categories index directory
     categories_dir = os.path.join(output_dir, 'category')
-    os.makedirs(categories_dir, exist_ok=True)
 
     for category in categories:
         # Sort articles by date
@@ -339,72 +604,84 @@ def generate_category_pages(env, categories, output_dir):
             reverse=True
         )
 
-        # Create category directory
-        cat_dir = os.path.join(categories_dir, category['slug'])
-        os.makedirs(cat_dir, exist_ok=True)
-
         # Render category page
-        html = category_template.render(category=category)
-
-        with open(os.path.join(cat_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
+        render_page(
+            category_template,
+            os.path.join(categories_dir, category['slug'], 'index.html'),
+            minify_report,
+            telemetry,
+            profiler,
+            category=category
+        )
 
 
-def generate_sitemap(articles, categories, output_dir):
-    """Generate sitemap.xml."""
+def generate_sitemap(articles, categories, output_dir, shard=None):
+    """Generate sitemap.xml (only the shard's own entries for sharded builds); True if written."""
     sitemap_entries = []
     base_url = 'https://news123.com'
     today = datetime.now().strftime('%Y-%m-%d')
 
     # Homepage
-    sitemap_entries.append(f'''  <url>
+    sitemap_entries.append(('/', f'''  <url>
     <loc>{base_url}/</loc>
     <lastmod>{today}</lastmod>
     <changefreq>hourly</changefreq>
     <priority>1.0</priority>
-  </url>''')
+  </url>'''))
 
     # Category pages
     for category in categories:
-        sitemap_entries.append(f'''  <url>
-    <loc>{base_url}/category/{category['slug']}/</loc>
+        path = f"/category/{category['slug']}/"
+        sitemap_entries.append((path, f'''  <url>
+    <loc>{base_url}{path}</loc>
     <lastmod>{today}</lastmod>
     <changefreq>daily</changefreq>
     <priority>0.8</priority>
-  </url>''')
+  </url>'''))
 
     # Article pages
     for article in articles:
         lastmod = article.get('updated_date') or article.get('published_date', today)
-        sitemap_entries.append(f'''  <url>
-    <loc>{base_url}/{article.get('category_slug', 'news')}/{article.get('slug', article['id'])}/</loc>
+        path = f"/{article.get('category_slug', 'news')}/{article.get('slug', article['id'])}/"
+        sitemap_entries.append((path, f'''  <url>
+    <loc>{base_url}{path}</loc>
     <lastmod>{lastmod}</lastmod>
     <changefreq>weekly</changefreq>
     <priority>0.6</priority>
-  </url>''')
+  </url>'''))
+
+    sitemap_entries = keep_all(shard, 'sitemap', sitemap_entries, lambda entry: entry[0])
 
     sitemap_content = f'''<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{chr(10).join(sitemap_entries)}
+{chr(10).join(block for _, block in sitemap_entries)}
 </urlset>'''
 
-    with open(os.path.join(output_dir, 'sitemap.xml'), 'w', encoding='utf-8') as f:
-        f.write(sitemap_content)
+    return output_writer.write(os.path.join(output_dir, 'sitemap.xml'), sitemap_content)
 
 
 def generate_robots(output_dir):
-    """Generate robots.txt."""
+    """Generate robots.txt; True if written."""
     robots_content = '''User-agent: *
 Allow: /
 
 Sitemap: https://news123.com/sitemap.xml
 '''
 
-    with open(os.path.join(output_dir, 'robots.txt'), 'w', encoding='utf-8') as f:
-        f.write(robots_content)
+    return output_writer.write(os.path.join(output_dir, 'robots.txt'), robots_content)
+
+
+def static_outputs(static_src='static'):
+    """Entries copy_static_files() writes at the root of the output directory."""
+    if not os.path.exists(static_src):
+        return []
+    return sorted(
+        item + '/' if os.path.isdir(os.path.join(static_src, item)) else item
+        for item in os.listdir(static_src)
+    )
 
 
-def copy_static_files(output_dir):
+def copy_static_files(output_dir, telemetry=None):
     """Copy static files to output directory."""
     import shutil
 
@@ -420,27 +697,112 @@ def copy_static_files(output_dir):
                 if os.path.exists(dest_path):
                     shutil.rmtree(dest_path)
                 shutil.copytree(src_path, dest_path)
+                if telemetry is not None:
+                    telemetry.record_tree(dest_path)
             else:
                 shutil.copy2(src_path, dest_path)
+                if telemetry is not None:
+                    telemetry.record_file(dest_path)
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='News123 Static Site Generator')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='Write rendered HTML without minification')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record per-phase memory peaks with tracemalloc (slower)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time every template/page and export cProfile + speedscope files')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='Render only the pages of shard I out of N (merge with sharding.py)')
+    parser.add_argument('--output', help='Output directory (default: output, or output-shard-I-of-N)')
+    parser.add_argument('--target', action='append', metavar='TASK',
+                        help='Build only this task and its dependencies (repeatable, e.g. --target sitemap)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help='Build tasks run concurrently (default: %(default)s; --profile uses 1)')
+    parser.add_argument('--list-targets', action='store_true',
+                        help='List build tasks with their inputs and outputs, then exit')
+    parser.add_argument('--stream', action='store_true',
+                        help='Low-memory build: index listing fields, stream article content from disk')
+    parser.add_argument('--memory-budget', default=f'{DEFAULT_BUDGET // (1024 * 1024)}MB',
+                        help='Article content held at once with --stream (default: %(default)s)')
+    parser.add_argument('--no-content-store', action='store_true',
+                        help='Keep article bodies in memory instead of the mmap content store')
+    parser.add_argument('--render-workers', type=int, default=0, metavar='N',
+                        help='Render article pages on N processes sharing the dataset '
+                             '(default: in-process; ignored with --profile)')
+    args = parser.parse_args()
+
+    graph = build_graph([])[0]
+    if args.list_targets:
+        print("Build tasks:")
+        graph.describe()
+        return
+    try:
+        graph.plan(args.target)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        shard = Shard.parse(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    output_dir = args.output or (shard.default_output_dir() if shard else 'output')
+    try:
+        budget = parse_size(args.memory_budget)
+    except ValueError as e:
+        parser.error(str(e))
+
+    telemetry = BuildTelemetry('news', trace_memory=args.trace_memory)
+    profiler = RenderProfiler('news') if args.profile else None
+    if profiler is not None:
+        profiler.start()
+
     print("News123 Static Site Generator")
     print("=" * 40)
 
-    # Load articles
-    articles = load_articles()
-
-    if not articles:
-        print("\nNo articles found. Creating sample data...")
-        create_sample_data()
-        articles = load_articles()
+    # Load articles (--stream: listing records only; otherwise bodies go to
+    # the content store unless --no-content-store)
+    stream = None
+    content_store = None if args.stream or args.no_content_store else ContentStore()
+    with telemetry.phase('load'):
+        if args.stream:
+            os.makedirs('data/articles', exist_ok=True)
+            stream = ArticleStream('data/articles', budget, prepare=prepare_article)
+            articles = stream.scan()
+        else:
+            articles = load_articles(content_store=content_store)
+
+        if not articles:
+            print("\nNo articles found. Creating sample data...")
+            create_sample_data()
+            if args.stream:
+                stream = ArticleStream('data/articles', budget, prepare=prepare_article)
+                articles = stream.scan()
+            else:
+                articles = load_articles(content_store=content_store)
 
     print(f"\nLoaded {len(articles)} articles")
 
     # Generate site
-    generate_site(articles)
+    generate_site(articles, output_dir, minify=not args.no_minify, telemetry=telemetry,
+                  profiler=profiler, shard=shard, targets=args.target, jobs=args.jobs, stream=stream,
+                  render_workers=args.render_workers)
+    if content_store is not None:
+        content_store.save()
+        content_store.close()
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.print_report()
+        print("\nProfile written to:")
+        for path in profiler.export():
+            print(f"  - {path}")
+
+    report_path = telemetry.write()
+    print(f"\nBuild: {telemetry.pages} pages in {telemetry.report()['wall_seconds']:.2f}s, "
+          f"telemetry written to {report_path}")
 
 
 def create_sample_data():
@@ -536,8 +898,7 @@ def create_sample_data():
     os.makedirs('data/articles', exist_ok=True)
 
     # Write sample data
-    with open('data/articles/sample_articles.json', 'w', encoding='utf-8') as f:
-        json.dump(sample_articles, f, indent=2)
+    OutputWriter().write('data/articles/sample_articles.json', json.dumps(sample_articles, indent=2))
 
     print("Sample data created in data/articles/sample_articles.json")
 
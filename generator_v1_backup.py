@@ -32,31 +32,74 @@ Color System:
 
 Usage:
     python generator.py
+    python generator.py --no-minify      # Write rendered HTML unminified
+    python generator.py --trace-memory   # Record per-phase Python memory peaks
+    python generator.py --profile        # Rank slow templates/pages, export cProfile + speedscope
+    python generator.py --shard 2/4      # Render one slice of the pages (see sharding.py)
+    python generator.py --target sitemap # Build one task and its dependencies (see build_dag.py)
+    python generator.py --jobs 1         # Run the build tasks one after another
+
+Each build writes per-phase timings to .build_cache/telemetry/permits.json
+(see build_telemetry.py for comparing against a baseline).
 """
 
 import os
 import json
-import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 import sys
 import re
+import argparse
+import threading
+
+from build_dag import BuildGraph, DEFAULT_JOBS
+from build_profiler import PROFILE_DIR, RenderProfiler
+from build_telemetry import BuildTelemetry, default_report_path, print_report
+from facets import FACET_PAGES, FacetIndex
+from html_minifier import MinifyReport
+from locations import LocationIndex
+from og_cards import render_cards
+from output_writer import OutputWriter
+from permit_fields import (
+    DERIVED_COLUMNS, PARSE_CACHE_PATH, PARSE_REPORT_PATH, STATE_SLUGS, ParseCache, column, normalize_permits,
+    page_records, slugify, slugify_column, split_numbered_steps, write_parse_report,
+)
+from permit_ingest import format_issue
+from permit_snapshot import SNAPSHOT_DIR, PermitSnapshot, load_permits
+from permit_stats import permit_stats
+from permit_types import TYPE_MAP_PATH, PermitTypeMap
+from sharding import Shard, keep_all
+
+
+# Issues printed when loading the permit files (the rest are counted)
+MAX_REPORTED_ISSUES = 50
 
 
 class SiteGenerator:
     """Main site generator class"""
 
-    def __init__(self, base_dir=None):
+    def __init__(self, base_dir=None, minify=True, trace_memory=False, profile=False, shard=None,
+                 jobs=DEFAULT_JOBS):
         """
         Initialize the site generator
 
         Args:
             base_dir: Base directory path (defaults to script location)
+            minify: Minify rendered HTML as it is written
+            trace_memory: Record per-phase memory peaks with tracemalloc
+            profile: Time every page and profile the run with cProfile
+            shard: Shard to render (None renders every page); sharded builds
+                write to output-shard-<i>-of-<N>/
+            jobs: Build tasks run concurrently (profiled builds use 1)
         """
         self.base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
         self.templates_dir = os.path.join(self.base_dir, 'templates')
         self.data_dir = os.path.join(self.base_dir, 'data')
-        self.output_dir = os.path.join(self.base_dir, 'output')
+        self.shard = shard
+        self.output_dir = os.path.join(
+            self.base_dir,
+            shard.default_output_dir() if shard else 'output'
+        )
         self.static_dir = os.path.join(self.base_dir, 'static')
 
         # Initialize Jinja2 environment
@@ -68,6 +111,23 @@ class SiteGenerator:
             'errors': 0,
             'start_time': datetime.now()
         }
+        self._stats_lock = threading.Lock()
+        self.jobs = 1 if profile else jobs
+
+        # Bytes saved by minification, per template
+        self.minify_report = MinifyReport() if minify else None
+
+        # Atomic writes that skip files whose bytes are unchanged
+        self.writer = OutputWriter()
+
+        # Per-phase timings, pages and bytes written
+        self.telemetry = BuildTelemetry('permits', trace_memory=trace_memory)
+
+        # Per-template/per-page timings and cProfile (--profile)
+        self.profiler = RenderProfiler('permits') if profile else None
+
+        # (file, line) of each loaded permit row, set by load_data()
+        self.permit_sources = None
 
     def slugify(self, text):
         """
@@ -79,13 +139,7 @@ class SiteGenerator:
         Returns:
             URL-safe slug
         """
-        # Convert to lowercase
-        text = text.lower()
-        # Remove special characters and replace spaces with hyphens
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'[\s_]+', '-', text)
-        text = re.sub(r'^-+|-+$', '', text)
-        return text
+        return slugify(text)
 
     def generate_url_slug(self, agency_short, request_type):
         """
@@ -102,15 +156,7 @@ class SiteGenerator:
         state_abbrev = agency_short.split()[0] if agency_short else ""
 
         # Map common state abbreviations to full names
-        state_map = {
-            'CA': 'california',
-            'NY': 'new-york',
-            'TX': 'texas',
-            'FL': 'florida',
-            # Add more as needed
-        }
-
-        state_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
+        state_slug = STATE_SLUGS.get(state_abbrev, self.slugify(state_abbrev))
 
         # Slugify request type
         request_slug = self.slugify(request_type)
@@ -118,30 +164,204 @@ class SiteGenerator:
         # Combine: state-request-type
         return f"{state_slug}-{request_slug}"
 
-    def load_data(self, csv_file):
+    def load_data(self, permits_dir=None, strict=True, columns=None):
         """
-        Load data from CSV file
+        Load every permit CSV/JSON file of data/permits/ (see permit_ingest.py)
+
+        Files are parsed in parallel and validated; missing columns, empty
+        required fields and duplicate permits are reported with their file
+        and line. The result is kept as a columnar snapshot keyed by the
+        files' contents (see permit_snapshot.py), so builds with unchanged
+        files memory-map it instead of parsing them again.
 
         Args:
-            csv_file: Path to CSV file
+            permits_dir: Directory of permit files (data/permits/ if None)
+            strict: Exit when a file has errors (otherwise report them and
+                keep every row)
+            columns: Columns to load (all if None)
 
         Returns:
-            pandas DataFrame with loaded data
+            pandas DataFrame with the combined rows (categorical columns)
         """
-        csv_path = os.path.join(self.data_dir, csv_file)
-        print(f"📂 Loading data from: {csv_path}")
-
-        try:
-            df = pd.read_csv(csv_path)
-            print(f"✓ Loaded {len(df)} records")
-            return df
-        except FileNotFoundError:
-            print(f"✗ Error: CSV file not found: {csv_path}")
+        permits_dir = permits_dir or os.path.join(self.data_dir, 'permits')
+        print(f"📂 Loading data from: {permits_dir}")
+
+        snapshot = PermitSnapshot(os.path.join(self.base_dir, SNAPSHOT_DIR))
+        df, manifest, hit = load_permits(permits_dir, snapshot, columns)
+        issues = manifest['issues']
+        errors = sum(item['level'] == 'error' for item in issues)
+        for path in manifest['skipped']:
+            print(f"  - Skipped {os.path.basename(path)} (generated from the CSV file of the same name)")
+        for item in issues[:MAX_REPORTED_ISSUES]:
+            print(f"{'✗' if item['level'] == 'error' else '⚠️ '} {format_issue(item)}")
+        if len(issues) > MAX_REPORTED_ISSUES:
+            print(f"  ... and {len(issues) - MAX_REPORTED_ISSUES} more issues")
+
+        if not manifest['files']:
+            print(f"✗ Error: no permit CSV/JSON files in {permits_dir}")
             sys.exit(1)
-        except Exception as e:
-            print(f"✗ Error loading CSV: {e}")
+        if errors and strict:
+            print(f"✗ Error: {errors} errors in the permit files")
             sys.exit(1)
 
+        self.permit_sources = snapshot.sources(manifest)
+        source = 'snapshot' if hit else 'parsed, snapshot written'
+        print(f"✓ Loaded {len(df)} records from {len(manifest['files'])} files ({source})")
+        return df
+
+    def normalize(self, df):
+        """
+        Add the derived fields to the loaded permits (see permit_fields.py)
+
+        Steps and JSON columns of rows unchanged since the last build come
+        from the parse cache; cost, volume and effort ranges become numeric
+        columns. Cells that cannot be parsed are written to the parse
+        warnings report, with the file and line of their row. Request
+        types are mapped to canonical permit types through
+        data/permit_types.json; types it does not know yet are clustered
+        and added to it for review.
+
+        Args:
+            df: DataFrame with permit data
+
+        Returns:
+            DataFrame with the derived columns
+        """
+        cache = ParseCache(os.path.join(self.base_dir, PARSE_CACHE_PATH))
+        warnings = []
+        unparseable = {}
+        type_map = PermitTypeMap(os.path.join(self.base_dir, TYPE_MAP_PATH))
+        df = normalize_permits(df, cache, warnings, unparseable, type_map=type_map, sources=self.permit_sources)
+        cache.save()
+        # Rewritten when a request type was mapped for the first time (new
+        # types and new aliases of known ones), so every mapping is reviewable
+        type_map.save()
+        print(f"✓ Parsed fields: {cache.hits} rows from cache, {cache.misses} parsed")
+        print(f"✓ Permit types: {df['request_type'].nunique()} request types in "
+              f"{df['permit_type'].nunique()} canonical types ({type_map.added} new)")
+
+        report_path = write_parse_report(warnings, os.path.join(self.base_dir, PARSE_REPORT_PATH), unparseable)
+        if warnings:
+            print(f"⚠️  {len(warnings)} cells could not be parsed (details in {report_path})")
+        for name, values in unparseable.items():
+            print(f"⚠️  {name}: {sum(values.values())} values are not a number or range "
+                  f"({', '.join(sorted(values)[:3])}{', ...' if len(values) > 3 else ''})")
+        return df
+
+    def build_locations(self, df):
+        """
+        Index the normalized permits by state and city (see locations.py)
+
+        Args:
+            df: DataFrame with the derived fields
+
+        Returns:
+            LocationIndex
+        """
+        locations = LocationIndex.from_permits(df)
+        print(f"✓ Locations: {len(locations.states)} states, {locations.total_cities()} cities, "
+              f"{len(locations.unresolved)} permits unresolved")
+        return locations
+
+    def build_facets(self, df):
+        """
+        Index the normalized permits by facet (see facets.py)
+
+        Args:
+            df: DataFrame with the derived fields
+
+        Returns:
+            FacetIndex
+        """
+        facets = FacetIndex.from_permits(df)
+        print(f"✓ Facets: {sum(len(values) for values in facets.facets.values())} facet values "
+              f"over {facets.size} permits")
+        return facets
+
+    def facet_pages(self, locations, facets):
+        """
+        Facet landing pages of every state, e.g. online permits in Texas at
+        /texas/online-permits/. A page is made when some, but not all, of
+        the state's permits match (otherwise it would repeat the state hub).
+
+        Returns:
+            List of dicts: path, slug, label, state, bits, count
+        """
+        pages = []
+        for state in locations.sorted_states():
+            state_bits = facets.select(state=state['slug'])
+            for slug, label, filters in FACET_PAGES:
+                if slug in state['cities']:
+                    continue
+                bits = facets.select(state_bits, **filters)
+                if bits and bits != state_bits:
+                    pages.append({
+                        'path': f"/{state['slug']}/{slug}/",
+                        'slug': slug,
+                        'label': label,
+                        'state': state,
+                        'bits': bits,
+                        'count': bits.bit_count(),
+                    })
+        return pages
+
+    def build_stats(self, df):
+        """
+        Aggregate the normalized permits per type, state and city (see
+        permit_stats.py)
+
+        Args:
+            df: DataFrame with the derived fields
+
+        Returns:
+            PermitStats
+        """
+        stats = permit_stats(df)
+        print(f"✓ Aggregated: {len(stats.by_type)} permit types, {len(stats.by_state)} states, "
+              f"{len(stats.by_city)} cities")
+        return stats
+
+    def permit_listing(self, df):
+        """
+        Fields of every permit shown on hub pages, in row order
+
+        Args:
+            df: DataFrame with the derived fields
+
+        Returns:
+            List of dicts (index = permit ID in the LocationIndex)
+        """
+        listing = {
+            'request_type': df['request_type'],
+            'agency_short': df['agency_short'],
+            'agency_full': df['agency_full'],
+            'description': column(df, 'description', ''),
+            'cost': df['cost'],
+            'effort_hours': column(df, 'effort_hours', ''),
+            'processing_time': df['processing_time'] if 'processing_time' in df.columns
+                               else column(df, 'effort_hours', ''),
+            'online_available': df['online_available'],
+            'api_available': df['api_available'],
+            'mcp_available': column(df, 'mcp_available', 'No'),
+            'permit_slug': df['permit_slug'],
+            'state_slug': df['state_slug'],
+            'url_path': df['url_path'],
+            'estimated_monthly_volume': column(df, 'estimated_monthly_volume', '0'),
+        }
+        return [dict(zip(listing, values)) for values in zip(*listing.values())]
+
+    def by_volume(self, df, permit_ids):
+        """
+        Permit IDs sorted by monthly volume, most popular first (lower bound
+        of the range: '800-1200' -> 800, else 0)
+        """
+        volumes = column(df, 'estimated_monthly_volume_min', 0.0).fillna(0.0).tolist()
+        return sorted(permit_ids, key=lambda permit_id: volumes[permit_id], reverse=True)
+
+    def owns(self, url):
+        """True when this build renders the page at `url`"""
+        return self.shard is None or self.shard.owns(url)
+
     def generate_page(self, template_name, data, output_path):
         """
         Generate a single HTML page from template and data
@@ -155,24 +375,36 @@ class SiteGenerator:
             # Load template
             template = self.env.get_template(template_name)
 
-            # Render template with data
-            html_content = template.render(**data)
-
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            # Render template with data as a stream of chunks
+            chunks = template.generate(**data)
+            if self.minify_report is not None:
+                chunks = self.minify_report.stream(template_name, chunks)
 
-            # Write HTML file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Write HTML file (the writer creates its directory)
+            if self.profiler is None:
+                written = self.write_chunks(output_path, chunks)
+            else:
+                with self.profiler.page(template_name, output_path) as timer:
+                    written = self.write_chunks(output_path, timer.time_render(chunks))
 
             print(f"✓ Generated: {output_path}")
-            self.stats['pages_generated'] += 1
+            self.count('pages_generated')
+            self.telemetry.record_file(output_path, page=True, written=written)
 
         except Exception as e:
             print(f"✗ Error generating page: {e}")
             import traceback
             traceback.print_exc()
-            self.stats['errors'] += 1
+            self.count('errors')
+
+    def count(self, stat):
+        """Increment a statistic (build tasks run on several threads)"""
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def write_chunks(self, output_path, chunks):
+        """Write rendered chunks to a file (skipped if its bytes are unchanged); True if written"""
+        return self.writer.write_chunks(output_path, chunks)
 
     def split_numbered_steps(self, text):
         """
@@ -185,145 +417,106 @@ class SiteGenerator:
         Returns:
             List of step strings without number prefixes
         """
-        if not text:
-            return []
-
-        # Split by pattern: space + digit + period + space (e.g., " 2. ")
-        # This preserves periods within sentences
-        steps = re.split(r'\s+\d+\.\s+', text)
-
-        # Clean up steps and remove number prefix from first step if present
-        cleaned_steps = []
-        for step in steps:
-            step = step.strip()
-            if step:
-                # Remove leading number from first step (e.g., "1. text" -> "text")
-                step = re.sub(r'^\d+\.\s*', '', step)
-                cleaned_steps.append(step)
-
-        return cleaned_steps
+        return split_numbered_steps(text)
 
-    def generate_transaction_pages(self, df):
+    def generate_transaction_pages(self, df, locations=None):
         """
         Generate all transaction pages from CSV data
 
         Args:
             df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
         """
         print("\n📄 Generating transaction pages...\n")
 
-        # Generate a page for each row in the CSV
-        for idx, row in df.iterrows():
-            # Convert row to dictionary
-            data = row.to_dict()
-
-            # Parse JSON fields
-            json_fields = ['community_feedback', 'user_tips', 'faqs']
-            for field in json_fields:
-                if field in data and isinstance(data[field], str) and data[field]:
-                    try:
-                        data[field] = json.loads(data[field])
-                    except json.JSONDecodeError:
-                        print(f"⚠️  Warning: Could not parse JSON for {field}")
-                        data[field] = []
-                else:
-                    data[field] = []
-
-            # Parse how_to_description into clean steps
-            if 'how_to_description' in data and data['how_to_description']:
-                data['how_to_steps'] = self.split_numbered_steps(data['how_to_description'])
-            else:
-                data['how_to_steps'] = []
-
-            # Extract jurisdiction slug
-            state_abbrev = data['agency_short'].split()[0] if data['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
-            data['jurisdiction_slug'] = jurisdiction_slug
-
-            # Generate clean permit slug (just the permit name, not state-permit)
-            permit_slug = self.slugify(data['request_type'])
-            data['permit_slug'] = permit_slug
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
 
-            # Full URL slug for compatibility (jurisdiction-permit)
-            data['url_slug'] = f"{jurisdiction_slug}-{permit_slug}"
+        # Prepare a page for each row in the CSV (derived fields come from
+        # normalize_permits)
+        pages = []
+        for data in page_records(df):
+            # Build output path from the URL: /output/{state}/{city}/{permit-slug}/index.html
+            # This creates clean URLs like /arizona/chandler/apply-for-a-business-license/
+            output_path = os.path.join(self.output_dir, *data['url_path'].strip('/').split('/'), 'index.html')
 
-            # Build output path: /output/{jurisdiction}/{permit-slug}/index.html
-            # This creates clean URLs like /california/food-truck-permit/
-            output_path = os.path.join(
-                self.output_dir,
-                jurisdiction_slug,
-                permit_slug,
-                'index.html'
-            )
-
-            # Generate the page
+            if self.owns(data['url_path']):
+                if data['state_slug']:
+                    data['breadcrumbs'] = locations.breadcrumbs(data['state_slug'], data['city_slug'])
+                else:
+                    data['breadcrumbs'] = [
+                        {'name': 'Home', 'path': '/'},
+                        {'name': data['agency_short'], 'path': f"/{data['jurisdiction_slug']}/"},
+                    ]
+                pages.append((data, output_path))
+
+        # Draw social cards for every page (cached by title and jurisdiction)
+        print("🖼️  Rendering social cards...")
+        og_cards, card_stats = render_cards(
+            [
+                {
+                    'id': data['url_slug'],
+                    'title': data['request_type'],
+                    'label': data['agency_short'],
+                    'theme': 'permits',
+                }
+                for data, _ in pages
+            ],
+            self.output_dir
+        )
+        if card_stats['cards']:
+            print(f"✓ Social cards: {card_stats['drawn']} drawn, {card_stats['cached']} cached\n")
+
+        # Generate the pages
+        for data, output_path in pages:
+            data['og_image'] = og_cards.get(data['url_slug'])
             self.generate_page('transaction_page.html', data, output_path)
 
-    def generate_jurisdiction_hubs(self, df):
+    def generate_jurisdiction_hubs(self, df, locations=None, facets=None):
         """
-        Generate hub pages for each jurisdiction
+        Generate hub pages for the jurisdictions of permits whose location
+        does not resolve to a state (the others are listed on the state and
+        city hubs)
 
         Args:
             df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
         """
         print("\n🌎 Generating jurisdiction hub pages...\n")
 
         # Group permits by jurisdiction
-        jurisdictions = {}
-        for _, row in df.iterrows():
-            state_abbrev = row['agency_short'].split()[0] if row['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+        permits = self.permit_listing(df)
+        names = df['agency_short'].tolist()
+        jurisdiction_slugs = df['jurisdiction_slug'].tolist()
 
+        jurisdictions = {}
+        for permit_id in locations.unresolved:
+            jurisdiction_slug = jurisdiction_slugs[permit_id]
             if jurisdiction_slug not in jurisdictions:
                 jurisdictions[jurisdiction_slug] = {
-                    'name': row['agency_short'],
-                    'permits': []
+                    'name': names[permit_id],
+                    'permit_ids': []
                 }
+            jurisdictions[jurisdiction_slug]['permit_ids'].append(permit_id)
 
-            permit_slug = self.slugify(row['request_type'])
-            jurisdictions[jurisdiction_slug]['permits'].append({
-                'request_type': row['request_type'],
-                'agency_full': row['agency_full'],
-                'description': row['description'] if 'description' in row else '',
-                'cost': row['cost'],
-                'processing_time': row['processing_time'] if 'processing_time' in row else row.get('effort_hours', ''),
-                'online_available': row['online_available'],
-                'api_available': row['api_available'],
-                'mcp_available': row.get('mcp_available', 'No'),
-                'permit_slug': permit_slug,
-                'estimated_monthly_volume': row.get('estimated_monthly_volume', '0')
-            })
-
-        # Generate a hub page for each jurisdiction
+        # Generate a hub page for each jurisdiction (state hubs own /<state>/)
         for jurisdiction_slug, data in jurisdictions.items():
-            # Calculate statistics
-            total_permits = len(data['permits'])
-            online_permits = len([p for p in data['permits'] if p['online_available'] == 'Yes'])
-            api_permits = len([p for p in data['permits'] if p['api_available'] == 'Yes'])
-            mcp_permits = len([p for p in data['permits'] if p['mcp_available'] == 'Yes'])
+            if jurisdiction_slug in locations.states or not self.owns(f"/{jurisdiction_slug}/"):
+                continue
 
             # Sort permits by monthly volume (most popular first)
-            # Handle non-numeric values like '800-1200' by taking the first number
-            def get_volume(permit):
-                vol = permit.get('estimated_monthly_volume', '0')
-                # Extract first number from string like '800-1200' -> 800
-                import re
-                match = re.search(r'\d+', str(vol))
-                return int(match.group()) if match else 0
+            sorted_permits = [permits[permit_id] for permit_id in self.by_volume(df, data['permit_ids'])]
 
-            sorted_permits = sorted(data['permits'], key=get_volume, reverse=True)
+            # Calculate statistics
+            hub = facets.select(state='', jurisdiction=jurisdiction_slug)
+            total_permits = len(sorted_permits)
+            online_permits = facets.count(hub, online=True)
+            api_permits = facets.count(hub, api=True)
+            mcp_permits = facets.count(hub, mcp=True)
 
             # Get top 6 popular permits
             popular_permits = sorted_permits[:6]
@@ -349,62 +542,299 @@ class SiteGenerator:
 
             self.generate_page('jurisdiction_hub.html', template_data, output_path)
 
-    def generate_homepage(self, df):
+    def generate_states_page(self, df, locations=None, facets=None):
+        """
+        Generate /states/ listing every state with permits
+
+        Args:
+            df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
+        """
+        print("\n🗺️  Generating states page...")
+
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+
+        states = []
+        for state in locations.sorted_states():
+            states.append({
+                'name': state['name'],
+                'slug': state['slug'],
+                'permit_count': facets.count(state=state['slug']),
+                'online_count': facets.count(state=state['slug'], online=True),
+                'api_count': facets.count(state=state['slug'], api=True),
+            })
+
+        template_data = {
+            'states': states,
+            'total_states': len(states),
+            'total_permits': sum(state['permit_count'] for state in states),
+            'online_permits': sum(state['online_count'] for state in states),
+        }
+
+        if states and self.owns('/states/'):
+            output_path = os.path.join(self.output_dir, 'states', 'index.html')
+            self.generate_page('states_page.html', template_data, output_path)
+
+    def generate_state_hubs(self, df, locations=None, facets=None):
+        """
+        Generate a hub page for each state: links to its facet pages,
+        statewide permits, then its cities with their permits
+
+        Args:
+            df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
+        """
+        print("\n🏛️  Generating state hub pages...\n")
+
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+        permits = self.permit_listing(df)
+        facet_pages = {}
+        for page in self.facet_pages(locations, facets):
+            facet_pages.setdefault(page['state']['slug'], []).append(page)
+
+        for state in locations.sorted_states():
+            if not self.owns(f"/{state['slug']}/"):
+                continue
+
+            cities = []
+            for city in locations.sorted_cities(state):
+                cities.append({
+                    'city_name': city['name'],
+                    'city_slug': city['slug'],
+                    'permit_count': len(city['permits']),
+                    'permits': [permits[permit_id] for permit_id in self.by_volume(df, city['permits'])],
+                })
+            statewide_permits = [permits[permit_id] for permit_id in self.by_volume(df, state['statewide'])]
+
+            template_data = {
+                'state_name': state['name'],
+                'state_slug': state['slug'],
+                'state_abbr': state['code'],
+                'total_permits': facets.count(state=state['slug']),
+                'total_cities': len(cities),
+                'online_permits': facets.count(state=state['slug'], online=True),
+                'api_permits': facets.count(state=state['slug'], api=True),
+                'facet_pages': facet_pages.get(state['slug'], []),
+                'cities': cities,
+                'statewide_permits': statewide_permits,
+                'city_permits': cities,
+            }
+
+            output_path = os.path.join(self.output_dir, state['slug'], 'index.html')
+            self.generate_page('state_hub.html', template_data, output_path)
+
+    def generate_city_hubs(self, df, locations=None, facets=None):
+        """
+        Generate a hub page for each city
+
+        Args:
+            df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
+        """
+        print("\n🏙️  Generating city hub pages...\n")
+
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+        permits = self.permit_listing(df)
+
+        for state in locations.sorted_states():
+            for city in locations.sorted_cities(state):
+                path = f"/{state['slug']}/{city['slug']}/"
+                if not self.owns(path):
+                    continue
+
+                city_key = f"{state['slug']}/{city['slug']}"
+                city_permits = [permits[permit_id] for permit_id in self.by_volume(df, city['permits'])]
+                template_data = {
+                    'city_name': city['name'],
+                    'city_slug': city['slug'],
+                    'state_name': state['name'],
+                    'state_slug': state['slug'],
+                    'total_permits': len(city_permits),
+                    'online_permits': facets.count(city=city_key, online=True),
+                    'api_permits': facets.count(city=city_key, api=True),
+                    'permits': city_permits,
+                }
+
+                output_path = os.path.join(self.output_dir, state['slug'], city['slug'], 'index.html')
+                self.generate_page('city_hub.html', template_data, output_path)
+
+    def generate_facet_pages(self, df, locations=None, facets=None):
+        """
+        Generate the facet landing pages of every state (see facet_pages)
+
+        Args:
+            df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
+        """
+        print("\n🔎 Generating facet pages...\n")
+
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+        permits = self.permit_listing(df)
+
+        for page in self.facet_pages(locations, facets):
+            if not self.owns(page['path']):
+                continue
+            state = page['state']
+            permit_ids = self.by_volume(df, facets.ids(page['bits']))
+            template_data = {
+                'title': f"{page['label']} Permits in {state['name']}",
+                'facet_label': page['label'],
+                'path': page['path'],
+                'state_name': state['name'],
+                'state_slug': state['slug'],
+                'state_permits': facets.count(state=state['slug']),
+                'total_permits': page['count'],
+                # Statewide permits have no city ('')
+                'total_cities': len([city for city in facets.counts('city', page['bits']) if city]),
+                'permits': [permits[permit_id] for permit_id in permit_ids],
+            }
+
+            output_path = os.path.join(self.output_dir, state['slug'], page['slug'], 'index.html')
+            self.generate_page('facet_page.html', template_data, output_path)
+
+    def generate_permits_index(self, df, stats=None):
+        """
+        Generate /permits/ listing every permit type
+
+        Args:
+            df: DataFrame with permit data
+            stats: PermitStats of the permits (aggregated from df if None)
+        """
+        print("\n📚 Generating permits index...")
+
+        stats = stats or permit_stats(normalize_permits(df))
+        permit_types = stats.type_records()
+        for permit_type in permit_types:
+            permit_type['description'] = self.summarize(permit_type['description'])
+
+        template_data = {
+            'permit_types': permit_types,
+            'total_permit_types': stats.totals['types'],
+            'total_jurisdictions': stats.totals['jurisdictions'],
+        }
+
+        if self.owns('/permits/'):
+            output_path = os.path.join(self.output_dir, 'permits', 'index.html')
+            self.generate_page('permits_index.html', template_data, output_path)
+
+    def generate_permit_type_hubs(self, df, stats=None):
+        """
+        Generate a hub page for each permit type listing every location
+        that offers it
+
+        Args:
+            df: DataFrame with permit data
+            stats: PermitStats of the permits (aggregated from df if None)
+        """
+        print("\n🧾 Generating permit type hub pages...\n")
+
+        df = normalize_permits(df)
+        stats = stats or permit_stats(df)
+        permits = self.permit_listing(df)
+        # "Chandler, Arizona", "District of Columbia", or the agency
+        location_names = (df['city_name'] + ', ' + df['state_name']).where(
+            df['city_name'] != '', df['state_name'].where(df['state_name'] != '', df['agency_short'])
+        ).tolist()
+        permit_ids = df.groupby('permit_type', sort=False).indices
+
+        permit_types = stats.type_records()
+        for permit_type in permit_types:
+            path = f"/permits/{permit_type['slug']}/"
+            if not self.owns(path):
+                continue
+
+            locations = sorted(
+                (
+                    {
+                        'jurisdiction_name': location_names[permit_id],
+                        'agency_name': permits[permit_id]['agency_short'],
+                        'cost': permits[permit_id]['cost'],
+                        'processing_time': permits[permit_id]['processing_time'],
+                        'online_available': permits[permit_id]['online_available'],
+                        'url': permits[permit_id]['url_path'],
+                    }
+                    for permit_id in permit_ids[permit_type['slug']]
+                ),
+                key=lambda location: location['jurisdiction_name']
+            )
+            related_permit_types = [
+                related for related in permit_types
+                if related['slug'] != permit_type['slug'] and not related['should_noindex']
+            ][:6]
+
+            template_data = {
+                'permit_type_name': permit_type['name'],
+                'permit_type_slug': permit_type['slug'],
+                'description': permit_type['description'],
+                'jurisdiction_count': permit_type['jurisdiction_count'],
+                'avg_cost': permit_type['avg_cost'],
+                'avg_processing_time': permit_type['processing_time'],
+                'online_percent': permit_type['online_percent'],
+                'should_noindex': permit_type['should_noindex'],
+                'locations': locations,
+                'related_permit_types': related_permit_types,
+            }
+
+            output_path = os.path.join(self.output_dir, 'permits', permit_type['slug'], 'index.html')
+            self.generate_page('permit_type_hub.html', template_data, output_path)
+
+    def summarize(self, text, length=100):
+        """Shorten a description to about `length` characters on a word boundary"""
+        if not isinstance(text, str):
+            return ''
+        if len(text) <= length:
+            return text
+        return text[:length].rsplit(' ', 1)[0].rstrip(',.;:') + '...'
+
+    def generate_homepage(self, df, stats=None):
         """
         Generate the homepage (index.html) with agency and permit listings
 
         Args:
             df: DataFrame with permit data
+            stats: PermitStats of the permits (aggregated from df if None)
         """
         print("\n🏠 Generating homepage...")
 
+        totals = (stats or permit_stats(normalize_permits(df))).totals
+
         # Calculate statistics
         stats = {
-            'total_permits': len(df),
-            'total_agencies': df['agency_full'].nunique(),
-            'online_permits': len(df[df['online_available'] == 'Yes']),
-            'api_permits': len(df[df['api_available'] == 'Yes'])
+            'total_permits': totals['permits'],
+            'total_agencies': totals['agencies'],
+            'online_permits': totals['online'],
+            'api_permits': totals['api']
         }
 
         # Get list of agencies with permit counts
-        agency_counts = df.groupby('agency_short').size().reset_index(name='permit_count')
-        jurisdictions = []
-        for _, row in agency_counts.iterrows():
-            # Generate slug for agency
-            agency_slug = self.slugify(row['agency_short'])
-            jurisdictions.append({
-                'name': row['agency_short'],
-                'slug': agency_slug,
-                'permit_count': row['permit_count']
-            })
+        agency_counts = df.groupby('agency_short', observed=True).size()
+        jurisdictions = [
+            {'name': name, 'slug': slug, 'permit_count': permit_count}
+            for name, slug, permit_count in zip(
+                agency_counts.index, slugify_column(agency_counts.index.to_series()), agency_counts
+            )
+        ]
 
         # Sort agencies alphabetically
         jurisdictions = sorted(jurisdictions, key=lambda x: x['name'])
 
         # Get recent/featured permits (all permits for now)
-        recent_permits = []
-        for _, row in df.iterrows():
-            state_abbrev = row['agency_short'].split()[0] if row['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
-            permit_slug = self.slugify(row['request_type'])
-
-            recent_permits.append({
-                'agency_short': row['agency_short'],
-                'request_type': row['request_type'],
-                'cost': row['cost'],
-                'effort_hours': row['effort_hours'],
-                'online_available': row['online_available'],
-                'url_slug': f"/{jurisdiction_slug}/{permit_slug}/",
-                'jurisdiction_slug': jurisdiction_slug,
-                'permit_slug': permit_slug,
-                'location_applicability': row['location_applicability']
-            })
+        recent_permits = normalize_permits(df)[[
+            'agency_short', 'request_type', 'cost', 'effort_hours', 'online_available',
+            'url_path', 'jurisdiction_slug', 'permit_slug', 'location_applicability',
+        ]].rename(columns={'url_path': 'url_slug'}).to_dict('records')
 
         # Prepare template data
         template_data = {
@@ -414,135 +844,150 @@ class SiteGenerator:
         }
 
         # Generate homepage
-        output_path = os.path.join(self.output_dir, 'index.html')
-        self.generate_page('index.html', template_data, output_path)
+        if self.owns('/'):
+            output_path = os.path.join(self.output_dir, 'index.html')
+            self.generate_page('index.html', template_data, output_path)
 
-    def generate_sitemap(self, df):
+    def generate_sitemap(self, df, locations=None, facets=None, stats=None):
         """
         Generate sitemap.xml with all page URLs and lastmod dates
 
         Args:
             df: DataFrame with permit data
+            locations: LocationIndex of the permits (built from df if None)
+            facets: FacetIndex of the permits (built from df if None)
+            stats: PermitStats of the permits (aggregated from df if None)
         """
         print("\n🗺️  Generating sitemap.xml...")
 
         # Base URL for the site
         base_url = "https://ainews123.com"
 
-        # Build sitemap XML
-        sitemap_content = ['<?xml version="1.0" encoding="UTF-8"?>']
-        sitemap_content.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+        # Sitemap entries as (path, lines), in page order
+        entries = []
 
         # Add homepage
-        sitemap_content.append('  <url>')
-        sitemap_content.append(f'    <loc>{base_url}/</loc>')
-        sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-        sitemap_content.append('    <changefreq>daily</changefreq>')
-        sitemap_content.append('    <priority>1.0</priority>')
-        sitemap_content.append('  </url>')
-
-        # Add jurisdiction hub pages
-        jurisdictions = df.groupby('agency_short').first().reset_index()
-        jurisdiction_slugs_added = set()
-
-        for _, row in jurisdictions.iterrows():
-            state_abbrev = row['agency_short'].split()[0] if row['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
-
-            if jurisdiction_slug not in jurisdiction_slugs_added:
-                jurisdiction_slugs_added.add(jurisdiction_slug)
-                url = f"{base_url}/{jurisdiction_slug}/"
-
-                sitemap_content.append('  <url>')
-                sitemap_content.append(f'    <loc>{url}</loc>')
-                sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-                sitemap_content.append('    <changefreq>weekly</changefreq>')
-                sitemap_content.append('    <priority>0.9</priority>')
-                sitemap_content.append('  </url>')
-
-        # Add transaction pages with hierarchical URLs
-        for idx, row in df.iterrows():
-            state_abbrev = row['agency_short'].split()[0] if row['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
-            permit_slug = self.slugify(row['request_type'])
-
-            # Use hierarchical URL: /jurisdiction/permit-slug/
-            url = f"{base_url}/{jurisdiction_slug}/{permit_slug}/"
-
-            sitemap_content.append('  <url>')
-            sitemap_content.append(f'    <loc>{url}</loc>')
-            sitemap_content.append(f'    <lastmod>{row["date_extracted"]}</lastmod>')
-            sitemap_content.append('    <changefreq>weekly</changefreq>')
-            sitemap_content.append('    <priority>0.8</priority>')
-            sitemap_content.append('  </url>')
+        entries.append(('/', [
+            '  <url>',
+            f'    <loc>{base_url}/</loc>',
+            f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>',
+            '    <changefreq>daily</changefreq>',
+            '    <priority>1.0</priority>',
+            '  </url>',
+        ]))
+
+        # Add the states page, the state and city hub pages and the facet pages
+        df = normalize_permits(df)
+        locations = locations or LocationIndex.from_permits(df)
+        facets = facets or FacetIndex.from_permits(df)
+        hub_paths = locations.paths() + [page['path'] for page in self.facet_pages(locations, facets)]
+
+        # Add the permits index and the permit type hubs (noindex hubs are left out)
+        stats = stats or permit_stats(df)
+        hub_paths.append('/permits/')
+        hub_paths += [
+            f"/permits/{permit_type['slug']}/" for permit_type in stats.type_records()
+            if not permit_type['should_noindex']
+        ]
 
+        # Add jurisdiction hub pages of permits without a resolved location
+        unresolved = df.iloc[locations.unresolved]
+        hubs = (
+            unresolved.dropna(subset=['agency_short'])
+            .drop_duplicates('agency_short')
+            .sort_values('agency_short')['jurisdiction_slug']
+            .drop_duplicates()
+        )
+        hub_paths += [f"/{slug}/" for slug in hubs if slug not in locations.states]
+
+        for path in hub_paths:
+            entries.append((path, [
+                '  <url>',
+                f'    <loc>{base_url}{path}</loc>',
+                f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>',
+                '    <changefreq>weekly</changefreq>',
+                '    <priority>0.9</priority>',
+                '  </url>',
+            ]))
+
+        # Add transaction pages with hierarchical URLs (/state/city/permit-slug/)
+        for path, date_extracted in zip(df['url_path'], df['date_extracted']):
+            entries.append((path, [
+                '  <url>',
+                f'    <loc>{base_url}{path}</loc>',
+                f'    <lastmod>{date_extracted}</lastmod>',
+                '    <changefreq>weekly</changefreq>',
+                '    <priority>0.8</priority>',
+                '  </url>',
+            ]))
+
+        # Build sitemap XML (sharded builds keep only their own entries)
+        sitemap_content = ['<?xml version="1.0" encoding="UTF-8"?>']
+        sitemap_content.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+        for _, lines in keep_all(self.shard, 'sitemap', entries, lambda entry: entry[0]):
+            sitemap_content.extend(lines)
         sitemap_content.append('</urlset>')
 
         # Write sitemap
         sitemap_path = os.path.join(self.output_dir, 'sitemap.xml')
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(sitemap_content))
+        written = self.writer.write(sitemap_path, '\n'.join(sitemap_content))
+        self.telemetry.record_file(sitemap_path, written=written)
 
         print(f"✓ Sitemap generated: {sitemap_path}")
 
-    def generate_data_json(self, df):
+    def generate_data_json(self, df, stats=None):
         """
         Generate data.json for future search/filter features
 
         Args:
             df: DataFrame with permit data
+            stats: PermitStats of the permits (aggregated from df if None)
         """
         print("\n📊 Generating data.json...")
 
-        # Convert DataFrame to list of dicts with URL slugs
-        permits_data = []
-        for _, row in df.iterrows():
-            permit = row.to_dict()
-
-            # Generate hierarchical URL
-            state_abbrev = row['agency_short'].split()[0] if row['agency_short'] else ""
-            state_map = {
-                'CA': 'california',
-                'NY': 'new-york',
-                'TX': 'texas',
-                'FL': 'florida',
-            }
-            jurisdiction_slug = state_map.get(state_abbrev, self.slugify(state_abbrev))
-            permit_slug = self.slugify(row['request_type'])
-
+        # Convert DataFrame to list of dicts with URL slugs (source_url is
+        # internal only)
+        df = normalize_permits(df)
+        source_columns = [c for c in df.columns if c not in DERIVED_COLUMNS and c != 'source_url']
+        permits_data = df[source_columns].to_dict('records')
+        for permit, url_path, jurisdiction_slug, permit_slug, permit_type in zip(
+            permits_data, df['url_path'], df['jurisdiction_slug'], df['permit_slug'], df['permit_type']
+        ):
             # Add generated URL slug (hierarchical format)
-            permit['url_slug'] = f"/{jurisdiction_slug}/{permit_slug}/"
+            permit['url_slug'] = url_path
             permit['jurisdiction_slug'] = jurisdiction_slug
             permit['permit_slug'] = permit_slug
-
-            # Remove source_url (internal only)
-            if 'source_url' in permit:
-                del permit['source_url']
-            permits_data.append(permit)
+            permit['permit_type'] = permit_type
+
+        # Sharded builds keep only the records of their own pages
+        permits_data = keep_all(self.shard, 'search', permits_data, lambda permit: permit['url_slug'])
+
+        # Per-type summary for filters (from all permits, also when sharded)
+        by_type = (stats or permit_stats(df)).type_records()
+        permit_types = [
+            {
+                'slug': permit_type['slug'],
+                'name': permit_type['name'],
+                'permits': permit_type['permits'],
+                'jurisdiction_count': permit_type['jurisdiction_count'],
+                'online_percent': permit_type['online_percent'],
+                'avg_cost': permit_type['avg_cost'],
+            }
+            for permit_type in by_type
+        ]
 
         # Create data structure
         data = {
             'generated_at': datetime.now().isoformat(),
             'total_permits': len(permits_data),
+            'permit_types': permit_types,
             'permits': permits_data
         }
 
         # Write JSON file
         json_path = os.path.join(self.output_dir, 'data.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        written = self.writer.write(json_path, json.dumps(data, indent=2, ensure_ascii=False))
+        self.telemetry.record_file(json_path, written=written)
 
         print(f"✓ Data JSON generated: {json_path}")
 
@@ -563,8 +1008,8 @@ class SiteGenerator:
 
         # Write robots.txt
         robots_path = os.path.join(self.output_dir, 'robots.txt')
-        with open(robots_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(robots_content))
+        written = self.writer.write(robots_path, '\n'.join(robots_content))
+        self.telemetry.record_file(robots_path, written=written)
 
         print(f"✓ Robots.txt generated: {robots_path}")
 
@@ -589,11 +1034,13 @@ class SiteGenerator:
             for filename in os.listdir(source_dir):
                 source_file = os.path.join(source_dir, filename)
                 if os.path.isfile(source_file):
-                    shutil.copy2(source_file, os.path.join(dest_dir, filename))
+                    dest_file = os.path.join(dest_dir, filename)
+                    shutil.copy2(source_file, dest_file)
+                    self.telemetry.record_file(dest_file)
             print(f"✓ Favicon files copied: {dest_dir}")
         except Exception as e:
             print(f"✗ Error copying favicon files: {e}")
-            self.stats['errors'] += 1
+            self.count('errors')
 
     def print_statistics(self):
         """Print generation statistics"""
@@ -605,42 +1052,99 @@ class SiteGenerator:
         print("=" * 60)
         print(f"Pages generated: {self.stats['pages_generated']}")
         print(f"Errors: {self.stats['errors']}")
+        print(f"Output files: {self.writer.summary()}")
         print(f"Duration: {duration:.2f} seconds")
         print(f"Output directory: {self.output_dir}")
+        if self.minify_report is not None:
+            self.minify_report.print_summary()
+        print_report(self.telemetry.report())
         print("=" * 60 + "\n")
 
-    def generate(self):
-        """Run the complete site generation process"""
+    def build_graph(self):
+        """
+        Describe the build as a graph of tasks (see build_dag.py)
+
+        Everything except robots.txt and the favicon copy reads the loaded
+        permits with their derived fields (slugs, URLs, steps, parsed JSON;
+        see permit_fields.py); the hubs, transaction pages (breadcrumbs)
+        and sitemap also read the state -> city index (see locations.py)
+        and the hubs and facet pages the facet bitsets (see facets.py).
+        The homepage, permit-type pages, sitemap and data.json share one
+        aggregation per type, state and city (see permit_stats.py).
+        No page task depends on another, so they run side by side once the
+        data is normalized.
+
+        Returns:
+            BuildGraph
+        """
+        graph = BuildGraph('permits')
+        graph.add('load', self.load_data)
+        graph.add('normalize', self.normalize, inputs=['load'])
+        graph.add('locations', self.build_locations, inputs=['normalize'])
+        graph.add('facets', self.build_facets, inputs=['normalize'])
+        graph.add('stats', self.build_stats, inputs=['normalize'])
+        hub_inputs = ['normalize', 'locations', 'facets']
+        graph.add('render:index.html', self.generate_homepage, inputs=['normalize', 'stats'],
+                  outputs=['index.html'])
+        graph.add('render:permits_index.html', self.generate_permits_index, inputs=['normalize', 'stats'],
+                  outputs=['permits/index.html'])
+        graph.add('render:permit_type_hub.html', self.generate_permit_type_hubs, inputs=['normalize', 'stats'],
+                  outputs=['permits/<type>/index.html'])
+        graph.add('render:states_page.html', self.generate_states_page, inputs=hub_inputs,
+                  outputs=['states/index.html'])
+        graph.add('render:state_hub.html', self.generate_state_hubs, inputs=hub_inputs,
+                  outputs=['<state>/index.html'])
+        graph.add('render:city_hub.html', self.generate_city_hubs, inputs=hub_inputs,
+                  outputs=['<state>/<city>/index.html'])
+        graph.add('render:facet_page.html', self.generate_facet_pages, inputs=hub_inputs,
+                  outputs=['<state>/<facet>/index.html'])
+        graph.add('render:jurisdiction_hub.html', self.generate_jurisdiction_hubs, inputs=hub_inputs,
+                  outputs=['<jurisdiction>/index.html'])
+        # Includes the social cards of the transaction pages
+        graph.add('render:transaction_page.html', self.generate_transaction_pages,
+                  inputs=['normalize', 'locations'], outputs=['<state>/<city>/<permit>/index.html', 'og/'])
+        graph.add('sitemap', self.generate_sitemap, inputs=hub_inputs + ['stats'], outputs=['sitemap.xml'])
+        graph.add('data_json', self.generate_data_json, inputs=['normalize', 'stats'], outputs=['data.json'])
+        graph.add('robots', self.generate_robots_txt, outputs=['robots.txt'])
+        graph.add('static', self.copy_favicon_files, outputs=['favicon/'])
+        return graph
+
+    def generate(self, targets=None):
+        """
+        Run the complete site generation process
+
+        Args:
+            targets: Build only these tasks and their dependencies
+                (e.g. ['sitemap']); None builds everything
+        """
         print("\n" + "=" * 60)
         print("🏛️  PERMITINDEX STATIC SITE GENERATOR")
         print("=" * 60)
 
-        # Load data once
-        df = self.load_data('permits.csv')
-
-        # Generate homepage
-        self.generate_homepage(df)
+        if self.profiler is not None:
+            self.profiler.start()
 
-        # Generate jurisdiction hub pages
-        self.generate_jurisdiction_hubs(df)
+        graph = self.build_graph()
+        graph.run(targets, jobs=self.jobs, telemetry=self.telemetry)
 
-        # Generate transaction pages
-        self.generate_transaction_pages(df)
+        if self.profiler is not None:
+            self.profiler.stop()
 
-        # Generate sitemap
-        self.generate_sitemap(df)
-
-        # Generate data.json
-        self.generate_data_json(df)
-
-        # Generate robots.txt
-        self.generate_robots_txt()
-
-        # Copy favicon files
-        self.copy_favicon_files()
+        if self.shard is not None:
+            self.shard.write_manifest(self.output_dir, 'permits')
 
         # Print statistics
         self.print_statistics()
+        graph.print_timings()
+
+        if self.profiler is not None:
+            self.profiler.print_report()
+            print("\n🔥 Profile written to:")
+            for path in self.profiler.export(os.path.join(self.base_dir, PROFILE_DIR)):
+                print(f"  - {path}")
+
+        report_path = self.telemetry.write(os.path.join(self.base_dir, default_report_path('permits')))
+        print(f"📈 Telemetry written to {report_path}\n")
 
         if self.stats['errors'] == 0:
             print("✅ Site generation completed successfully!\n")
@@ -652,8 +1156,47 @@ class SiteGenerator:
 
 def main():
     """Main entry point"""
-    generator = SiteGenerator()
-    return generator.generate()
+    parser = argparse.ArgumentParser(description='PermitIndex Static Site Generator')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='Write rendered HTML without minification')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record per-phase memory peaks with tracemalloc (slower)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time every template/page and export cProfile + speedscope files')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='Render only the pages of shard I out of N (merge with sharding.py)')
+    parser.add_argument('--target', action='append', metavar='TASK',
+                        help='Build only this task and its dependencies (repeatable, e.g. --target sitemap)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help='Build tasks run concurrently (default: %(default)s; --profile uses 1)')
+    parser.add_argument('--list-targets', action='store_true',
+                        help='List build tasks with their inputs and outputs, then exit')
+    args = parser.parse_args()
+
+    try:
+        shard = Shard.parse(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+
+    generator = SiteGenerator(
+        minify=not args.no_minify,
+        trace_memory=args.trace_memory,
+        profile=args.profile,
+        shard=shard,
+        jobs=args.jobs
+    )
+
+    graph = generator.build_graph()
+    if args.list_targets:
+        print("Build tasks:")
+        graph.describe()
+        return 0
+    try:
+        graph.plan(args.target)
+    except ValueError as e:
+        parser.error(str(e))
+
+    return generator.generate(args.target)
 
 
 if __name__ == '__main__':
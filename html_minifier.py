@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML minifier for rendered pages
+
+Rendered Jinja2 templates carry deep indentation, comments and blank lines
+that ship to every reader. This module strips them while the page is being
+rendered: chunks from Template.generate() are fed through an HTMLMinifier
+and written out as they arrive, so minification never needs a second pass
+over the output tree.
+
+Rules:
+- Runs of whitespace collapse to a single space (or a single newline when
+  the run contained one)
+- HTML comments are removed, except IE conditional comments (<!--[if ...)
+- <pre>, <textarea> and <script> blocks (including JSON-LD) pass through
+  byte for byte
+
+Usage:
+    from html_minifier import MinifyReport
+
+    report = MinifyReport()
+    for chunk in report.stream('index.html', template.generate(**data)):
+        f.write(chunk)
+    report.print_summary()
+"""
+
+import re
+import threading
+
+
+# Elements whose contents must be preserved exactly
+PRESERVED_TAGS = ('script', 'pre', 'textarea')
+
+# A comment, or the opening tag of a preserved element (group 1)
+_SPECIAL = re.compile(r'<!--|<(script|pre|textarea)(?=[\s>/])', re.IGNORECASE)
+_PRESERVED_CLOSE = {
+    tag: re.compile(r'</%s' % tag, re.IGNORECASE) for tag in PRESERVED_TAGS
+}
+
+# Longest lookahead needed to classify a '<' ("<textarea" + delimiter)
+_LOOKAHEAD = len('<textarea') + 1
+
+# Fed chunks are collected and scanned together once they reach this size
+# (Template.generate() yields many small chunks)
+FLUSH_SIZE = 8192
+
+
+def collapse_whitespace(text):
+    """
+    Collapse every whitespace run in text to a single character
+
+    A run becomes '\n' when it contains a newline and ' ' otherwise. Works
+    line by line with str.split(), which is several times faster than a
+    regular expression over the indentation of rendered templates.
+    """
+    lines = [' '.join(line.split()) for line in text.split('\n')]
+    body = '\n'.join(filter(None, lines))
+    if not body:
+        return '\n' if len(lines) > 1 else (' ' if text else '')
+    # Runs at either end: they contain a newline when the first/last line
+    # is all whitespace
+    if text[0].isspace():
+        body = (' ' if lines[0] else '\n') + body
+    if text[-1].isspace():
+        body += ' ' if lines[-1] else '\n'
+    return body
+
+
+class HTMLMinifier:
+    """
+    Incremental HTML minifier
+
+    feed() accepts arbitrary slices of a document and returns the minified
+    text that is safe to emit so far; close() flushes whatever was held back.
+    The output does not depend on where the chunk boundaries fall.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pending = []
+        self._pending_size = 0
+        self._preserved_tag = None
+
+    def feed(self, chunk):
+        """
+        Add a chunk of HTML
+
+        Args:
+            chunk: Next slice of the document
+
+        Returns:
+            Minified text ready to be written (empty until FLUSH_SIZE
+            characters have been collected)
+        """
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        if self._pending_size < FLUSH_SIZE:
+            return ''
+        return self._process(final=False)
+
+    def close(self):
+        """
+        Flush the remaining buffered HTML
+
+        Returns:
+            Minified tail of the document
+        """
+        return self._process(final=True)
+
+    def _process(self, final):
+        buf = self._buffer + ''.join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        out = []
+        pos = 0
+        end = len(buf)
+
+        while pos < end:
+            if self._preserved_tag:
+                close = _PRESERVED_CLOSE[self._preserved_tag].search(buf, pos)
+                close_end = buf.find('>', close.end()) if close else -1
+                if close_end == -1:
+                    if final:
+                        out.append(buf[pos:])
+                        pos = end
+                    else:
+                        # Hold back enough to recognise a split closing tag
+                        safe = close.start() if close else max(pos, end - len(self._preserved_tag) - 2)
+                        out.append(buf[pos:safe])
+                        pos = safe
+                    break
+                out.append(buf[pos:close_end + 1])
+                pos = close_end + 1
+                self._preserved_tag = None
+                continue
+
+            # Text up to the next comment or preserved tag is collapsed in one go
+            match = _SPECIAL.search(buf, pos)
+            if match is None:
+                text_end = end
+                if not final:
+                    # A '<' near the end may still open a comment or a
+                    # preserved tag; hold it back until more text arrives
+                    lt = buf.find('<', max(pos, end - _LOOKAHEAD))
+                    if lt != -1:
+                        text_end = lt
+                    else:
+                        # A trailing whitespace run may continue in the next chunk
+                        text_end = pos + len(buf[pos:].rstrip())
+                out.append(collapse_whitespace(buf[pos:text_end]))
+                pos = text_end
+                break
+
+            lt = match.start()
+            out.append(collapse_whitespace(buf[pos:lt]))
+            pos = lt
+
+            if match.group(1) is None:
+                comment_end = buf.find('-->', lt + 4)
+                if comment_end == -1:
+                    if final:
+                        out.append(buf[lt:])
+                        pos = end
+                    break
+                if buf.startswith('<!--[if', lt):
+                    out.append(buf[lt:comment_end + 3])
+                pos = comment_end + 3
+                continue
+
+            tag_end = buf.find('>', match.end())
+            if tag_end == -1:
+                if final:
+                    out.append(buf[lt:])
+                    pos = end
+                break
+            out.append(buf[lt:tag_end + 1])
+            pos = tag_end + 1
+            self._preserved_tag = match.group(1).lower()
+
+        self._buffer = buf[pos:]
+        return ''.join(out)
+
+
+def minify_stream(chunks):
+    """
+    Minify an iterable of HTML chunks lazily
+
+    Args:
+        chunks: Iterable of strings, e.g. Template.generate(**data)
+
+    Yields:
+        Minified chunks (empty results are skipped)
+    """
+    minifier = HTMLMinifier()
+    for chunk in chunks:
+        minified = minifier.feed(chunk)
+        if minified:
+            yield minified
+    tail = minifier.close()
+    if tail:
+        yield tail
+
+
+def minify_html(html):
+    """Minify a complete HTML document."""
+    return ''.join(minify_stream([html]))
+
+
+class MinifyReport:
+    """
+    Running count of bytes saved by minification, per template
+
+    Pages may be streamed from several threads (build_dag tasks); the
+    counts are updated under a lock.
+    """
+
+    def __init__(self):
+        self.templates = {}
+        self._lock = threading.Lock()
+
+    def stream(self, template_name, chunks):
+        """
+        Minify chunks for one page and record the byte counts
+
+        Args:
+            template_name: Template the page was rendered from
+            chunks: Iterable of rendered HTML chunks
+
+        Yields:
+            Minified chunks
+        """
+        minifier = HTMLMinifier()
+        bytes_in = 0
+        bytes_out = 0
+
+        for chunk in chunks:
+            bytes_in += len(chunk.encode('utf-8'))
+            minified = minifier.feed(chunk)
+            if minified:
+                bytes_out += len(minified.encode('utf-8'))
+                yield minified
+
+        tail = minifier.close()
+        if tail:
+            bytes_out += len(tail.encode('utf-8'))
+            yield tail
+
+        with self._lock:
+            entry = self.templates.setdefault(
+                template_name, {'pages': 0, 'bytes_in': 0, 'bytes_out': 0}
+            )
+            entry['pages'] += 1
+            entry['bytes_in'] += bytes_in
+            entry['bytes_out'] += bytes_out
+
+    def merge(self, other):
+        """Fold the counts from another report (e.g. a worker's) into this one."""
+        with self._lock:
+            for name, counts in other.templates.items():
+                entry = self.templates.setdefault(
+                    name, {'pages': 0, 'bytes_in': 0, 'bytes_out': 0}
+                )
+                for key in entry:
+                    entry[key] += counts[key]
+
+    @property
+    def bytes_in(self):
+        return sum(t['bytes_in'] for t in self.templates.values())
+
+    @property
+    def bytes_out(self):
+        return sum(t['bytes_out'] for t in self.templates.values())
+
+    @property
+    def bytes_saved(self):
+        return self.bytes_in - self.bytes_out
+
+    def to_dict(self):
+        """Return the report as a JSON-serialisable dictionary."""
+        return {
+            name: dict(counts, bytes_saved=counts['bytes_in'] - counts['bytes_out'])
+            for name, counts in sorted(self.templates.items())
+        }
+
+    def print_summary(self):
+        """Print bytes saved per template and overall."""
+        if not self.templates:
+            return
+
+        print("\nHTML minification:")
+        for name, counts in sorted(self.templates.items()):
+            saved = counts['bytes_in'] - counts['bytes_out']
+            percent = (saved / counts['bytes_in'] * 100) if counts['bytes_in'] else 0
+            print(f"  - {name}: {counts['pages']} pages, saved {saved:,} bytes ({percent:.1f}%)")
+
+        total_percent = (self.bytes_saved / self.bytes_in * 100) if self.bytes_in else 0
+        print(f"  - Total saved: {self.bytes_saved:,} bytes ({total_percent:.1f}%)")
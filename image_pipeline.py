@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Responsive image pipeline
+
+Generates WebP variants at several widths for local images and returns the
+srcset/sizes/width/height data that article_page.html needs for a <picture>
+element. The build runs it on article `image_url` values served from
+static/; the OG image and the favicons stay PNG files (social crawlers and
+browsers ask for those exact URLs), but can be converted from the command
+line.
+
+- Variants are cached in .build_cache/images/ keyed by a hash of the source
+  bytes, the width list and the encoder quality, so unchanged images are
+  never re-encoded
+- Images are processed in parallel on a process pool
+- Remote images (http/https) are left alone
+
+Requires: pip install Pillow (the stage is skipped when it is missing)
+
+Usage:
+    python image_pipeline.py static/og-image.png static/favicon/icon-1024.png
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+# Widths generated for every image (never upscaled)
+RESPONSIVE_WIDTHS = (480, 768, 1200)
+
+# Article images sit in a max-w-4xl (56rem) column
+DEFAULT_SIZES = '(min-width: 1024px) 896px, 100vw'
+
+WEBP_QUALITY = 80
+
+CACHE_DIR = os.path.join('.build_cache', 'images')
+STATIC_DIR = 'static'
+OUTPUT_SUBDIR = 'images'
+
+
+def is_local_image(image_url):
+    """Return True for image URLs served from this site."""
+    return bool(image_url) and not image_url.startswith(('http://', 'https://', '//', 'data:'))
+
+
+def resolve_local_path(image_url, static_dir=STATIC_DIR):
+    """
+    Map a site image URL to the source file that backs it
+
+    Args:
+        image_url: URL such as '/og-image.png' or 'static/og-image.png'
+        static_dir: Directory copied to the site root
+
+    Returns:
+        Path to the source file, or None if it does not exist
+    """
+    candidates = [image_url]
+    if image_url.startswith('/'):
+        candidates.insert(0, os.path.join(static_dir, image_url.lstrip('/')))
+
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def site_url(source_path, static_dir=STATIC_DIR):
+    """
+    URL a source file is served at, e.g. 'static/img/a.png' -> '/img/a.png'
+
+    Returns:
+        The root-relative URL, or None for files outside static_dir (they
+        are not copied to the site)
+    """
+    relative = os.path.relpath(os.path.abspath(source_path), os.path.abspath(static_dir))
+    if relative.startswith(os.pardir):
+        return None
+    return '/' + relative.replace(os.sep, '/')
+
+
+def cache_key(source_path, widths=RESPONSIVE_WIDTHS, quality=WEBP_QUALITY):
+    """Hash the source bytes together with the variant settings."""
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    digest.update(json.dumps([list(widths), quality]).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def variant_widths(source_width, widths=RESPONSIVE_WIDTHS):
+    """Widths to generate for an image, capped at its intrinsic width."""
+    selected = [w for w in widths if w < source_width]
+    selected.append(min(source_width, max(widths)))
+    return sorted(set(selected))
+
+
+def build_variants(source_path, cache_dir=CACHE_DIR, widths=RESPONSIVE_WIDTHS, quality=WEBP_QUALITY):
+    """
+    Encode the WebP variants for one image, reusing the cache when possible
+
+    Args:
+        source_path: Image file to process
+        cache_dir: Root of the variant cache
+        widths: Target widths
+        quality: WebP quality (0-100)
+
+    Returns:
+        Dictionary with the cache key, intrinsic size, variant files and
+        whether the result came from the cache
+    """
+    key = cache_key(source_path, widths, quality)
+    entry_dir = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry_dir, 'meta.json')
+
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if all(os.path.exists(os.path.join(entry_dir, v['file'])) for v in meta['variants']):
+            meta['cached'] = True
+            return meta
+
+    os.makedirs(entry_dir, exist_ok=True)
+
+    with Image.open(source_path) as img:
+        img.load()
+        source_width, source_height = img.size
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+
+        variants = []
+        for width in variant_widths(source_width, widths):
+            height = max(1, round(source_height * width / source_width))
+            resized = img if width == source_width else img.resize((width, height), Image.LANCZOS)
+            filename = f'{width}.webp'
+            resized.save(os.path.join(entry_dir, filename), 'WEBP', quality=quality, method=6)
+            variants.append({'width': width, 'height': height, 'file': filename})
+
+    meta = {
+        'key': key,
+        'source': source_path,
+        'width': source_width,
+        'height': source_height,
+        'variants': variants,
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    meta['cached'] = False
+    return meta
+
+
+def publish_variants(meta, image_url, output_dir, cache_dir=CACHE_DIR, sizes=DEFAULT_SIZES, src=None):
+    """
+    Copy cached variants into the output tree and describe them for templates
+
+    Args:
+        meta: Result of build_variants()
+        image_url: Original image URL (used to name the published files)
+        output_dir: Site output directory
+        cache_dir: Root of the variant cache
+        sizes: Value for the sizes attribute
+        src: URL the original is served at (image_url if None)
+
+    Returns:
+        Dictionary with src, width, height, srcset and sizes
+    """
+    stem = os.path.splitext(os.path.basename(image_url))[0]
+    dest_dir = os.path.join(output_dir, OUTPUT_SUBDIR)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    srcset = []
+    for variant in meta['variants']:
+        filename = f"{stem}-{meta['key'][:8]}-{variant['width']}w.webp"
+        dest_path = os.path.join(dest_dir, filename)
+        # Published names embed the cache key, so an existing file is current
+        if not os.path.exists(dest_path):
+            shutil.copy2(os.path.join(cache_dir, meta['key'], variant['file']), dest_path)
+        srcset.append(f"/{OUTPUT_SUBDIR}/{filename} {variant['width']}w")
+
+    return {
+        'src': src or image_url,
+        'width': meta['width'],
+        'height': meta['height'],
+        'srcset': ', '.join(srcset),
+        'sizes': sizes,
+    }
+
+
+def build_responsive_images(image_urls, output_dir='output', cache_dir=CACHE_DIR, static_dir=STATIC_DIR, workers=None):
+    """
+    Run the image stage for a set of image URLs
+
+    Args:
+        image_urls: Iterable of image URLs (remote and missing ones are skipped)
+        output_dir: Site output directory
+        cache_dir: Root of the variant cache
+        static_dir: Directory that backs root-relative URLs
+        workers: Process pool size (defaults to the CPU count)
+
+    Returns:
+        Tuple of (dict mapping image URL -> template data, stats dict)
+    """
+    stats = {'images': 0, 'encoded': 0, 'cached': 0, 'skipped': 0}
+    if not PILLOW_AVAILABLE:
+        return {}, stats
+
+    sources = {}
+    for url in sorted(set(u for u in image_urls if u)):
+        path = resolve_local_path(url, static_dir) if is_local_image(url) else None
+        # Only images the site serves (from static_dir) get variants
+        if path and site_url(path, static_dir):
+            sources[url] = path
+        else:
+            stats['skipped'] += 1
+
+    if not sources:
+        return {}, stats
+
+    urls = list(sources)
+    paths = [sources[u] for u in urls]
+    if len(paths) == 1 or workers == 1:
+        metas = [build_variants(p, cache_dir) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            metas = list(pool.map(build_variants, paths, [cache_dir] * len(paths)))
+
+    images = {}
+    for url, meta in zip(urls, metas):
+        images[url] = publish_variants(meta, url, output_dir, cache_dir, src=site_url(sources[url], static_dir))
+        stats['images'] += 1
+        stats['cached' if meta['cached'] else 'encoded'] += 1
+
+    return images, stats
+
+
+def main():
+    """Build responsive variants for the image paths given on the command line"""
+    if not PILLOW_AVAILABLE:
+        print("Error: Missing required library: Pillow")
+        print("Please install: pip install Pillow")
+        return 1
+
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__)
+        return 1
+
+    images, stats = build_responsive_images(paths)
+    for url, image in images.items():
+        print(f"✓ {url} ({image['width']}x{image['height']})")
+        print(f"    srcset: {image['srcset']}")
+    print(f"\n{stats['encoded']} encoded, {stats['cached']} from cache, {stats['skipped']} skipped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Permit locations: gazetteer resolver and state -> city -> permit index
+
+Every permit says where it applies in free text, e.g. "Applies to all
+businesses operating within the city limits of Chandler, Arizona." or
+"City and County of Denver, Colorado". LocationResolver turns such a
+string into a Location (state code, name and slug; city name and slug,
+empty for statewide permits):
+
+- the state is found in a token trie of the US state and territory names
+  (the last one mentioned wins, so "Virginia Beach, Virginia" and
+  "Kansas City, Missouri" resolve to the state after the comma); texts
+  without a state name fall back to a two-letter code, accepted only
+  after a comma or at the end of the text ("Salem, OR", "Salem OR"), so
+  capitalized words such as "OR" in "DEPT OF PARKS OR RECREATION" are not
+  taken for states
+- the city is found in a per-state token trie of the place gazetteer
+  (data/gazetteer/us_places.tsv, USPS and NAME columns in the Census
+  Gazetteer layout, so the full Census places file can replace it; type
+  suffixes such as "city", "town" or "CDP" are dropped), preferring the
+  place right before the state; places missing from the gazetteer are
+  taken from the capitalized words before ", <State>"
+
+Each distinct string is resolved once per resolver (results are memoized),
+so a permits file where thousands of rows share a handful of location
+strings costs a handful of trie walks.
+
+LocationIndex groups permit IDs (row positions) into the state -> city
+tree that the states page, state and city hubs, breadcrumbs and sitemap
+read from. Permits whose location does not resolve are kept apart in
+`unresolved`.
+
+This module does not import pandas; it only calls DataFrame methods.
+"""
+
+import os
+import re
+import csv
+from collections import namedtuple
+from functools import lru_cache
+
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer', 'us_places.tsv')
+
+# USPS code -> name (states, DC and the inhabited territories)
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+    'AS': 'American Samoa', 'GU': 'Guam', 'MP': 'Northern Mariana Islands', 'PR': 'Puerto Rico',
+    'VI': 'U.S. Virgin Islands',
+}
+
+# Other names of a state
+STATE_ALIASES = {
+    'Washington DC': 'DC',
+    'Washington D.C.': 'DC',
+    'Virgin Islands': 'VI',
+}
+
+# Census place type suffixes ("Phoenix city", "Paradise CDP", "Nashville-Davidson metropolitan government (balance)")
+PLACE_SUFFIX = re.compile(
+    r'\s+(?:city|town|village|borough|CDP|municipality|zona urbana|comunidad|urban county'
+    r'|(?:consolidated|metropolitan|metro|unified) government)(?:\s+\(balance\))?$'
+)
+
+# Words, keeping inner hyphens and apostrophes ("winston-salem", "coeur d'alene")
+TOKEN = re.compile(r"[^\W_]+(?:['’-][^\W_]+)*")
+
+# A postal code standing alone after a comma ("Portland, OR 97201") or at the
+# end ("Salem OR"); other capitals are words ("DEPT OF PARKS OR RECREATION")
+STATE_CODE = re.compile(r',\s*([A-Z]{2})(?!\w)|(?<!\S)([A-Z]{2})\s*$')
+
+# Capitalized words right before ", <State>" ("... city limits of Smallville, ")
+PLACE_BEFORE_STATE = re.compile(
+    r"((?:[A-Z][\w.'’-]*)(?:\s+(?:[A-Z][\w.'’-]*|of|and|de|del|la))*?)(?:\s+city limits)?\s*,\s*$"
+)
+PLACE_PREFIX = re.compile(
+    r'^(?:the\s+)?(?:(?:city and county|city|town|village|borough|municipality|county) of\s+)', re.IGNORECASE
+)
+
+LOCATION_COLUMNS = ('state_code', 'state_name', 'state_slug', 'city_name', 'city_slug')
+
+Location = namedtuple('Location', LOCATION_COLUMNS)
+
+
+def slugify(text):
+    """URL-safe slug of one string (same rules as permit_fields.slugify_column)."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[\s_]+', '-', text)
+    return re.sub(r'^-+|-+$', '', text)
+
+
+def tokenize(text):
+    """Lowercased word tokens with their (start, end) character spans."""
+    return [(match.group().lower(), match.start(), match.end()) for match in TOKEN.finditer(text)]
+
+
+class TokenTrie:
+    """Multi-word names matched token by token, longest match first"""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name, value):
+        node = self.root
+        for token, _, _ in tokenize(name):
+            node = node.setdefault(token, {})
+        node[None] = value
+
+    def matches(self, tokens):
+        """
+        Scan left to right for the longest name starting at each token;
+        a match consumes its tokens
+
+        Returns:
+            List of (value, first token index, end token index)
+        """
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            longest = None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                if None in node:
+                    longest = (node[None], i, j + 1)
+            if longest is not None:
+                found.append(longest)
+                i = longest[2]
+            else:
+                i += 1
+        return found
+
+
+@lru_cache(maxsize=None)
+def state_trie():
+    trie = TokenTrie()
+    for code, name in US_STATES.items():
+        trie.add(name, code)
+    for name, code in STATE_ALIASES.items():
+        trie.add(name, code)
+    return trie
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_PATH):
+    """
+    Per-state place tries from a tab-separated gazetteer
+
+    Returns:
+        {state code: TokenTrie of place name -> name}
+    """
+    tries = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f, delimiter='\t'):
+            # Census files pad the last header cell
+            row = {key.strip(): value for key, value in row.items() if key}
+            code, name = row.get('USPS', '').strip(), PLACE_SUFFIX.sub('', row.get('NAME', '').strip())
+            if code in US_STATES and name:
+                tries.setdefault(code, TokenTrie()).add(name, name)
+    return tries
+
+
+def make_location(code, city_name=''):
+    state_name = US_STATES[code]
+    return Location(code, state_name, slugify(state_name), city_name, slugify(city_name) if city_name else '')
+
+
+class LocationResolver:
+    """Free-text location -> Location, memoized per distinct string"""
+
+    def __init__(self, gazetteer_path=GAZETTEER_PATH):
+        self.places = load_gazetteer(gazetteer_path)
+        self.states = state_trie()
+        self.memo = {}
+
+    def resolve(self, text):
+        """
+        Resolve one location string
+
+        Returns:
+            Location, or None when no state is mentioned
+        """
+        if not isinstance(text, str):
+            return None
+        if text not in self.memo:
+            self.memo[text] = self._resolve(text)
+        return self.memo[text]
+
+    def resolve_first(self, texts):
+        """The first of several strings (e.g. location, agency) that resolves."""
+        for text in texts:
+            location = self.resolve(text)
+            if location is not None:
+                return location
+        return None
+
+    def _resolve(self, text):
+        tokens = tokenize(text)
+        states = self.states.matches(tokens)
+        if states:
+            code, start, _ = states[-1]
+            state_start = tokens[start][1]
+        else:
+            codes = [code for pair in STATE_CODE.findall(text) for code in pair if code in US_STATES]
+            if not codes:
+                return None
+            code, start, state_start = codes[-1], len(tokens), len(text)
+
+        city = self._place(code, tokens, start) or self._place_before(text[:state_start])
+        return make_location(code, city)
+
+    def _place(self, code, tokens, state_token):
+        """Gazetteer place of this state, the last one before the state if any."""
+        trie = self.places.get(code)
+        if trie is None:
+            return ''
+        found = trie.matches(tokens)
+        before = [name for name, _, end in found if end <= state_token]
+        if before:
+            return before[-1]
+        return found[-1][0] if found else ''
+
+    def _place_before(self, text):
+        match = PLACE_BEFORE_STATE.search(text)
+        if not match:
+            return ''
+        name = match.group(1)
+        while PLACE_PREFIX.match(name):
+            name = PLACE_PREFIX.sub('', name, count=1)
+        return name.strip(' .')
+
+
+class LocationIndex:
+    """
+    state -> city -> permit IDs
+
+    states: {state slug: {'code', 'name', 'slug', 'statewide': [ids],
+             'cities': {city slug: {'name', 'slug', 'permits': [ids]}}}}
+    """
+
+    def __init__(self):
+        self.states = {}
+        self.unresolved = []
+
+    @classmethod
+    def from_permits(cls, df):
+        """Index a normalized permits DataFrame (see permit_fields.normalize_permits)."""
+        index = cls()
+        for permit_id, values in enumerate(zip(*(df[name] for name in LOCATION_COLUMNS))):
+            index.add(permit_id, Location(*values) if values[0] else None)
+        return index
+
+    def add(self, permit_id, location):
+        if location is None:
+            self.unresolved.append(permit_id)
+            return
+        state = self.states.get(location.state_slug)
+        if state is None:
+            state = self.states[location.state_slug] = {
+                'code': location.state_code,
+                'name': location.state_name,
+                'slug': location.state_slug,
+                'statewide': [],
+                'cities': {},
+            }
+        if not location.city_slug:
+            state['statewide'].append(permit_id)
+            return
+        city = state['cities'].get(location.city_slug)
+        if city is None:
+            city = state['cities'][location.city_slug] = {
+                'name': location.city_name,
+                'slug': location.city_slug,
+                'permits': [],
+            }
+        city['permits'].append(permit_id)
+
+    def sorted_states(self):
+        """States by name."""
+        return sorted(self.states.values(), key=lambda state: state['name'])
+
+    @staticmethod
+    def sorted_cities(state):
+        """A state's cities by name."""
+        return sorted(state['cities'].values(), key=lambda city: city['name'])
+
+    @staticmethod
+    def permit_ids(state):
+        """Every permit of a state: statewide ones first, then by city."""
+        ids = list(state['statewide'])
+        for city in LocationIndex.sorted_cities(state):
+            ids.extend(city['permits'])
+        return ids
+
+    def total_cities(self):
+        return sum(len(state['cities']) for state in self.states.values())
+
+    def paths(self):
+        """Hub page paths: /states/, then each state followed by its cities."""
+        paths = ['/states/'] if self.states else []
+        for state in self.sorted_states():
+            paths.append(f"/{state['slug']}/")
+            paths.extend(f"/{state['slug']}/{city['slug']}/" for city in self.sorted_cities(state))
+        return paths
+
+    def breadcrumbs(self, state_slug, city_slug=''):
+        """
+        Trail from the homepage to a state or city hub
+
+        Returns:
+            List of {'name', 'path'} (Home, state, city)
+        """
+        crumbs = [{'name': 'Home', 'path': '/'}]
+        state = self.states.get(state_slug)
+        if state is None:
+            return crumbs
+        crumbs.append({'name': state['name'], 'path': f'/{state_slug}/'})
+        city = state['cities'].get(city_slug)
+        if city is not None:
+            crumbs.append({'name': city['name'], 'path': f'/{state_slug}/{city_slug}/'})
+        return crumbs
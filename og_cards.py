@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Per-page social cards (Open Graph images)
+
+Draws a 1200x630 card for each article and transaction page with the page
+title, its category or jurisdiction, and the site's brand colours, so
+shared links no longer all show the same generic og-image.png.
+
+- Cards are cached in .build_cache/og_cards/ keyed by a hash of the text
+  inputs, so a rebuild only draws cards whose text changed
+- Missing cards are drawn on a process pool; each worker loads the fonts
+  and draws the base canvas for every theme once, then only adds text
+- Published cards live at /og/<hash>.png, so an unchanged card keeps its URL
+
+Requires: pip install Pillow (the stage is skipped when it is missing)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+CARD_WIDTH = 1200
+CARD_HEIGHT = 630
+
+# Bump when the card layout changes to invalidate cached cards
+CARD_VERSION = 1
+
+CACHE_DIR = os.path.join('.build_cache', 'og_cards')
+OUTPUT_SUBDIR = 'og'
+
+# Brand themes: News123 (generator.py) and PermitIndex (generator_v1_backup.py)
+THEMES = {
+    'news': {
+        'site_name': 'News123',
+        'background': '#1a1a2e',
+        'accent': '#e94560',
+        'text': '#ffffff',
+        'muted': '#b8b8c8',
+    },
+    'permits': {
+        'site_name': 'PermitIndex',
+        'background': '#003366',
+        'accent': '#FF6B35',
+        'text': '#FFFFFF',
+        'muted': '#C9D6E3',
+    },
+}
+
+# Bold fonts tried in order; Pillow's bundled font is the fallback
+FONT_CANDIDATES = [
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf',
+    '/Library/Fonts/Arial Black.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Black.ttf',
+    'C:\\Windows\\Fonts\\ariblk.ttf',
+]
+
+PADDING = 72
+TITLE_SIZE = 64
+LABEL_SIZE = 30
+SITE_SIZE = 34
+TITLE_MAX_LINES = 4
+
+# Per-process state, filled in by _init_worker()
+_worker = None
+
+
+def card_key(card):
+    """Hash the text inputs and theme that determine how a card looks."""
+    payload = json.dumps(
+        [CARD_VERSION, card.get('theme', 'news'), card.get('title', ''), card.get('label', '')],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def _load_font(size):
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1: only the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _draw_base_canvas(theme, site_font):
+    """Background, accent bar and site name - everything but the page text."""
+    canvas = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), theme['background'])
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle([0, CARD_HEIGHT - 16, CARD_WIDTH, CARD_HEIGHT], fill=theme['accent'])
+    draw.text((PADDING, CARD_HEIGHT - PADDING - SITE_SIZE), theme['site_name'],
+              font=site_font, fill=theme['text'])
+    return canvas
+
+
+def _init_worker():
+    """Load fonts and draw the base canvases once per process."""
+    global _worker
+    fonts = {
+        'title': _load_font(TITLE_SIZE),
+        'label': _load_font(LABEL_SIZE),
+        'site': _load_font(SITE_SIZE),
+    }
+    _worker = {
+        'fonts': fonts,
+        'canvases': {name: _draw_base_canvas(theme, fonts['site']) for name, theme in THEMES.items()},
+    }
+
+
+def wrap_text(text, font, max_width, max_lines):
+    """
+    Greedy word wrap measured with the real font
+
+    Args:
+        text: Text to wrap
+        font: PIL font used for measuring
+        max_width: Maximum line width in pixels
+        max_lines: Lines to keep; overflow is replaced by an ellipsis
+
+    Returns:
+        List of lines
+    """
+    lines = []
+    current = ''
+    for word in text.split():
+        candidate = f'{current} {word}'.strip()
+        if current and font.getlength(candidate) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        last = lines[-1]
+        while last and font.getlength(last + '…') > max_width:
+            last = last.rsplit(' ', 1)[0] if ' ' in last else last[:-1]
+        lines[-1] = last + '…'
+    return lines
+
+
+def draw_card(card, path):
+    """
+    Draw one card and save it as PNG
+
+    Args:
+        card: Dictionary with title, label and theme
+        path: Destination file
+    """
+    if _worker is None:
+        _init_worker()
+
+    theme = THEMES[card.get('theme', 'news')]
+    fonts = _worker['fonts']
+    canvas = _worker['canvases'][card.get('theme', 'news')].copy()
+    draw = ImageDraw.Draw(canvas)
+
+    label = (card.get('label') or '').upper()
+    if label:
+        label_width = fonts['label'].getlength(label)
+        draw.rectangle([PADDING, PADDING, PADDING + label_width + 32, PADDING + LABEL_SIZE + 24],
+                       fill=theme['accent'])
+        draw.text((PADDING + 16, PADDING + 12), label, font=fonts['label'], fill=theme['text'])
+
+    y = PADDING + LABEL_SIZE + 72
+    for line in wrap_text(card.get('title', ''), fonts['title'], CARD_WIDTH - 2 * PADDING, TITLE_MAX_LINES):
+        draw.text((PADDING, y), line, font=fonts['title'], fill=theme['text'])
+        y += int(TITLE_SIZE * 1.2)
+
+    tmp_path = f'{path}.tmp'
+    canvas.save(tmp_path, 'PNG', optimize=True)
+    os.replace(tmp_path, path)
+
+
+def _draw_cached(job):
+    card, path = job
+    draw_card(card, path)
+    return path
+
+
+def render_cards(cards, output_dir='output', cache_dir=CACHE_DIR, workers=None):
+    """
+    Make sure every card exists and is published to the output tree
+
+    Args:
+        cards: List of dicts with id, title, label and theme
+        output_dir: Site output directory
+        cache_dir: Card cache directory
+        workers: Process pool size (defaults to the CPU count)
+
+    Returns:
+        Tuple of (dict mapping card id -> site path such as '/og/<hash>.png',
+        stats dict with drawn/cached counts)
+    """
+    stats = {'cards': 0, 'drawn': 0, 'cached': 0}
+    if not PILLOW_AVAILABLE or not cards:
+        return {}, stats
+
+    os.makedirs(cache_dir, exist_ok=True)
+    dest_dir = os.path.join(output_dir, OUTPUT_SUBDIR)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    keys = {}
+    missing = {}
+    for card in cards:
+        key = card_key(card)
+        keys[card['id']] = key
+        cache_path = os.path.join(cache_dir, f'{key}.png')
+        if key not in missing and not os.path.exists(cache_path):
+            missing[key] = (card, cache_path)
+
+    jobs = list(missing.values())
+    if len(jobs) <= 1 or workers == 1:
+        for job in jobs:
+            _draw_cached(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+            list(pool.map(_draw_cached, jobs, chunksize=chunksize))
+
+    urls = {}
+    for card_id, key in keys.items():
+        filename = f'{key}.png'
+        dest_path = os.path.join(dest_dir, filename)
+        # The file name is the content hash, so an existing file is current
+        if not os.path.exists(dest_path):
+            shutil.copy2(os.path.join(cache_dir, filename), dest_path)
+        urls[card_id] = f'/{OUTPUT_SUBDIR}/{filename}'
+
+    stats['cards'] = len(keys)
+    stats['drawn'] = len(jobs)
+    stats['cached'] = len(set(keys.values())) - len(jobs)
+    return urls, stats
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Output writer shared by both generators
+
+Rewriting a file whose bytes did not change bumps its mtime, so rsync and
+CDN uploads treat it as changed, and a build interrupted mid-write leaves a
+half-written page behind. OutputWriter writes every file to a temporary
+file next to its target, hashing the bytes on the way, and then either:
+
+- renames the temporary file over the target (atomic on POSIX), when the
+  target is missing or its hash differs, or
+- deletes the temporary file and leaves the target untouched, when the
+  target already holds the same bytes.
+
+Rendered pages are still written chunk by chunk and never held whole.
+Directories are created once per writer and remembered (and recreated if
+they disappear later). Writers are thread-safe; `written` and `skipped`
+count the outcomes.
+"""
+
+import os
+import hashlib
+import threading
+
+
+BLOCK_SIZE = 64 * 1024
+
+
+def file_digest(path):
+    """SHA-1 of a file's bytes (None if it doesn't exist)."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class OutputWriter:
+    """Atomic, skip-if-identical file writes with written/skipped counts"""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self._dirs = set()
+        self._lock = threading.Lock()
+
+    def makedirs(self, directory):
+        """Create a directory (and parents) unless this writer already did."""
+        if not directory or directory in self._dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._dirs.add(directory)
+
+    def write(self, path, content):
+        """Write a str (UTF-8) or bytes. Returns True if the file changed."""
+        return self.write_chunks(path, [content])
+
+    def write_chunks(self, path, chunks):
+        """
+        Write an iterable of str/bytes chunks to `path`
+
+        Returns:
+            True if the file was written, False if it already held these bytes
+        """
+        directory = os.path.dirname(path)
+        self.makedirs(directory)
+        tmp_path = os.path.join(
+            directory, f'.{os.path.basename(path)}.{os.getpid()}-{threading.get_ident()}.tmp'
+        )
+        digest = hashlib.sha1()
+        try:
+            f = open(tmp_path, 'wb')
+        except FileNotFoundError:
+            # Removed since it was cached (e.g. a stale page directory)
+            os.makedirs(directory, exist_ok=True)
+            f = open(tmp_path, 'wb')
+        try:
+            with f:
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode('utf-8')
+                    digest.update(chunk)
+                    f.write(chunk)
+            if file_digest(path) == digest.hexdigest():
+                os.remove(tmp_path)
+                changed = False
+            else:
+                os.replace(tmp_path, path)
+                changed = True
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if changed:
+                self.written += 1
+            else:
+                self.skipped += 1
+        return changed
+
+    def add(self, written, skipped):
+        """Add counts from another writer (e.g. a worker process's)."""
+        with self._lock:
+            self.written += written
+            self.skipped += skipped
+
+    def reset(self):
+        """Zero the counts (the directory cache is kept)."""
+        with self._lock:
+            self.written = self.skipped = 0
+
+    def summary(self):
+        return f"{self.written} files written, {self.skipped} unchanged"
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Derived permit fields, computed once per build (generator_v1_backup.py)
+
+Every page of the permit site needs the same derived values: the
+jurisdiction and permit slugs its URL is made of, the how-to steps split
+out of `how_to_description`, and the JSON-encoded columns decoded.
+normalize_permits() adds them to the loaded DataFrame as columns, with
+the string operations vectorized over whole columns, and the page, hub,
+homepage, sitemap and data.json steps read them from there.
+
+Added columns:
+    jurisdiction_slug   'california' (mapped state abbreviation) or the
+                        slugified first word of agency_short
+    permit_slug         slugified request_type
+    permit_type, permit_type_name
+                        canonical permit type (slug, name) of the
+                        request_type (see permit_types.py); the type hubs,
+                        facets and statistics group by it
+    state_code, state_name, state_slug, city_name, city_slug
+                        resolved location (see locations.py); empty when
+                        the location does not resolve or, for the city,
+                        when the permit is statewide
+    url_path            '/<state>/<city>/<permit>/', '/<state>/<permit>/'
+                        (statewide) or '/<jurisdiction>/<permit>/'
+                        (unresolved location)
+    url_slug            url_path's segments joined with '-' (social cards)
+    how_to_steps        list of step texts
+    <field>_parsed      decoded value of each JSON_COLUMNS field (list)
+    <range>_min/_max/_mid  numbers of each RANGE_COLUMNS field ('50-200'
+                        gives 50, 200, 125; NaN when missing or unparseable)
+
+Decoding the JSON cells and splitting the steps is the slow, per-row part.
+Its results are kept in a ParseCache (.build_cache/permits/parsed_fields.json)
+keyed by a hash of the row's raw cells, so rows that did not change since
+the last build are not parsed again; scripts/convert_csv_to_json.py uses
+the same cache. Cells that cannot be parsed are collected as structured
+warnings (file, row, column, error) and written to a report instead of
+printed.
+
+The free-text ranges (cost '50-200', volume '200-500', effort '1-3') are
+parsed once per distinct value (parse_range is memoized) and mapped back
+over the column, so sorting and averaging use plain float columns. Values
+that are not a number or range ('Varies') are counted in the same report.
+
+This module does not import pandas; it only calls DataFrame methods.
+"""
+
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+
+from locations import LOCATION_COLUMNS, LocationResolver, slugify
+from permit_types import PermitTypeMap
+
+
+# State abbreviations with a hand-picked jurisdiction slug
+STATE_SLUGS = {
+    'CA': 'california',
+    'NY': 'new-york',
+    'TX': 'texas',
+    'FL': 'florida',
+}
+
+# Columns holding JSON-encoded lists
+JSON_COLUMNS = ('community_feedback', 'user_tips', 'faqs')
+
+PARSE_CACHE_PATH = os.path.join('.build_cache', 'permits', 'parsed_fields.json')
+PARSE_REPORT_PATH = os.path.join('.build_cache', 'permits', 'parse_warnings.json')
+
+# Bump when parsing changes to invalidate cached results
+PARSE_VERSION = 1
+
+# Raw columns the parsed fields are derived from
+PARSED_SOURCE_COLUMNS = ('how_to_description',) + JSON_COLUMNS
+
+# Free-text numeric ranges
+RANGE_COLUMNS = ('cost', 'estimated_monthly_volume', 'effort_hours')
+
+# '50', '$50', '50-200', '$1,000 - $5,000', '5 to 10', '500+'
+RANGE_PATTERN = re.compile(
+    r'\$?\s*(\d[\d,]*(?:\.\d+)?)\s*(?:(?:-|–|to)\s*\$?\s*(\d[\d,]*(?:\.\d+)?))?\s*\+?',
+    re.IGNORECASE
+)
+
+# Values meaning zero
+ZERO_VALUES = {'free', 'none', 'no fee', 'no cost'}
+
+DERIVED_COLUMNS = (
+    'jurisdiction_slug', 'permit_slug', 'permit_type', 'permit_type_name', 'url_slug', 'url_path', 'how_to_steps',
+) + LOCATION_COLUMNS + tuple(f'{field}_parsed' for field in JSON_COLUMNS) + tuple(
+    f'{field}_{bound}' for field in RANGE_COLUMNS for bound in ('min', 'max', 'mid')
+)
+
+
+def fill_empty(values):
+    """A Series of strings with '' for missing values (categorical ones stay categorical)."""
+    if hasattr(values, 'cat') and '' not in values.cat.categories:
+        values = values.cat.add_categories('')
+    return values.fillna('')
+
+
+def slugify_column(values):
+    """slugify() over a Series of strings (missing values become '')."""
+    return (
+        fill_empty(values).astype(str).str.lower()
+        .str.replace(r'[^\w\s-]', '', regex=True)
+        .str.replace(r'[\s_]+', '-', regex=True)
+        .str.replace(r'^-+|-+$', '', regex=True)
+    )
+
+
+def split_numbered_steps(text):
+    """
+    Split a text with numbered steps (e.g., "1. Do this. 2. Do that.")
+    into a list of clean step texts without the numbers.
+    """
+    if not isinstance(text, str) or not text:
+        return []
+
+    # Split by pattern: space + digit + period + space (e.g., " 2. ")
+    # This preserves periods within sentences
+    steps = []
+    for step in re.split(r'\s+\d+\.\s+', text):
+        step = step.strip()
+        if step:
+            # Remove leading number from first step (e.g., "1. text" -> "text")
+            steps.append(re.sub(r'^\d+\.\s*', '', step))
+    return steps
+
+
+def parse_json_list(value):
+    """
+    Decode a JSON cell holding a list
+
+    Returns:
+        (list, error): missing or blank cells give ([], None); invalid JSON
+        or a non-list value gives ([], message)
+    """
+    if not isinstance(value, str) or not value.strip():
+        return [], None
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError as e:
+        return [], f"Invalid JSON - {e}"
+    if not isinstance(parsed, list):
+        return [], f"Expected a JSON array, got {type(parsed).__name__}"
+    return parsed, None
+
+
+def parse_row(cells):
+    """
+    Parse one row's PARSED_SOURCE_COLUMNS cells
+
+    Returns:
+        Dict with 'how_to_steps', one entry per JSON column and 'warnings'
+        (list of {'column', 'error'})
+    """
+    how_to_description, *json_cells = cells
+    parsed = {'how_to_steps': split_numbered_steps(how_to_description), 'warnings': []}
+    for field, value in zip(JSON_COLUMNS, json_cells):
+        parsed[field], error = parse_json_list(value)
+        if error is not None:
+            parsed['warnings'].append({'column': field, 'error': error})
+    return parsed
+
+
+def row_key(cells):
+    """Hash of a row's raw cells (missing cells hash differently from '')."""
+    digest = hashlib.sha1(str(PARSE_VERSION).encode())
+    for value in cells:
+        digest.update(b'\x1f' + (value.encode('utf-8') if isinstance(value, str) else b'\x00'))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsed fields of earlier builds, keyed by row_key()"""
+
+    def __init__(self, path=PARSE_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == PARSE_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def parse(self, cells):
+        """parse_row(cells), from the cache when the cells are unchanged."""
+        key = row_key(cells)
+        self.used.add(key)
+        parsed = self.entries.get(key)
+        if parsed is None:
+            parsed = self.entries[key] = parse_row(cells)
+            self.misses += 1
+        else:
+            self.hits += 1
+        return parsed
+
+    def save(self):
+        """Write the entries used since loading (rows no longer present are dropped)."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': PARSE_VERSION,
+                'entries': {key: self.entries[key] for key in self.used},
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def parse_permit_fields(df, cache=None, warnings=None, sources=None):
+    """
+    Parse the steps and JSON columns of every row
+
+    Args:
+        df: Permits DataFrame
+        cache: Optional ParseCache
+        warnings: Optional list; one dict per unparseable cell is appended
+            (file, row: line number in that file, column, error,
+            request_type)
+        sources: (file, line) of each row, indexed by the DataFrame's index
+            labels (permit_snapshot.RowSources); without it df is taken to
+            be read from one CSV file, one line per row, and file is None
+
+    Returns:
+        List of parse_row() results, in row order
+    """
+    columns = [column(df, name, None) for name in PARSED_SOURCE_COLUMNS]
+    request_types = column(df, 'request_type', '')
+    results = []
+    for position, (label, cells) in enumerate(zip(df.index, zip(*columns))):
+        parsed = cache.parse(cells) if cache is not None else parse_row(cells)
+        if warnings is not None and parsed['warnings']:
+            # Header is line 1
+            path, line = sources[label] if sources is not None else (None, position + 2)
+            for warning in parsed['warnings']:
+                warnings.append({
+                    'file': path,
+                    'row': line,
+                    'column': warning['column'],
+                    'error': warning['error'],
+                    'request_type': request_types.iloc[position],
+                })
+        results.append(parsed)
+    return results
+
+
+@lru_cache(maxsize=None)
+def parse_range(text):
+    """
+    Parse a number or range such as '50-200'
+
+    Returns:
+        (min, max) floats, or None when the text is not a number or range
+    """
+    text = text.strip()
+    if text.lower() in ZERO_VALUES:
+        return 0.0, 0.0
+    match = RANGE_PATTERN.fullmatch(text)
+    if not match:
+        return None
+    low = float(match.group(1).replace(',', ''))
+    high = float(match.group(2).replace(',', '')) if match.group(2) else low
+    return min(low, high), max(low, high)
+
+
+def parse_ranges(df, columns=RANGE_COLUMNS, unparseable=None):
+    """
+    Add <column>_min, _max and _mid float columns for each range column
+
+    Each distinct value is parsed once; the results are mapped over the
+    column. Missing columns are skipped.
+
+    Args:
+        unparseable: Optional dict; {column: {value: rows}} is added for
+            values that are not a number or range
+    """
+    for name in columns:
+        if name not in df.columns:
+            continue
+        values = df[name]
+        lows, highs = {}, {}
+        for value in values.dropna().unique():
+            parsed = parse_range(str(value))
+            if parsed is None:
+                if unparseable is not None:
+                    unparseable.setdefault(name, {})[str(value)] = int((values == value).sum())
+                continue
+            lows[value], highs[value] = parsed
+        df[f'{name}_min'] = values.map(lows).astype(float)
+        df[f'{name}_max'] = values.map(highs).astype(float)
+        df[f'{name}_mid'] = (df[f'{name}_min'] + df[f'{name}_max']) / 2
+    return df
+
+
+def write_parse_report(warnings, path=PARSE_REPORT_PATH, unparseable=None):
+    """
+    Write parse warnings as JSON grouped by column; returns the path
+
+    `unparseable` (from parse_ranges) is written as 'unparseable_ranges'.
+    """
+    by_column = {}
+    for warning in warnings:
+        by_column[warning['column']] = by_column.get(warning['column'], 0) + 1
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'total': len(warnings), 'by_column': by_column, 'warnings': warnings,
+                   'unparseable_ranges': unparseable or {}},
+                  f, indent=2, ensure_ascii=False, default=str)
+    return path
+
+
+def column(df, name, default):
+    """df[name], or `default` in every row when the column is missing."""
+    return df[name] if name in df.columns else df.index.to_series().map(lambda _: default)
+
+
+def resolve_locations(df, resolver=None):
+    """
+    Add the LOCATION_COLUMNS: each row's location_applicability, or else its
+    agency_full or agency_short, resolved by a LocationResolver (each
+    distinct string once). Unresolved rows get empty strings.
+    """
+    resolver = resolver or LocationResolver()
+    texts = zip(*(column(df, name, None) for name in ('location_applicability', 'agency_full', 'agency_short')))
+    locations = [resolver.resolve_first(row) for row in texts]
+    for position, name in enumerate(LOCATION_COLUMNS):
+        df[name] = [location[position] if location else '' for location in locations]
+    return df
+
+
+def assign_permit_types(df, type_map=None):
+    """
+    Add permit_type and permit_type_name: the canonical type of each row's
+    request_type from a PermitTypeMap (each distinct request_type once;
+    an in-memory map, clustering this frame's types only, if None).
+    """
+    type_map = type_map or PermitTypeMap()
+    assigned = type_map.assign(df['request_type'])
+    # Strings like the other derived columns (map() keeps a one-to-one mapping categorical)
+    slugs = fill_empty(df['request_type']).map(assigned).astype(object)
+    df['permit_type'] = slugs
+    df['permit_type_name'] = slugs.map({slug: type_map.name(slug) for slug in set(assigned.values())})
+    return df
+
+
+def normalize_permits(df, cache=None, warnings=None, unparseable=None, resolver=None, type_map=None, sources=None):
+    """
+    Add the derived columns to a permits DataFrame
+
+    Args:
+        df: Permits DataFrame
+        cache: Optional ParseCache for the steps and JSON columns
+        warnings: Optional list collecting parse warnings (see
+            parse_permit_fields)
+        unparseable: Optional dict collecting range values that could not
+            be parsed (see parse_ranges)
+        resolver: Optional LocationResolver (see resolve_locations)
+        type_map: Optional PermitTypeMap (see assign_permit_types)
+        sources: Optional (file, line) of each row, for the warnings (see
+            parse_permit_fields)
+
+    Returns:
+        A new DataFrame (a frame that already has them is returned as is)
+    """
+    if 'url_path' in df.columns:
+        return df
+    df = df.copy()
+
+    state_abbrev = fill_empty(df['agency_short']).astype(str).str.split().str[0].fillna('')
+    jurisdiction_slug = state_abbrev.map(STATE_SLUGS)
+    df['jurisdiction_slug'] = jurisdiction_slug.fillna(slugify_column(state_abbrev))
+    df['permit_slug'] = slugify_column(df['request_type'])
+    assign_permit_types(df, type_map)
+
+    # /<state>/<city>/<permit>/, /<state>/<permit>/ for statewide permits,
+    # /<jurisdiction>/<permit>/ when the location does not resolve
+    resolve_locations(df, resolver)
+    state = df['state_slug'] != ''
+    city = df['city_slug'] != ''
+    prefix = df['jurisdiction_slug'].where(~state, df['state_slug'])
+    prefix = prefix.where(~city, df['state_slug'] + '/' + df['city_slug'])
+    df['url_path'] = '/' + prefix + '/' + df['permit_slug'] + '/'
+    df['url_slug'] = prefix.str.replace('/', '-', regex=False) + '-' + df['permit_slug']
+
+    parsed = parse_permit_fields(df, cache, warnings, sources)
+    df['how_to_steps'] = [row['how_to_steps'] for row in parsed]
+    for field in JSON_COLUMNS:
+        df[f'{field}_parsed'] = [row[field] for row in parsed]
+
+    return parse_ranges(df, unparseable=unparseable)
+
+
+def page_records(df):
+    """
+    One template context per permit: the source fields with JSON_COLUMNS
+    decoded, plus the derived fields
+    """
+    records = df.to_dict('records')
+    for record in records:
+        for field in JSON_COLUMNS:
+            record[field] = record.pop(f'{field}_parsed')
+    return records
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Permit ingestion: every data file in data/permits/, validated and combined
+
+JSON_SCHEMA.md lets the permits be split over several files (by state,
+region or category). ingest_permits() reads all of them:
+
+- every *.csv and *.json file in the directory, in name order; a .json
+  file next to a .csv of the same name is skipped, since
+  scripts/convert_csv_to_json.py writes one from the other
+- files are parsed in parallel (one process per file, up to the CPU
+  count); each is checked on its own against the permit schema (see
+  permit_schema.py: columns, required fields, Yes/No flags, URLs, dates,
+  embedded JSON) and for malformed rows
+- the combined rows go through one hash index keyed by DUPLICATE_KEY
+  (agency + request type + location, case and whitespace folded), so a
+  permit listed twice, in one file or in two, is found in a single pass
+
+Every problem is an issue dict with its file and line ('error' or
+'warning'; duplicates also name the first occurrence), e.g.
+
+    data/permits/texas.csv:14: error: duplicate permit (first at data/permits/permits.csv:52)
+
+CSV cells are kept as strings and JSON arrays (faqs, user_tips, ...) are
+encoded back to JSON strings, so rows from both formats match the CSV
+layout the generator reads; cells pandas.read_csv would read as NaN
+(see permit_data.is_missing) are None.
+
+This module does not import pandas.
+
+Usage:
+    python permit_ingest.py                 # validate data/permits/
+    python permit_ingest.py path/to/dir     # validate another directory
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from permit_data import is_missing
+from permit_schema import ABSENT, CSV_SCHEMA, JSON_SCHEMA
+
+
+PERMITS_DIR = os.path.join('data', 'permits')
+
+# A permit is listed once per agency, request type and location
+DUPLICATE_KEY = ('agency_short', 'request_type', 'location_applicability')
+
+SPACES = re.compile(r'\s+')
+JSON_SPACE = re.compile(r'[ \t\n\r]*')
+
+PermitFile = namedtuple('PermitFile', 'path columns records lines issues')
+
+
+def issue(level, path, line, message, **extra):
+    return {'level': level, 'file': path, 'line': line, 'message': message, **extra}
+
+
+def format_issue(item):
+    """'<file>:<line>: <level>: <message>'"""
+    return f"{item['file']}:{item['line']}: {item['level']}: {item['message']}"
+
+
+def discover_permit_files(permits_dir=PERMITS_DIR):
+    """
+    The permit data files of a directory
+
+    Returns:
+        (paths, skipped): files to read in name order, and JSON files
+        skipped because a CSV of the same name is the source
+    """
+    if not os.path.isdir(permits_dir):
+        return [], []
+    names = sorted(name for name in os.listdir(permits_dir) if name.endswith(('.csv', '.json')))
+    stems = {name[:-4] for name in names if name.endswith('.csv')}
+    paths, skipped = [], []
+    for name in names:
+        path = os.path.join(permits_dir, name)
+        if name.endswith('.json') and name[:-5] in stems:
+            skipped.append(path)
+        else:
+            paths.append(path)
+    return paths, skipped
+
+
+def read_csv_file(path):
+    """
+    Rows of a CSV permit file
+
+    Returns:
+        (columns, rows, issues): the header, [(line, row dict)] where a
+        row's line is where it starts, and an error issue for each row
+        whose cell count differs from the header's
+    """
+    rows = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        issues = []
+        line = reader.line_num + 1
+        for cells in reader:
+            if cells:
+                if len(cells) != len(columns):
+                    issues.append(issue('error', path, line, f'expected {len(columns)} cells, found {len(cells)}'))
+                rows.append((line, dict(zip(columns, cells))))
+            line = reader.line_num + 1
+    return columns, rows, issues
+
+
+def iter_json_array(text):
+    """
+    Objects of a JSON array with the line each one starts on
+
+    Raises:
+        ValueError / json.JSONDecodeError for anything but a JSON array
+    """
+    decoder = json.JSONDecoder()
+    pos = JSON_SPACE.match(text, 0).end()
+    if text[pos:pos + 1] != '[':
+        raise ValueError('expected a JSON array of permit objects')
+    pos = JSON_SPACE.match(text, pos + 1).end()
+    line, counted = 1, 0
+    if text[pos:pos + 1] == ']':
+        return
+    while True:
+        value, end = decoder.raw_decode(text, pos)
+        line += text.count('\n', counted, pos)
+        counted = pos
+        yield line, value
+        pos = JSON_SPACE.match(text, end).end()
+        if text[pos:pos + 1] == ']':
+            return
+        if text[pos:pos + 1] != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = JSON_SPACE.match(text, pos + 1).end()
+
+
+def read_json_file(path):
+    """
+    Rows of a JSON permit file (an array of objects)
+
+    Returns:
+        (columns, rows, issues): every key in order of first use,
+        [(line, row dict)] with array fields encoded as JSON strings, and
+        an error issue for each array item that is not an object
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    columns, rows, issues = {}, [], []
+    for line, value in iter_json_array(text):
+        if not isinstance(value, dict):
+            issues.append(issue('error', path, line, f'expected a permit object, got {type(value).__name__}'))
+            continue
+        row = {}
+        for name, cell in value.items():
+            columns.setdefault(name, None)
+            if isinstance(cell, (list, dict)):
+                cell = json.dumps(cell, ensure_ascii=False)
+            elif cell is not None and not isinstance(cell, str):
+                cell = str(cell)
+            row[name] = cell
+        rows.append((line, row))
+    return list(columns), rows, issues
+
+
+def parse_permit_file(path):
+    """
+    Read and validate one permit file
+
+    Returns:
+        PermitFile(path, columns, records, lines, issues): records are row
+        dicts (NA cells None), lines the line of each record
+    """
+    try:
+        if path.endswith('.json'):
+            columns, rows, issues = read_json_file(path)
+        else:
+            columns, rows, issues = read_csv_file(path)
+    except json.JSONDecodeError as e:
+        return PermitFile(path, [], [], [], [issue('error', path, e.lineno, f'invalid JSON: {e.msg}')])
+    except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+        return PermitFile(path, [], [], [], [issue('error', path, 1, str(e))])
+
+    records, lines = [], []
+    for line, row in rows:
+        for name, cell in row.items():
+            if isinstance(cell, str) and is_missing(cell):
+                row[name] = None
+        records.append(row)
+        lines.append(line)
+
+    schema = JSON_SCHEMA if path.endswith('.json') else CSV_SCHEMA
+    errors = schema.validate({name: [record.get(name, ABSENT) for record in records] for name in columns})
+    # One issue per kind of column problem ("missing columns: a, b")
+    grouped = {}
+    for error in errors:
+        if error['row'] is None:
+            grouped.setdefault((error['level'], error['message']), []).append(error['column'])
+        else:
+            issues.append(issue(
+                error['level'], path, lines[error['row']], f"{error['column']}: {error['message']}",
+                column=error['column'], rule=error['rule'],
+            ))
+    for (level, message), names in grouped.items():
+        issues.append(issue(level, path, 1, f"{message}s: {', '.join(names)}"))
+
+    issues.sort(key=lambda item: (item['line'], item['level'] != 'error'))
+    return PermitFile(path, columns, records, lines, issues)
+
+
+def duplicate_key(record):
+    return tuple(SPACES.sub(' ', (record.get(name) or '').strip()).casefold() for name in DUPLICATE_KEY)
+
+
+def find_duplicates(files):
+    """
+    Permits listed more than once (same DUPLICATE_KEY), in one pass
+
+    Returns:
+        Issues at each later occurrence, naming the first one
+    """
+    first = {}
+    issues = []
+    for permit_file in files:
+        for record, line in zip(permit_file.records, permit_file.lines):
+            key = duplicate_key(record)
+            if not all(key):
+                continue
+            seen = first.setdefault(key, (permit_file.path, line))
+            if seen != (permit_file.path, line):
+                issues.append(issue(
+                    'error', permit_file.path, line, f'duplicate permit (first at {seen[0]}:{seen[1]})',
+                    first_file=seen[0], first_line=seen[1],
+                ))
+    return issues
+
+
+class PermitIngest:
+    """Combined rows of all permit files, with provenance and issues"""
+
+    def __init__(self, files, skipped=()):
+        self.files = files
+        self.skipped = list(skipped)
+        self.records = [record for permit_file in files for record in permit_file.records]
+        self.sources = [
+            (permit_file.path, line) for permit_file in files for line in permit_file.lines
+        ]
+        columns = {}
+        for permit_file in files:
+            columns.update(dict.fromkeys(permit_file.columns))
+        self.columns = list(columns)
+        self.issues = [item for permit_file in files for item in permit_file.issues] + find_duplicates(files)
+
+    @property
+    def errors(self):
+        return [item for item in self.issues if item['level'] == 'error']
+
+    @property
+    def warnings(self):
+        return [item for item in self.issues if item['level'] == 'warning']
+
+
+def ingest_permits(permits_dir=PERMITS_DIR, workers=None):
+    """
+    Read, validate and combine every permit file of a directory
+
+    Args:
+        permits_dir: Directory of permit CSV/JSON files
+        workers: Parser processes (None: one per file, up to the CPU count;
+            1 parses in this process)
+
+    Returns:
+        PermitIngest
+    """
+    paths, skipped = discover_permit_files(permits_dir)
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if len(paths) <= 1 or workers <= 1:
+        files = [parse_permit_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            files = list(pool.map(parse_permit_file, paths))
+    return PermitIngest(files, skipped)
+
+
+def main():
+    permits_dir = sys.argv[1] if len(sys.argv) > 1 else PERMITS_DIR
+    ingest = ingest_permits(permits_dir)
+    for path in ingest.skipped:
+        print(f"{path}: skipped (generated from the CSV file of the same name)")
+    for item in ingest.issues:
+        print(format_issue(item))
+    print(f"{len(ingest.records)} permits in {len(ingest.files)} files: "
+          f"{len(ingest.errors)} errors, {len(ingest.warnings)} warnings")
+    return 1 if ingest.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Permit schema validator, shared by the generator and the data tests
+
+The permit schema (JSON_SCHEMA.md) is declared once, as FieldSpecs, and
+compiled into a PermitSchema: for every column, whether it must be
+present and non-empty and which format check applies to its values:
+
+    yes_no      'Yes' or 'No' (online_available, api_available, ...)
+    url         http(s) URL with a host
+    date        YYYY-MM-DD calendar date
+    uuid        UUID v4
+    two_words   exactly two words (name)
+    cost        no negative amounts, a number or a known word
+    json_list   a JSON array (a list in JSON files, a JSON string in CSV
+                files), optionally with an item shape: 'faq' objects
+                with question and answer, 'uuid' or 'string' items
+
+CSV_SCHEMA (the 29 columns of the CSV files) and JSON_SCHEMA (31 fields,
+plus id and name) are compiled at import.
+
+validate() works column by column over the whole dataset in one pass and
+checks each distinct value of a column once (permit data repeats values
+like 'Yes', dates and agency URLs on most rows), so the cost grows with
+the number of distinct values rather than with the rows times the rules.
+It returns row-level errors:
+
+    {'level': 'error', 'row': 12, 'column': 'source_url', 'rule': 'url',
+     'value': 'example.gov', 'message': 'not an http(s) URL with a host'}
+
+('row' is the data row index, None for a missing required column or an
+unknown column, which is a 'warning'; optional CSV columns may be left
+out.)
+
+validate_file() validates one CSV or JSON file and memoizes the result
+per file version, so the data tests share one validation run.
+
+This module does not import pandas.
+"""
+
+import os
+import re
+import json
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from permit_data import is_missing, load_permits_json, read_csv_rows
+
+
+# required: must have a non-empty value; nullable: may be null (JSON)
+FieldSpec = namedtuple('FieldSpec', 'name required check items nullable', defaults=(False, None, None, True))
+
+# The columns of the CSV files, in file order
+FIELDS = (
+    FieldSpec('agency_short', required=True),
+    FieldSpec('request_type', required=True),
+    FieldSpec('description'),
+    FieldSpec('processing_time'),
+    FieldSpec('cost', required=True, check='cost'),
+    FieldSpec('how_to_description'),
+    FieldSpec('payment_form_url', check='url'),
+    FieldSpec('estimated_monthly_volume'),
+    FieldSpec('deadline_window'),
+    FieldSpec('effort_hours', required=True),
+    FieldSpec('online_available', required=True, check='yes_no'),
+    FieldSpec('api_available', required=True, check='yes_no'),
+    FieldSpec('mcp_available', check='yes_no'),
+    FieldSpec('related_pages', check='json_list', items='string'),
+    FieldSpec('date_extracted', check='date'),
+    FieldSpec('source_url', check='url'),
+    FieldSpec('agency_full', required=True),
+    FieldSpec('eligibility'),
+    FieldSpec('location_applicability', required=True),
+    FieldSpec('document_requirements'),
+    FieldSpec('common_mistakes'),
+    FieldSpec('community_feedback', check='json_list'),
+    FieldSpec('user_tips', check='json_list'),
+    FieldSpec('faqs', check='json_list', items='faq'),
+    FieldSpec('agency_phone'),
+    FieldSpec('agency_email'),
+    FieldSpec('agency_address'),
+    FieldSpec('agency_hours'),
+    FieldSpec('verified_by'),
+)
+
+# JSON files add the permit ID and name, and reference related permits by
+# ID, in an array that may be empty but not null
+JSON_FIELDS = (
+    FieldSpec('id', required=True, check='uuid'),
+    FieldSpec('name', required=True, check='two_words'),
+) + tuple(
+    spec._replace(items='uuid', nullable=False) if spec.name == 'related_pages' else spec for spec in FIELDS
+)
+
+UUID = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$', re.IGNORECASE)
+DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+COST = re.compile(r'[$\d-]|free|varies|contact|no fee', re.IGNORECASE)
+
+YES_NO = ('Yes', 'No')
+
+# A field absent from a JSON object (not the same as null)
+ABSENT = object()
+
+
+def is_blank(value):
+    """None, '', whitespace, an empty list, or a cell pandas would read as NaN."""
+    if value is None or value is ABSENT:
+        return True
+    if isinstance(value, str):
+        return not value.strip() or is_missing(value)
+    return isinstance(value, list) and not value
+
+
+def check_yes_no(value):
+    if value not in YES_NO:
+        return "expected 'Yes' or 'No'"
+
+
+def check_url(value):
+    parsed = urlparse(value.strip())
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return 'not an http(s) URL with a host'
+
+
+def check_date(value):
+    if not DATE.match(value):
+        return 'expected a YYYY-MM-DD date'
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return 'not a calendar date'
+
+
+def check_uuid(value):
+    if not UUID.match(value):
+        return 'not a UUID v4'
+
+
+def check_two_words(value):
+    if len(value.split()) != 2:
+        return 'expected exactly 2 words'
+
+
+def check_cost(value):
+    if value.lower().startswith('-'):
+        return 'negative cost'
+    if not COST.search(value):
+        return 'expected an amount, a range or free/varies/contact'
+
+
+def check_items(items, kind):
+    for position, item in enumerate(items):
+        if kind == 'faq' and not (isinstance(item, dict) and 'question' in item and 'answer' in item):
+            return f'item {position}: expected an object with question and answer'
+        if kind in ('string', 'uuid') and not (isinstance(item, str) and item):
+            return f'item {position}: expected a non-empty string'
+        if kind == 'uuid' and not UUID.match(item):
+            return f'item {position}: not a UUID v4'
+
+
+def json_list_check(kind):
+    def check(value):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError as e:
+                return f'invalid JSON: {e.msg}'
+        if not isinstance(value, list):
+            return f'expected a JSON array, got {type(value).__name__}'
+        return check_items(value, kind) if kind else None
+    return check
+
+
+CHECKS = {
+    'yes_no': check_yes_no,
+    'url': check_url,
+    'date': check_date,
+    'uuid': check_uuid,
+    'two_words': check_two_words,
+    'cost': check_cost,
+}
+
+
+class PermitSchema:
+    """Field specs compiled into per-column checks"""
+
+    def __init__(self, fields, all_fields_per_row=False):
+        """
+        Args:
+            fields: FieldSpecs, in column order
+            all_fields_per_row: Every row must have every field (JSON
+                objects), reported as rule 'missing'
+        """
+        self.fields = tuple(fields)
+        self.columns = tuple(spec.name for spec in self.fields)
+        self.required = tuple(spec.name for spec in self.fields if spec.required)
+        self.all_fields_per_row = all_fields_per_row
+        self.checks = {}
+        for spec in self.fields:
+            if spec.check == 'json_list':
+                self.checks[spec.name] = ('json', json_list_check(spec.items))
+            elif spec.check:
+                self.checks[spec.name] = (spec.check, CHECKS[spec.check])
+
+    def validate(self, columns):
+        """
+        Validate a dataset given as columns
+
+        Args:
+            columns: {column name: list of values, one per row}; ABSENT
+                marks a field missing from a row
+
+        Returns:
+            List of error dicts (level, row, column, rule, value, message)
+        """
+        errors = []
+
+        for name in self.columns:
+            if name not in columns and (name in self.required or self.all_fields_per_row):
+                errors.append(column_error('error', name, 'column', 'missing column'))
+        for name in columns:
+            if name not in self.columns:
+                errors.append(column_error('warning', name, 'column', 'unknown column'))
+
+        for spec in self.fields:
+            values = columns.get(spec.name)
+            if values is None:
+                continue
+            rule, check = self.checks.get(spec.name, (None, None))
+            if check is None and not spec.required and spec.nullable and not self.all_fields_per_row:
+                continue
+            # One outcome per distinct value: None, or (rule, message)
+            outcomes = {}
+            for row, value in enumerate(values):
+                try:
+                    outcome = outcomes[value]
+                except KeyError:
+                    outcome = outcomes[value] = self.outcome(spec, rule, check, value)
+                except TypeError:
+                    # Lists and objects of JSON files
+                    key = json.dumps(value, sort_keys=True)
+                    if key not in outcomes:
+                        outcomes[key] = self.outcome(spec, rule, check, value)
+                    outcome = outcomes[key]
+                if outcome:
+                    errors.append(row_error(row, spec.name, outcome[0], None if value is ABSENT else value, outcome[1]))
+
+        errors.sort(key=lambda error: (-1 if error['row'] is None else error['row']))
+        return errors
+
+    def outcome(self, spec, rule, check, value):
+        """(rule, message) of one value of a field, None when valid."""
+        if value is ABSENT and self.all_fields_per_row:
+            return 'missing', 'missing field'
+        if value is None and not spec.nullable:
+            return rule or 'required', 'must not be null'
+        if is_blank(value):
+            return ('required', 'required field is empty') if spec.required else None
+        if check is None:
+            return None
+        if rule != 'json' and not isinstance(value, str):
+            return rule, f'expected a string, got {type(value).__name__}'
+        message = check(value)
+        return (rule, message) if message else None
+
+    def validate_records(self, records):
+        """Validate a list of row dicts (see validate)."""
+        names = {}
+        for record in records:
+            names.update(dict.fromkeys(record))
+        columns = {name: [record.get(name, ABSENT) for record in records] for name in names}
+        return self.validate(columns)
+
+
+def column_error(level, name, rule, message):
+    return {'level': level, 'row': None, 'column': name, 'rule': rule, 'value': None, 'message': message}
+
+
+def row_error(row, name, rule, value, message):
+    return {'level': 'error', 'row': row, 'column': name, 'rule': rule, 'value': value, 'message': message}
+
+
+def format_error(error, first_line=2):
+    """'row <n> <column>: <message>', numbering rows from `first_line`."""
+    where = 'column' if error['row'] is None else f"row {error['row'] + first_line}"
+    value = '' if error['value'] is None else f" ({str(error['value'])[:60]!r})"
+    return f"{where} {error['column']}: {error['message']}{value}"
+
+
+CSV_SCHEMA = PermitSchema(FIELDS)
+JSON_SCHEMA = PermitSchema(JSON_FIELDS, all_fields_per_row=True)
+
+ValidationReport = namedtuple('ValidationReport', 'columns rows errors')
+
+
+@lru_cache(maxsize=16)
+def _validate_file(path, mtime, size):
+    if path.endswith('.json'):
+        records = load_permits_json(path)
+        columns = list(records[0]) if records else []
+        return ValidationReport(columns, len(records), JSON_SCHEMA.validate_records(records))
+    columns, rows = read_csv_rows(path)
+    data = {name: [row.get(name) for row in rows] for name in columns}
+    return ValidationReport(columns, len(rows), CSV_SCHEMA.validate(data))
+
+
+def validate_file(path):
+    """
+    Validate a permit CSV or JSON file (memoized until the file changes)
+
+    Returns:
+        ValidationReport(columns, rows, errors): the header (the first
+        object's fields for JSON), the number of rows, validate()'s errors
+    """
+    stat = os.stat(path)
+    return _validate_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def errors_for(report, *rules):
+    """The errors of a report with one of these rules."""
+    return [error for error in report.errors if error['rule'] in rules]
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Columnar snapshot of the ingested permits, for loading without parsing
+
+Parsing and validating the permit files (permit_ingest.py) is the slowest
+part of loading, and its result only changes when a file does. After an
+ingest, PermitSnapshot.save() writes the combined rows column by column to
+.build_cache/permits/snapshot/<key>/, keyed by snapshot_key(): a hash of
+the contents of every source file (and of the ingestion and validation
+code). A later build with the same files loads the snapshot instead.
+The digest of each file is kept with its mtime and size (digests.json),
+so only files that changed are read to compute the key.
+
+Each column is stored as uncompressed .npy files, so np.load() can
+memory-map them and a build only touches the columns it asks for:
+
+    category    <name>.codes.npy      int32, one per row (-1: missing cell)
+                <name>.strings.npy    the distinct values, UTF-8 bytes
+                <name>.offsets.npy    int64, where each value starts/ends
+    empty       (no file)             every cell missing
+
+and rows.file.npy / rows.line.npy give the file (an index into the
+manifest's files) and line each row was read from (see sources()).
+
+Permit data repeats most of its values (agencies, Yes/No flags, dates,
+locations), so the codes plus one copy of each distinct value are much
+smaller than the text. manifest.json lists the columns, the row count,
+the source files and the ingest issues, so warnings and errors are still
+reported (and strict builds still stop) without re-validating; it is
+written last, so a snapshot without one is incomplete and ignored.
+
+load() gives the rows of the ingest as a DataFrame of pandas Categorical
+columns built from the stored codes and values, so a repeated value is
+one string however many rows hold it (NaN for missing cells, float64
+columns for empty ones), optionally only some of its columns.
+
+This module imports numpy and pandas only when a snapshot is written or
+loaded.
+
+Usage:
+    python permit_snapshot.py              # snapshot data/permits/
+    python permit_snapshot.py path/to/dir  # snapshot another directory
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+
+import permit_data
+import permit_ingest
+import permit_schema
+from permit_ingest import PERMITS_DIR, discover_permit_files, ingest_permits
+
+
+SNAPSHOT_DIR = os.path.join('.build_cache', 'permits', 'snapshot')
+SNAPSHOT_VERSION = 2
+
+# Code whose changes change the ingest result
+INGEST_MODULES = tuple(
+    os.path.abspath(module.__file__) for module in (permit_data, permit_ingest, permit_schema)
+)
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_key(paths, digests=None):
+    """
+    Hash of the permit files' names and contents and the ingest code
+
+    Args:
+        paths: Permit files
+        digests: {path: [mtime_ns, size, sha1]} of earlier calls; a file
+            whose mtime and size are unchanged is not read again (updated
+            in place)
+    """
+    digests = {} if digests is None else digests
+    digest = hashlib.sha1(str(SNAPSHOT_VERSION).encode())
+    for path in INGEST_MODULES + tuple(paths):
+        stat = os.stat(path)
+        known = digests.get(path)
+        if known is None or known[:2] != [stat.st_mtime_ns, stat.st_size]:
+            known = digests[path] = [stat.st_mtime_ns, stat.st_size, file_digest(path)]
+        digest.update(f'\x1f{os.path.basename(path)}\x1e{known[2]}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def encode_column(values):
+    """(codes, strings, offsets) of a column of str/None cells; None if all are None."""
+    import numpy as np
+
+    index = {}
+    codes = np.fromiter(
+        (-1 if value is None else index.setdefault(value, len(index)) for value in values),
+        dtype=np.int32, count=len(values),
+    )
+    if not index:
+        return None
+    encoded = [value.encode('utf-8') for value in index]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    strings = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return codes, strings, offsets
+
+
+def decode_column(codes, strings, offsets):
+    """Categorical of a column's values (code -1, a missing cell, is NaN)."""
+    import pandas as pd
+
+    data = strings.tobytes()
+    bounds = offsets.tolist()
+    categories = [data[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+    return pd.Categorical.from_codes(codes, categories)
+
+
+class PermitSnapshot:
+    """Snapshots of ingested permits, one directory per snapshot_key()"""
+
+    def __init__(self, path=SNAPSHOT_DIR):
+        self.path = path
+        self.digests_path = os.path.join(path, 'digests.json')
+
+    def key(self, paths):
+        """snapshot_key() of the permit files, reading only changed files"""
+        try:
+            with open(self.digests_path, 'r', encoding='utf-8') as f:
+                digests = json.load(f)
+        except (OSError, ValueError):
+            digests = {}
+        paths = [os.path.abspath(path) for path in paths]
+        known = dict(digests)
+        key = snapshot_key(paths, digests)
+        # Files no longer read are dropped
+        used = {path: digests[path] for path in INGEST_MODULES + tuple(paths)}
+        if used != known:
+            os.makedirs(self.path, exist_ok=True)
+            tmp_path = f'{self.digests_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(used, f)
+            os.replace(tmp_path, self.digests_path)
+        return key
+
+    def manifest(self, key):
+        """The manifest of a complete snapshot, None if there is none."""
+        try:
+            with open(os.path.join(self.path, key, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == SNAPSHOT_VERSION else None
+
+    def save(self, key, ingest):
+        """
+        Write the rows and issues of a PermitIngest as snapshot `key`
+
+        Complete snapshots of other keys are removed (not the .tmp-<pid>
+        directories another build may still be writing).
+
+        Returns:
+            The manifest
+        """
+        import numpy as np
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp_dir = os.path.join(self.path, f'{key}.tmp-{os.getpid()}')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        columns = []
+        for name in ingest.columns:
+            encoded = encode_column([record.get(name) for record in ingest.records])
+            if encoded is None:
+                columns.append({'name': name, 'kind': 'empty'})
+                continue
+            for part, array in zip(('codes', 'strings', 'offsets'), encoded):
+                np.save(os.path.join(tmp_dir, f'{column_file(name)}.{part}.npy'), array)
+            columns.append({'name': name, 'kind': 'category', 'values': len(encoded[2]) - 1})
+
+        files = [permit_file.path for permit_file in ingest.files]
+        file_codes = {path: code for code, path in enumerate(files)}
+        np.save(os.path.join(tmp_dir, 'rows.file.npy'),
+                np.array([file_codes[path] for path, _ in ingest.sources], dtype=np.int32))
+        np.save(os.path.join(tmp_dir, 'rows.line.npy'),
+                np.array([line for _, line in ingest.sources], dtype=np.int64))
+
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'key': key,
+            'rows': len(ingest.records),
+            'columns': columns,
+            'files': files,
+            'skipped': ingest.skipped,
+            'issues': ingest.issues,
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        target = os.path.join(self.path, key)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+        for name in os.listdir(self.path):
+            other = os.path.join(self.path, name)
+            if name != key and '.tmp-' not in name and os.path.isfile(os.path.join(other, 'manifest.json')):
+                shutil.rmtree(other, ignore_errors=True)
+        return manifest
+
+    def load(self, key, columns=None, manifest=None):
+        """
+        DataFrame of snapshot `key`, memory-mapping only the columns read
+
+        Args:
+            key: snapshot_key() of the permit files
+            columns: Column names to load (all if None; names the snapshot
+                does not have are left out)
+            manifest: The snapshot's manifest, if already read
+
+        Returns:
+            pandas DataFrame, or None if there is no such snapshot
+        """
+        import numpy as np
+        import pandas as pd
+
+        manifest = manifest or self.manifest(key)
+        if manifest is None:
+            return None
+        wanted = None if columns is None else set(columns)
+        directory = os.path.join(self.path, key)
+        data = {}
+        try:
+            for spec in manifest['columns']:
+                name = spec['name']
+                if wanted is not None and name not in wanted:
+                    continue
+                if spec['kind'] == 'empty':
+                    data[name] = np.full(manifest['rows'], np.nan)
+                    continue
+                base = os.path.join(directory, column_file(name))
+                data[name] = decode_column(*(
+                    np.load(f'{base}.{part}.npy', mmap_mode='r') for part in ('codes', 'strings', 'offsets')
+                ))
+        except (OSError, ValueError):
+            return None
+        return pd.DataFrame(data, index=pd.RangeIndex(manifest['rows']))
+
+    def sources(self, manifest):
+        """RowSources of a snapshot (None if it has no row sources)."""
+        import numpy as np
+
+        directory = os.path.join(self.path, manifest['key'])
+        try:
+            return RowSources(
+                manifest['files'],
+                np.load(os.path.join(directory, 'rows.file.npy'), mmap_mode='r'),
+                np.load(os.path.join(directory, 'rows.line.npy'), mmap_mode='r'),
+            )
+        except (OSError, ValueError):
+            return None
+
+
+class RowSources:
+    """(file, line) each row was read from, by row number"""
+
+    def __init__(self, files, file_codes, lines):
+        self.files = files
+        self.file_codes = file_codes
+        self.lines = lines
+
+    def __getitem__(self, row):
+        return self.files[self.file_codes[row]], int(self.lines[row])
+
+    def __len__(self):
+        return len(self.lines)
+
+
+def column_file(name):
+    """File name stem of a column (any name, including '' and '/')"""
+    safe = ''.join(c if c.isalnum() or c in '_-' else '_' for c in name)[:40]
+    return f"{safe}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+
+def load_permits(permits_dir=PERMITS_DIR, snapshot=None, columns=None):
+    """
+    Permit rows from the snapshot of the current files, ingesting on a miss
+
+    Args:
+        permits_dir: Directory of permit CSV/JSON files
+        snapshot: PermitSnapshot (one in .build_cache/ if None)
+        columns: Column names to load (all if None)
+
+    Returns:
+        (df, manifest, hit): the DataFrame, the snapshot manifest (files,
+        skipped, issues) and whether the snapshot was already there
+    """
+    snapshot = snapshot or PermitSnapshot()
+    paths, _ = discover_permit_files(permits_dir)
+    key = snapshot.key(paths)
+    manifest = snapshot.manifest(key)
+    hit = manifest is not None
+    df = snapshot.load(key, columns, manifest) if hit else None
+    if df is None:
+        hit = False
+        manifest = snapshot.save(key, ingest_permits(permits_dir))
+        df = snapshot.load(key, columns, manifest)
+    return df, manifest, hit
+
+
+def main():
+    permits_dir = sys.argv[1] if len(sys.argv) > 1 else PERMITS_DIR
+    df, manifest, hit = load_permits(permits_dir)
+    errors = sum(item['level'] == 'error' for item in manifest['issues'])
+    print(f"{'Up to date' if hit else 'Wrote'}: {os.path.join(SNAPSHOT_DIR, manifest['key'])}")
+    print(f"{manifest['rows']} permits, {len(manifest['columns'])} columns from {len(manifest['files'])} files "
+          f"({errors} errors, {len(manifest['issues']) - errors} warnings)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
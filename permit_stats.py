@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Per-type, per-state and per-city permit statistics
+
+The permits index, the permit-type hubs, the homepage and data.json all
+show aggregates of the same rows: how many locations offer a permit type,
+what share of them is online, the average cost. aggregate_permits()
+computes every one of them from the normalized permit frame (see
+permit_fields.normalize_permits) with one groupby per level:
+
+    by_type   index permit_type (canonical type, see permit_types.py):
+              name, description, permits,
+              jurisdiction_count, online_count, api_count, mcp_count,
+              online_percent, avg_cost, processing_time (most common)
+    by_state  index state_slug: permits, city_count, online_count,
+              api_count, mcp_count, online_percent, avg_cost
+    by_city   index (state_slug, city_slug): permits, type_count,
+              online_count, api_count, mcp_count, online_percent, avg_cost
+    totals    dict: permits, agencies, jurisdictions, types, online, api, mcp
+
+A "jurisdiction" is a resolved state/city (or the legacy jurisdiction slug
+of a permit whose location did not resolve). avg_cost is the mean of the
+cost range midpoints (NaN when no cost parses).
+
+permit_stats() memoizes the result by a hash of the columns it reads, so
+build steps handed the same permits (or a copy of them) share one
+computation.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from permit_fields import column
+
+
+# Columns the statistics are computed from (and hashed)
+STATS_COLUMNS = (
+    'permit_type', 'permit_type_name', 'description', 'processing_time', 'agency_full', 'jurisdiction_slug',
+    'state_slug', 'city_slug', 'online_available', 'api_available', 'mcp_available', 'cost_mid',
+)
+
+# Permit types available in fewer locations get a noindex type hub
+MIN_INDEXED_LOCATIONS = 3
+
+# Results kept by permit_stats()
+CACHE_SIZE = 4
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def format_cost(value):
+    """'$420' for an average cost, 'Varies' when unknown (NaN)."""
+    if value != value:
+        return 'Varies'
+    return f'${int(value):,}'
+
+
+class PermitStats:
+    """Aggregates of one permits frame (see aggregate_permits)"""
+
+    def __init__(self, by_type, by_state, by_city, totals, key=None):
+        self.by_type = by_type
+        self.by_state = by_state
+        self.by_city = by_city
+        self.totals = totals
+        self.key = key
+
+    def type_records(self):
+        """
+        One dict per permit type (slug plus the by_type columns, avg_cost
+        formatted), most widely available first
+        """
+        records = self.by_type.reset_index().rename(columns={'permit_type': 'slug'}).to_dict('records')
+        for record in records:
+            record['avg_cost'] = format_cost(record['avg_cost'])
+            record['should_noindex'] = record['jurisdiction_count'] < MIN_INDEXED_LOCATIONS
+        return sorted(records, key=lambda record: (-record['jurisdiction_count'], record['name']))
+
+
+def dataset_key(df):
+    """Hash of the STATS_COLUMNS of a normalized permits frame."""
+    # Imported here: this module is imported by the generator at startup
+    from pandas.util import hash_pandas_object
+
+    digest = hashlib.sha1()
+    for name in STATS_COLUMNS:
+        digest.update(name.encode())
+        if name in df.columns:
+            digest.update(hash_pandas_object(df[name], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def aggregate_permits(df, key=None):
+    """
+    Compute the per-type, per-state and per-city statistics
+
+    Args:
+        df: Normalized permits DataFrame
+        key: Dataset hash to record on the result
+
+    Returns:
+        PermitStats
+    """
+    resolved = df['state_slug'] != ''
+    location = (df['state_slug'] + '/' + df['city_slug']).where(resolved, df['jurisdiction_slug'])
+    work = df.assign(
+        description=column(df, 'description', ''),
+        # Strings, not categories: grouped by below with ties in alphabetical order
+        processing_time=column(df, 'processing_time', '').astype(object),
+        online=column(df, 'online_available', 'No') == 'Yes',
+        api=column(df, 'api_available', 'No') == 'Yes',
+        mcp=column(df, 'mcp_available', 'No') == 'Yes',
+        cost_mid=column(df, 'cost_mid', float('nan')),
+        location=location,
+        # NaN for statewide permits, so nunique() counts cities only
+        city=df['city_slug'].where(df['city_slug'] != ''),
+    )
+    counts = {
+        'permits': ('permit_type', 'size'),
+        'online_count': ('online', 'sum'),
+        'api_count': ('api', 'sum'),
+        'mcp_count': ('mcp', 'sum'),
+        'avg_cost': ('cost_mid', 'mean'),
+    }
+
+    by_type = work.groupby('permit_type', sort=False).agg(
+        name=('permit_type_name', 'first'),
+        description=('description', 'first'),
+        jurisdiction_count=('location', 'nunique'),
+        **counts,
+    )
+    # Most common processing time per type (ties: alphabetical)
+    processing = (
+        work.groupby(['permit_type', 'processing_time']).size()
+        .sort_values(ascending=False, kind='stable')
+        .reset_index()
+        .drop_duplicates('permit_type')
+        .set_index('permit_type')['processing_time']
+    )
+    by_type['processing_time'] = processing.reindex(by_type.index).fillna('')
+
+    states = work[resolved]
+    by_state = states.groupby('state_slug').agg(city_count=('city', 'nunique'), **counts)
+    cities = states[states['city_slug'] != '']
+    by_city = cities.groupby(['state_slug', 'city_slug']).agg(type_count=('permit_type', 'nunique'), **counts)
+
+    for frame in (by_type, by_state, by_city):
+        frame['online_percent'] = (frame['online_count'] * 100 / frame['permits']).round().astype(int)
+
+    totals = {
+        'permits': len(df),
+        'agencies': int(column(df, 'agency_full', None).nunique()),
+        'jurisdictions': int(work['location'].nunique()),
+        'types': len(by_type),
+        'online': int(work['online'].sum()),
+        'api': int(work['api'].sum()),
+        'mcp': int(work['mcp'].sum()),
+    }
+    return PermitStats(by_type, by_state, by_city, totals, key)
+
+
+def permit_stats(df):
+    """aggregate_permits(df), shared by every caller passing the same data."""
+    key = dataset_key(df)
+    with _cache_lock:
+        stats = _cache.get(key)
+        if stats is not None:
+            _cache.move_to_end(key)
+            return stats
+    stats = aggregate_permits(df, key)
+    with _cache_lock:
+        _cache[key] = stats
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return stats
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Canonical permit types
+
+The same permit is entered under many names: "Apply for a business
+license", "Business License", "General Business Licence". PermitTypeMap
+assigns every request_type a canonical permit type (slug and name), so the
+permit-type hubs, facets and statistics group them together.
+
+Matching works on distinct request types, never on rows:
+
+1. type_key() normalizes a name to sorted tokens, dropping filler words
+   ("apply", "for", "general", ...), folding plurals and spellings
+   ("licences" -> "license"). Names with the same key are the same type.
+2. Keys not seen before are clustered: each is put in the blocks of its
+   two rarest tokens, pairs within a block are compared (blocks larger
+   than MAX_BLOCK only with their WINDOW nearest neighbours in sorted
+   order), and pairs at least SIMILARITY alike (difflib ratio, after a
+   length and character-trigram prefilter) are merged with union-find.
+   The work grows with the number of distinct keys times the block size,
+   not with the square of the keys. Known keys are only compared with
+   new ones.
+3. A new key that clusters with a known type joins it (as an alias);
+   otherwise its cluster becomes a new type named after the most common
+   spelling of its most common key.
+
+The mapping is kept in a reviewable JSON file (data/permit_types.json):
+
+    {"version": 1, "types": {"business-license": {
+        "name": "Business License",
+        "aliases": ["Apply for a business license", "Business License",
+                    "General Business Licence"],
+        "reviewed": false}}}
+
+The aliases are every request type mapped to the type. Edit names and
+move aliases between types by hand, and set "reviewed" once checked.
+Later builds only cluster request types that no alias matches, so
+reviewed decisions are kept and new rows are mapped incrementally.
+"""
+
+import os
+import re
+import json
+import difflib
+from collections import Counter
+from functools import lru_cache
+
+from locations import slugify
+
+
+TYPE_MAP_PATH = os.path.join('data', 'permit_types.json')
+
+TYPE_MAP_VERSION = 1
+
+# Words that do not tell permit types apart
+FILLER_WORDS = {
+    'a', 'an', 'the', 'for', 'of', 'to', 'and', 'or', 'apply', 'applying', 'application', 'get', 'obtain',
+    'obtaining', 'request', 'general', 'standard', 'basic',
+}
+
+# Spellings and abbreviations
+SYNONYMS = {
+    'licence': 'license',
+    'lic': 'license',
+    'reg': 'registration',
+    'cert': 'certificate',
+}
+
+# Pairs at least this similar (difflib ratio of the keys) are one type
+SIMILARITY = 0.88
+
+# Pairs sharing fewer character trigrams (Dice coefficient) are not compared
+# with difflib; no pair this far apart reaches SIMILARITY in practice
+TRIGRAM_DICE = 0.5
+
+# Blocks up to this size compare all pairs; larger ones a sliding window
+MAX_BLOCK = 64
+WINDOW = 16
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_token(token):
+    token = SYNONYMS.get(token, token)
+    # Plurals ("permits", "licenses"), but not "business" or "gas"
+    if len(token) > 4 and token.endswith('s') and not token.endswith('ss'):
+        token = SYNONYMS.get(token[:-1], token[:-1])
+    return token
+
+
+def type_key(name):
+    """Order-insensitive key of a request type ('' for a blank name)."""
+    if not isinstance(name, str):
+        return ''
+    words = [normalize_token(word) for word in WORD.findall(name.lower())]
+    tokens = sorted(set(word for word in words if word not in FILLER_WORDS))
+    # A name made only of filler words is its own key
+    return ' '.join(tokens or sorted(set(words)))
+
+
+@lru_cache(maxsize=1 << 17)
+def trigrams(key):
+    padded = f' {key} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a, b):
+    """difflib ratio of two keys, 0.0 when cheaper bounds rule out SIMILARITY."""
+    # The ratio is at most 2 * shorter / (both lengths)
+    if 2 * min(len(a), len(b)) < SIMILARITY * (len(a) + len(b)):
+        return 0.0
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if 2 * len(grams_a & grams_b) < TRIGRAM_DICE * (len(grams_a) + len(grams_b)):
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < SIMILARITY or matcher.quick_ratio() < SIMILARITY:
+        return 0.0
+    return matcher.ratio()
+
+
+def candidate_pairs(keys, new=None):
+    """
+    Pairs of keys sharing a block (blocks: each key's two rarest tokens)
+
+    Args:
+        keys: Keys to block
+        new: Only pairs with at least one key in this set (None: all pairs)
+
+    Yields:
+        (key, key) tuples, each pair once
+    """
+    frequency = Counter(token for key in keys for token in key.split())
+    blocks = {}
+    for key in keys:
+        for token in sorted(key.split(), key=lambda token: (frequency[token], token))[:2]:
+            blocks.setdefault(token, []).append(key)
+
+    seen = set()
+    for block in blocks.values():
+        block.sort()
+        window = len(block) if len(block) <= MAX_BLOCK else WINDOW
+        for i, key in enumerate(block):
+            for other in block[i + 1:i + 1 + window]:
+                if (new is None or key in new or other in new) and (key, other) not in seen:
+                    seen.add((key, other))
+                    yield key, other
+
+
+def cluster_keys(keys, new=None):
+    """
+    Group similar keys (with `new`, only pairs involving a new key are
+    compared: the others were grouped before)
+
+    Returns:
+        {key: representative key} (union-find roots)
+    """
+    parent = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for a, b in candidate_pairs(keys, new):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b and similarity(a, b) >= SIMILARITY:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    return {key: find(key) for key in keys}
+
+
+class PermitTypeMap:
+    """Request type -> canonical permit type, persisted as a reviewable JSON file"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Mapping file (None keeps the mapping in memory only)
+        """
+        self.path = path
+        self.types = {}
+        self.lookup = {}
+        self.changed = False
+        self.added = 0
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == TYPE_MAP_VERSION:
+                self.types = data['types']
+        for slug, entry in self.types.items():
+            for name in [entry['name']] + entry['aliases']:
+                self.lookup.setdefault(type_key(name), slug)
+
+    def assign(self, names):
+        """
+        Canonical type of each request type
+
+        Args:
+            names: Iterable of request types (one per row)
+
+        Returns:
+            {request type: canonical slug} for every distinct name
+        """
+        counts = Counter(name if isinstance(name, str) else '' for name in names)
+        keys = {name: type_key(name) for name in counts}
+
+        unknown = {key for key in keys.values() if key not in self.lookup}
+        if unknown:
+            self._add_types(unknown, counts, keys)
+
+        assigned = {}
+        for name, key in keys.items():
+            slug = assigned[name] = self.lookup[key]
+            entry = self.types[slug]
+            if name and name not in entry['aliases']:
+                entry['aliases'].append(name)
+                self.changed = True
+        return assigned
+
+    def _add_types(self, unknown, counts, keys):
+        roots = cluster_keys(sorted(unknown | set(self.lookup)), unknown)
+        rows = Counter()
+        spellings = {}
+        for name, count in counts.items():
+            rows[keys[name]] += count
+            spellings.setdefault(keys[name], []).append(name)
+        members = {}
+        for key, root in roots.items():
+            members.setdefault(root, []).append(key)
+
+        for root, cluster in members.items():
+            new_keys = [key for key in cluster if key in unknown]
+            if not new_keys:
+                continue
+            known = [key for key in cluster if key in self.lookup]
+            if known:
+                # Join the known type most like each new key
+                for key in new_keys:
+                    best = max(known, key=lambda other: (similarity(key, other), other))
+                    self.lookup[key] = self.lookup[best]
+            else:
+                # The most common spelling of the most common key
+                names = [name for key in new_keys for name in spellings[key]]
+                name = max(names, key=lambda name: (rows[keys[name]], counts[name], -len(name), name))
+                slug = self._new_slug(slugify(name) or 'permit')
+                self.types[slug] = {'name': name, 'aliases': [], 'reviewed': False}
+                for key in new_keys:
+                    self.lookup[key] = slug
+                self.added += 1
+            self.changed = True
+
+    def _new_slug(self, slug):
+        candidate, n = slug, 2
+        while candidate in self.types:
+            candidate, n = f'{slug}-{n}', n + 1
+        return candidate
+
+    def name(self, slug):
+        return self.types[slug]['name']
+
+    def save(self):
+        """Write the mapping (if it has a path and changed)."""
+        if not self.path or not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': TYPE_MAP_VERSION,
+                'types': {
+                    slug: {**entry, 'aliases': sorted(entry['aliases'])}
+                    for slug, entry in sorted(self.types.items())
+                },
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
+        self.changed = False
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Render article pages on a process pool (generator.py --render-workers N)
+
+Template rendering and minification are CPU-bound, so threads cannot spread
+them across cores. The pool avoids shipping articles to the workers: the
+articles to render (with their image, social card and related-article ids)
+and the listing records of the related-article pool are published once as
+SharedDatasets (memory-mapped files, see shared_dataset.py). Each worker
+attaches to them and compiles the article template when it starts; tasks
+carry only batches of article ids and return the paths they rendered plus
+their minification and output-writer counts.
+
+Article bodies held in a ContentStore (content_store.py) are not copied
+into the shared file: the records carry each body's position in the
+store's blob, which the workers map read-only and read one body at a time.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from article_stream import LISTING_FIELDS
+from content_store import BlobReader, ContentHandle
+from html_minifier import MinifyReport
+from shared_dataset import SharedDataset
+
+
+SHARED_DIR = os.path.join('.build_cache', 'shared')
+
+# Article ids per task
+BATCH_SIZE = 64
+
+# Listing fields the related-article cards read
+RELATED_FIELDS = LISTING_FIELDS + ('published_date_formatted',)
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(articles_path, listings_path, blob_path, templates_dir, output_dir, minify):
+    from jinja2 import Environment, FileSystemLoader
+
+    env = Environment(loader=FileSystemLoader(templates_dir))
+    _worker.update(
+        articles=SharedDataset.attach(articles_path),
+        listings=SharedDataset.attach(listings_path),
+        # Related-article cards, decoded once per worker
+        cards={},
+        bodies=BlobReader(blob_path) if blob_path else None,
+        template=env.get_template('article_page.html'),
+        output_dir=output_dir,
+        minify=minify,
+    )
+
+
+def _render_batch(article_ids):
+    """Render one batch of article pages in a worker."""
+    # Imported here: generator imports this module
+    from generator import render_page
+
+    articles = _worker['articles']
+    listings = _worker['listings']
+    cards = _worker['cards']
+    report = MinifyReport() if _worker['minify'] else None
+    pages = []
+
+    for article_id in article_ids:
+        record = articles.get(article_id)
+        article = record['article']
+        span = article.pop('content_span', None)
+        if span is not None:
+            article['content'] = _worker['bodies'].read(*span)
+        path = os.path.join(
+            _worker['output_dir'],
+            article.get('category_slug', 'uncategorized'),
+            article.get('slug', article['id']),
+            'index.html'
+        )
+        written = render_page(
+            _worker['template'],
+            path,
+            report,
+            article=article,
+            article_image=record['article_image'],
+            og_image=record['og_image'],
+            related_articles=[cards[i] if i in cards else cards.setdefault(i, listings.get(i))
+                              for i in record['related']]
+        )
+        pages.append((path, written))
+
+    return pages, report.templates if report is not None else {}
+
+
+def _shared_page(page, blob_paths):
+    """A page's shared record: a stored body becomes its position in the blob."""
+    article = page['article']
+    content = article.get('content')
+    if isinstance(content, ContentHandle):
+        blob_paths.add(content.store.blob_path)
+        article = {k: v for k, v in article.items() if k != 'content'}
+        article['content_span'] = content.span()
+    return {**page, 'id': article['id'], 'article': article}
+
+
+def render_article_pages(pages, related_pool, output_dir, workers, minify_report=None, telemetry=None,
+                         templates_dir='templates', shared_dir=SHARED_DIR, batch_size=BATCH_SIZE):
+    """
+    Render article pages on `workers` processes
+
+    Args:
+        pages: List of dicts with 'article', 'article_image', 'og_image' and
+            'related' (ids of related articles in related_pool)
+        related_pool: Articles the related ids refer to
+        output_dir: Site output directory
+        workers: Number of worker processes
+        minify_report: MinifyReport to add the workers' counts to (None:
+            write unminified)
+        telemetry: Optional BuildTelemetry; written pages are recorded
+            in the calling thread's phase
+
+    Returns:
+        Number of pages rendered
+    """
+    from generator import output_writer
+
+    tag = f'{os.getpid()}-{id(pages):x}'
+    articles_path = os.path.join(shared_dir, f'articles-{tag}.shds')
+    listings_path = os.path.join(shared_dir, f'listings-{tag}.shds')
+
+    needed = {related_id for page in pages for related_id in page['related']}
+    blob_paths = set()
+    articles = SharedDataset.publish(
+        (_shared_page(page, blob_paths) for page in pages), articles_path
+    )
+    if len(blob_paths) > 1:
+        raise ValueError(f"article bodies come from {len(blob_paths)} content stores")
+    blob_path = blob_paths.pop() if blob_paths else None
+    listings = SharedDataset.publish(
+        (
+            {k: a[k] for k in RELATED_FIELDS if k in a}
+            for a in related_pool if a['id'] in needed
+        ),
+        listings_path
+    )
+    ids = articles.ids()
+    rendered = 0
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(articles_path, listings_path, blob_path, templates_dir, output_dir, minify_report is not None)
+        ) as pool:
+            futures = [
+                pool.submit(_render_batch, ids[start:start + batch_size])
+                for start in range(0, len(ids), batch_size)
+            ]
+            for future in as_completed(futures):
+                pages, templates = future.result()
+                rendered += len(pages)
+                files_written = sum(written for _, written in pages)
+                output_writer.add(files_written, len(pages) - files_written)
+                if telemetry is not None:
+                    for path, written in pages:
+                        telemetry.record_file(path, page=True, written=written)
+                if minify_report is not None:
+                    worker_report = MinifyReport()
+                    worker_report.templates = templates
+                    minify_report.merge(worker_report)
+    finally:
+        for dataset in (articles, listings):
+            dataset.close()
+            os.remove(dataset.path)
+
+    return rendered
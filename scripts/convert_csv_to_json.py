@@ -9,11 +9,15 @@ It handles special cases like:
 - Preserving data types and structure
 """
 
-import pandas as pd
 import json
 import os
 import sys
 
+# permit_fields lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from permit_fields import JSON_COLUMNS, ParseCache, parse_permit_fields, write_parse_report
+
 def convert_csv_to_json(csv_path, json_path):
     """
     Convert a CSV file to JSON format
@@ -22,6 +26,9 @@ def convert_csv_to_json(csv_path, json_path):
         csv_path: Path to input CSV file
         json_path: Path to output JSON file
     """
+    # Loaded only when there is something to convert (slow import)
+    import pandas as pd
+
     print(f"Reading CSV from: {csv_path}")
 
     # Read CSV
@@ -29,36 +36,29 @@ def convert_csv_to_json(csv_path, json_path):
     print(f"  - Found {len(df)} permit records")
     print(f"  - Found {len(df.columns)} columns")
 
-    # Array fields that need special handling
-    array_fields = ['community_feedback', 'user_tips', 'faqs']
+    # Array fields that need special handling: decoded through the permit
+    # parse cache shared with the generator
+    array_fields = list(JSON_COLUMNS)
+    cache = ParseCache()
+    warnings = []
+    parsed_rows = parse_permit_fields(df, cache, warnings)
+    cache.save()
 
     # Convert to JSON array
     permits = []
-    for idx, row in df.iterrows():
+    for (idx, row), parsed in zip(df.iterrows(), parsed_rows):
         permit = {}
         for col in df.columns:
             value = row[col]
 
+            # Array fields (missing or invalid cells give [])
+            if col in array_fields:
+                permit[col] = parsed[col]
             # Handle NaN/empty values
-            if pd.isna(value):
-                if col in array_fields:
-                    permit[col] = []  # Empty array for array fields
-                else:
-                    permit[col] = ""  # Empty string for other fields
+            elif pd.isna(value):
+                permit[col] = ""  # Empty string for other fields
             else:
-                # Parse JSON string fields back to arrays/objects
-                if col in array_fields:
-                    if value and str(value).strip():
-                        try:
-                            parsed = json.loads(value)
-                            permit[col] = parsed if isinstance(parsed, list) else []
-                        except json.JSONDecodeError as e:
-                            print(f"  ⚠️  Warning: Row {idx+2}, column '{col}': Invalid JSON - {e}")
-                            permit[col] = []
-                    else:
-                        permit[col] = []
-                else:
-                    permit[col] = str(value).strip() if value else ""
+                permit[col] = str(value).strip() if value else ""
 
         permits.append(permit)
 
@@ -67,6 +67,11 @@ def convert_csv_to_json(csv_path, json_path):
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(permits, f, indent=2, ensure_ascii=False)
 
+    if warnings:
+        report_path = write_parse_report(warnings)
+        print(f"  ⚠️  {len(warnings)} cells could not be parsed (details in {report_path})")
+    print(f"  - Parsed fields: {cache.hits} rows from cache, {cache.misses} parsed")
+
     print(f"✅ Conversion complete!")
     print(f"  - Converted {len(permits)} permits")
     print(f"  - Output file: {json_path}")
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Build benchmarks on synthetic data
+# Usage: scripts/run_benchmarks.sh [sizes]   e.g. scripts/run_benchmarks.sh 1000,10000,100000,1000000
+
+SIZES="${1:-1000,10000}"
+
+echo "⏱️  Running build benchmarks (sizes: $SIZES)..."
+
+BENCH_SIZES="$SIZES" pytest tests/benchmarks/ \
+  -m benchmark \
+  -n 0 \
+  -q \
+  --html=benchmark-report.html \
+  --self-contained-html
+
+python3 tests/benchmarks/scaling_report.py
+
+echo "✅ Benchmarks complete! Results: .build_cache/benchmarks/results.jsonl"
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Sharded builds (--shard i/N) and the merge step
+
+Each shard loads the full dataset and computes every global index
+(categories, hubs, stats) exactly as a normal build does, but only renders
+the pages whose URL hashes to it. Shards write separate output trees
+(output-shard-<i>-of-<N>/ by default), each with:
+
+- the pages it owns
+- a sitemap.xml and data.json (search index) holding only its own entries
+- files every shard writes identically (robots.txt, static assets)
+- shard-manifest.json: shard number, and the global position of every
+  sitemap/search entry it kept
+
+The merge command copies all trees into one site, verifies that files
+present in several trees are identical, and rebuilds sitemap.xml and
+data.json in the order an unsharded build would have written them.
+
+Usage:
+    python generator.py --shard 1/4            # on machine 1 (2/4, 3/4, 4/4 elsewhere)
+    python sharding.py merge output-shard-*-of-4 --output output
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import filecmp
+import hashlib
+import argparse
+from datetime import datetime
+
+
+MANIFEST_NAME = 'shard-manifest.json'
+MERGED_MANIFEST_NAME = 'build-manifest.json'
+
+# Files each shard writes partially, and how the merge step combines them
+MERGED_FILES = {
+    'sitemap.xml': 'sitemap',
+    'data.json': 'search',
+}
+
+URL_BLOCK = re.compile(r'[ \t]*<url>.*?</url>', re.DOTALL)
+
+
+def shard_of(url, count):
+    """Stable shard number (1-based) for a page URL."""
+    digest = hashlib.sha1(url.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+class Shard:
+    """One slice of a sharded build"""
+
+    def __init__(self, index, count):
+        """
+        Args:
+            index: Shard number, 1..count
+            count: Total number of shards
+        """
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Invalid shard {index}/{count}")
+        self.index = index
+        self.count = count
+        self.positions = {}
+        self._seen = {}
+
+    @classmethod
+    def parse(cls, value):
+        """Parse 'i/N' (e.g. '2/4'); returns None for None or ''."""
+        if not value:
+            return None
+        match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', value)
+        if not match:
+            raise ValueError(f"Expected --shard i/N, got {value!r}")
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    def __str__(self):
+        return f'{self.index}/{self.count}'
+
+    def default_output_dir(self, base='output'):
+        return f'{base}-shard-{self.index}-of-{self.count}'
+
+    def owns(self, url):
+        """True when the page at `url` is rendered by this shard."""
+        return shard_of(url, self.count) == self.index
+
+    def keep(self, kind, entries, url_of):
+        """
+        Filter index entries (sitemap URLs, search records) to this shard
+
+        Records the global position of every kept entry so the merge step can
+        restore the unsharded order. Calls for the same kind continue the
+        numbering, so a sitemap built in sections can be filtered section by
+        section.
+
+        Args:
+            kind: 'sitemap' or 'search'
+            entries: Entries in the order an unsharded build writes them
+            url_of: Function returning the page URL of an entry
+
+        Returns:
+            List of the entries this shard owns
+        """
+        offset = self._seen.get(kind, 0)
+        positions = self.positions.setdefault(kind, [])
+        kept = []
+        for position, entry in enumerate(entries, offset):
+            if self.owns(url_of(entry)):
+                positions.append(position)
+                kept.append(entry)
+        self._seen[kind] = offset + len(entries)
+        return kept
+
+    def write_manifest(self, output_dir, build_name):
+        """Write shard-manifest.json at the root of the shard's output tree."""
+        manifest = {
+            'build': build_name,
+            'shard': self.index,
+            'count': self.count,
+            'generated_at': datetime.now().isoformat(),
+            'positions': self.positions,
+        }
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        return path
+
+
+def keep_all(shard, kind, entries, url_of):
+    """Shard.keep() that passes everything through for unsharded builds."""
+    entries = list(entries)
+    if shard is None:
+        return entries
+    return shard.keep(kind, entries, url_of)
+
+
+def load_manifest(tree):
+    path = os.path.join(tree, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"{tree} is not a shard output tree (no {MANIFEST_NAME})")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_shards(manifests):
+    """Make sure the trees are exactly shards 1..N of one build."""
+    builds = {m['build'] for m in manifests}
+    counts = {m['count'] for m in manifests}
+    if len(builds) != 1 or len(counts) != 1:
+        raise ValueError(f"Trees come from different builds or shard counts: {sorted(builds)} {sorted(counts)}")
+    count = counts.pop()
+    found = sorted(m['shard'] for m in manifests)
+    if found != list(range(1, count + 1)):
+        raise ValueError(f"Expected shards 1..{count}, got {found}")
+
+
+def merge_sitemaps(parts):
+    """
+    Combine per-shard sitemaps
+
+    Args:
+        parts: List of (sitemap text, positions) per shard
+
+    Returns:
+        Sitemap text with every <url> block in global position order
+    """
+    header = footer = None
+    blocks = []
+    for text, positions in parts:
+        matches = list(URL_BLOCK.finditer(text))
+        if len(matches) != len(positions):
+            raise ValueError("Sitemap entries do not match the shard manifest")
+        if matches and header is None:
+            header = text[:matches[0].start()]
+            footer = text[matches[-1].end():]
+        blocks.extend(zip(positions, (m.group(0) for m in matches)))
+
+    if header is None:
+        # No shard had any entries; every shard wrote the same empty sitemap
+        return parts[0][0]
+
+    blocks.sort(key=lambda block: block[0])
+    return header + '\n'.join(block for _, block in blocks) + footer
+
+
+def merge_search(parts):
+    """
+    Combine per-shard data.json search shards
+
+    Args:
+        parts: List of (data.json dict, positions) per shard
+
+    Returns:
+        data.json dict with permits in global position order
+    """
+    records = []
+    for data, positions in parts:
+        if len(data['permits']) != len(positions):
+            raise ValueError("data.json entries do not match the shard manifest")
+        records.extend(zip(positions, data['permits']))
+    records.sort(key=lambda record: record[0])
+
+    permits = [permit for _, permit in records]
+    merged = {
+        'generated_at': max(data['generated_at'] for data, _ in parts),
+        'total_permits': len(permits),
+    }
+    # Computed from every permit, so each shard holds the same summary
+    if parts and 'permit_types' in parts[0][0]:
+        merged['permit_types'] = parts[0][0]['permit_types']
+    merged['permits'] = permits
+    return merged
+
+
+def merge_trees(trees, output_dir):
+    """
+    Merge shard output trees into one site
+
+    Args:
+        trees: Shard output directories (any order)
+        output_dir: Destination (must not exist or be empty)
+
+    Returns:
+        Dictionary with the merged build manifest; 'conflicts' lists files
+        that differ between shards (the merge is inconsistent if non-empty)
+    """
+    manifests = [load_manifest(tree) for tree in trees]
+    check_shards(manifests)
+    ordered = sorted(zip(manifests, trees), key=lambda pair: pair[0]['shard'])
+
+    os.makedirs(output_dir, exist_ok=True)
+    if os.listdir(output_dir):
+        raise ValueError(f"Output directory is not empty: {output_dir}")
+
+    special = set(MERGED_FILES) | {MANIFEST_NAME}
+    conflicts = []
+    files = 0
+    pages = {}
+
+    for manifest, tree in ordered:
+        pages[manifest['shard']] = 0
+        for root, _, filenames in os.walk(tree):
+            rel_root = os.path.relpath(root, tree)
+            dest_root = os.path.join(output_dir, rel_root)
+            os.makedirs(dest_root, exist_ok=True)
+            for filename in filenames:
+                rel_path = os.path.normpath(os.path.join(rel_root, filename))
+                if rel_path in special:
+                    continue
+                src = os.path.join(root, filename)
+                dest = os.path.join(dest_root, filename)
+                if os.path.exists(dest):
+                    # Shared files (robots.txt, static assets) must be identical
+                    if not filecmp.cmp(src, dest, shallow=False):
+                        conflicts.append(rel_path)
+                    continue
+                shutil.copy2(src, dest)
+                files += 1
+                if filename.endswith('.html'):
+                    pages[manifest['shard']] += 1
+
+    for filename, kind in MERGED_FILES.items():
+        paths = [(os.path.join(tree, filename), manifest) for manifest, tree in ordered]
+        present = [(path, manifest) for path, manifest in paths if os.path.exists(path)]
+        if not present:
+            continue
+        if len(present) != len(paths):
+            raise ValueError(f"{filename} is missing from some shards")
+
+        dest = os.path.join(output_dir, filename)
+        if kind == 'sitemap':
+            parts = []
+            for path, manifest in present:
+                with open(path, 'r', encoding='utf-8') as f:
+                    parts.append((f.read(), manifest['positions'].get(kind, [])))
+            with open(dest, 'w', encoding='utf-8') as f:
+                f.write(merge_sitemaps(parts))
+        else:
+            parts = []
+            for path, manifest in present:
+                with open(path, 'r', encoding='utf-8') as f:
+                    parts.append((json.load(f), manifest['positions'].get(kind, [])))
+            with open(dest, 'w', encoding='utf-8') as f:
+                json.dump(merge_search(parts), f, indent=2, ensure_ascii=False)
+        files += 1
+
+    merged = {
+        'build': ordered[0][0]['build'],
+        'shards': len(ordered),
+        'merged_at': datetime.now().isoformat(),
+        'files': files,
+        'pages': sum(pages.values()),
+        'pages_per_shard': pages,
+        'conflicts': conflicts,
+    }
+    with open(os.path.join(output_dir, MERGED_MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2)
+    return merged
+
+
+def main():
+    """Command line interface: merge"""
+    parser = argparse.ArgumentParser(description='Sharded build tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    merge = subparsers.add_parser('merge', help='Merge shard output trees into one site')
+    merge.add_argument('trees', nargs='+', help='Shard output directories')
+    merge.add_argument('--output', default='output', help='Merged site directory (default: %(default)s)')
+    merge.add_argument('--force', action='store_true', help='Replace an existing output directory')
+    args = parser.parse_args()
+
+    if args.force and os.path.exists(args.output):
+        shutil.rmtree(args.output)
+
+    try:
+        merged = merge_trees(args.trees, args.output)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+
+    print(f"✓ Merged {merged['shards']} shards into {args.output}/")
+    for shard, count in merged['pages_per_shard'].items():
+        print(f"  - shard {shard}: {count} pages")
+    print(f"  - {merged['files']} files, {merged['pages']} pages")
+
+    if merged['conflicts']:
+        print(f"✗ {len(merged['conflicts'])} files differ between shards:")
+        for path in merged['conflicts']:
+            print(f"  - {path}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Read-only dataset shared with worker processes through a memory-mapped file
+
+Handing records to a process pool normally pickles every record into every
+task, so fan-out costs CPU and memory in proportion to record size. A
+SharedDataset is written once: records are serialized back to back into a
+single file, followed by an offset index keyed by record id. Workers
+attach() to the file, which maps it read-only; the operating system shares
+the mapped pages between all processes, and tasks only carry record ids.
+
+File layout:
+    header   magic (8 bytes), index offset (u64), index length (u64)
+    records  UTF-8 JSON texts, back to back
+    index    JSON object: id -> [offset, length]
+
+Record ids are compared as strings.
+"""
+
+import os
+import json
+import mmap
+import struct
+
+
+MAGIC = b'SHDS0001'
+HEADER = struct.Struct('<8sQQ')
+
+
+class SharedDataset:
+    """Records in a memory-mapped file, fetched by id"""
+
+    def __init__(self, path, index, buffer, handle):
+        self.path = path
+        self.index = index
+        self._buffer = buffer
+        self._handle = handle
+
+    @classmethod
+    def publish(cls, records, path, key='id'):
+        """
+        Write records to `path` (atomically) and attach to the result
+
+        Args:
+            records: Iterable of JSON-serialisable dicts (pass references,
+                such as a ContentHandle.span(), rather than large values
+                the workers can read elsewhere)
+            path: Dataset file to create
+            key: Field holding each record's id
+
+        Returns:
+            SharedDataset attached to the new file
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        index = {}
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 0, 0))
+            for record in records:
+                data = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                index[str(record[key])] = (f.tell(), len(data))
+                f.write(data)
+            index_offset = f.tell()
+            index_data = json.dumps(index).encode('utf-8')
+            f.write(index_data)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, index_offset, len(index_data)))
+        os.replace(tmp_path, path)
+        return cls.attach(path)
+
+    @classmethod
+    def attach(cls, path):
+        """Map an existing dataset file read-only (call once per worker)."""
+        handle = open(path, 'rb')
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            buffer.close()
+            handle.close()
+            raise ValueError(f"{path} is not a shared dataset")
+        index = {
+            record_id: tuple(entry)
+            for record_id, entry in json.loads(buffer[index_offset:index_offset + index_length]).items()
+        }
+        return cls(path, index, buffer, handle)
+
+    def raw(self, record_id):
+        """The serialized record as a memoryview into the mapping (no copy)."""
+        offset, length = self.index[str(record_id)]
+        return memoryview(self._buffer)[offset:offset + length]
+
+    def get(self, record_id):
+        """Decode one record."""
+        offset, length = self.index[str(record_id)]
+        return json.loads(self._buffer[offset:offset + length])
+
+    def ids(self):
+        return list(self.index)
+
+    def __contains__(self, record_id):
+        return str(record_id) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._handle.close()
+            self._buffer = self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
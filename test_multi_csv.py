@@ -50,14 +50,8 @@ EXTRA Dept,Extra State Dept,Extra Columns Test,500,6 hours,Statewide (Extra Stat
     print("\n" + "="*60)
     print("TO TEST:")
     print("="*60)
-    print("# Backup current data")
-    print("mv data data_backup\n")
-    print("# Test with problematic files (should show errors)")
-    print("mv data_test data")
-    print("python3 generator.py\n")
-    print("# Restore")
-    print("mv data data_test")
-    print("mv data_backup data")
+    print("# Validate the test files (errors are listed with file and line)")
+    print("python3 permit_ingest.py data_test")
     print("="*60)
 
 if __name__ == "__main__":
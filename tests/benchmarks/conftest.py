@@ -0,0 +1,108 @@
+"""
+Fixtures for the build benchmarks
+
+Benchmarks are opt-in: they only run when BENCH_SIZES is set (see
+scripts/run_benchmarks.sh), e.g.
+
+    BENCH_SIZES=1000,10000 pytest tests/benchmarks -n 0
+
+Every measured phase is appended to .build_cache/benchmarks/results.jsonl
+(override with BENCH_RESULTS) together with the git commit, so scaling
+curves can be compared across commits with tests/benchmarks/scaling_report.py.
+"""
+
+import os
+import json
+import time
+import platform
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pytest
+
+from synthetic_data import ensure_dataset
+
+
+RESULTS_PATH = os.getenv('BENCH_RESULTS', os.path.join('.build_cache', 'benchmarks', 'results.jsonl'))
+
+
+def bench_sizes():
+    return [int(size) for size in os.getenv('BENCH_SIZES', '').split(',') if size.strip()]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pytest_collection_modifyitems(config, items):
+    if bench_sizes():
+        return
+    skip = pytest.mark.skip(reason='benchmarks run only with BENCH_SIZES set')
+    for item in items:
+        if 'benchmarks' in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope='module', params=bench_sizes() or [1000], ids=lambda size: f'{size}')
+def size(request):
+    """Dataset size (records) for this benchmark module run."""
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def article_data_dir(size):
+    """Directory of synthetic article JSON files (cached across runs)."""
+    return ensure_dataset('articles', size)
+
+
+@pytest.fixture(scope='module')
+def permit_data_dir(size):
+    """Directory of synthetic permit CSV files (cached across runs)."""
+    return ensure_dataset('permits', size, fmt='csv')
+
+
+@pytest.fixture(scope='session')
+def bench():
+    """
+    Time one build phase and store the result
+
+    Usage:
+        result = bench('render', 'articles', size, fn, *args, **kwargs)
+
+    The phase runs once with its output discarded (the generators print a
+    line per page). Returns whatever fn returns.
+    """
+    commit = git_commit()
+    os.makedirs(os.path.dirname(RESULTS_PATH) or '.', exist_ok=True)
+
+    def run(phase, dataset, size, fn, *args, **kwargs):
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            result = fn(*args, **kwargs)
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+
+        record = {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'dataset': dataset,
+            'phase': phase,
+            'size': size,
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'records_per_second': round(size / wall, 1) if wall and size else None,
+        }
+        with open(RESULTS_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        return result
+
+    return run
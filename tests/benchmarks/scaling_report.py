@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Print scaling curves from the benchmark results
+
+For each dataset and phase, shows the latest wall time per dataset size for
+the most recent commits, so a change in how a phase scales is visible at a
+glance.
+
+Usage:
+    python tests/benchmarks/scaling_report.py [--results PATH] [--commits 3]
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import OrderedDict
+
+
+DEFAULT_RESULTS = os.getenv('BENCH_RESULTS', os.path.join('.build_cache', 'benchmarks', 'results.jsonl'))
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_by_commit(results, commits):
+    """{(dataset, phase): {commit: {size: wall_seconds}}} for the last N commits."""
+    recent = list(OrderedDict.fromkeys(r['commit'] for r in results))[-commits:]
+    curves = {}
+    for record in results:
+        if record['commit'] not in recent:
+            continue
+        key = (record['dataset'], record['phase'])
+        # Later runs of the same commit and size replace earlier ones
+        curves.setdefault(key, {}).setdefault(record['commit'], {})[record['size']] = record['wall_seconds']
+    return recent, curves
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scaling report')
+    parser.add_argument('--results', default=DEFAULT_RESULTS)
+    parser.add_argument('--commits', type=int, default=3, help='Most recent commits to show')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.results):
+        print(f"✗ No benchmark results at {args.results}")
+        print("  Run: scripts/run_benchmarks.sh")
+        return 1
+
+    results = load_results(args.results)
+    commits, curves = latest_by_commit(results, args.commits)
+    sizes = sorted({r['size'] for r in results})
+
+    print(f"{'dataset/phase':<28} {'commit':<10}" + ''.join(f'{size:>12,}' for size in sizes))
+    for (dataset, phase), by_commit in sorted(curves.items()):
+        for commit in commits:
+            if commit not in by_commit:
+                continue
+            row = by_commit[commit]
+            cells = ''.join(f"{row[size]:>11.3f}s" if size in row else f"{'-':>12}" for size in sizes)
+            print(f"{dataset + '/' + phase:<28} {str(commit):<10}{cells}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
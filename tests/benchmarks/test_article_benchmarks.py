@@ -0,0 +1,77 @@
+"""News123 build phases (generator.py) on synthetic article datasets"""
+
+import os
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+import validate_links
+from generator import (
+    calculate_stats,
+    generate_article_pages,
+    generate_category_pages,
+    generate_sitemap,
+    get_categories,
+    load_articles,
+)
+from html_minifier import MinifyReport
+
+pytestmark = pytest.mark.benchmark
+
+
+def build_index(articles):
+    """The indexing generate_site() does before rendering."""
+    categories = get_categories(articles)
+    stats = calculate_stats(articles, categories)
+    latest = sorted(articles, key=lambda a: a.get('published_date', ''), reverse=True)[:9]
+    return categories, stats, latest
+
+
+@pytest.fixture(scope='module')
+def articles(bench, size, article_data_dir):
+    return bench('load', 'articles', size, load_articles, article_data_dir)
+
+
+@pytest.fixture(scope='module')
+def article_index(bench, size, articles):
+    return bench('index', 'articles', size, build_index, articles)
+
+
+@pytest.fixture(scope='module')
+def article_site(bench, size, articles, article_index, tmp_path_factory):
+    output_dir = str(tmp_path_factory.mktemp('articles-output'))
+    categories = article_index[0]
+
+    def render():
+        env = Environment(loader=FileSystemLoader('templates'))
+        minify_report = MinifyReport()
+        generate_article_pages(env, articles, output_dir, {}, {}, minify_report)
+        generate_category_pages(env, categories, output_dir, minify_report)
+
+    bench('render', 'articles', size, render)
+    return output_dir
+
+
+def test_load(articles, size):
+    assert len(articles) == size
+
+
+def test_index(article_index, size):
+    categories, stats, _ = article_index
+    assert sum(c['article_count'] for c in categories) == size
+    assert stats['total_articles'] == size
+
+
+def test_render(article_site):
+    assert os.path.exists(os.path.join(article_site, 'category', 'technology', 'index.html'))
+
+
+def test_sitemap(bench, size, articles, article_index, article_site):
+    bench('sitemap', 'articles', size, generate_sitemap, articles, article_index[0], article_site)
+    assert os.path.getsize(os.path.join(article_site, 'sitemap.xml')) > 0
+
+
+def test_link_validation(bench, size, article_site):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(validate_links, 'OUTPUT_DIR', article_site)
+        bench('link_validation', 'articles', size, validate_links.validate_local_links)
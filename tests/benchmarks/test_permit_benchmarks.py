@@ -0,0 +1,68 @@
+"""PermitIndex build phases (generator_v1_backup.py) on synthetic permit datasets"""
+
+import os
+
+import pytest
+
+import validate_links
+from generator_v1_backup import SiteGenerator
+
+pytestmark = pytest.mark.benchmark
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def site_generator(permit_data_dir, tmp_path_factory):
+    generator = SiteGenerator(base_dir=REPO_DIR)
+    generator.data_dir = permit_data_dir
+    generator.output_dir = str(tmp_path_factory.mktemp('permits-output'))
+    return generator
+
+
+@pytest.fixture(scope='module')
+def permits_df(bench, size, site_generator):
+    # Synthetic permits repeat agency/type/location keys: report, don't exit
+    return bench('load', 'permits', size, site_generator.load_data, site_generator.data_dir, strict=False)
+
+
+@pytest.fixture(scope='module')
+def permit_site(bench, size, site_generator, permits_df):
+    def render():
+        site_generator.generate_homepage(permits_df)
+        site_generator.generate_states_page(permits_df)
+        site_generator.generate_state_hubs(permits_df)
+        site_generator.generate_city_hubs(permits_df)
+        site_generator.generate_facet_pages(permits_df)
+        site_generator.generate_permits_index(permits_df)
+        site_generator.generate_permit_type_hubs(permits_df)
+        site_generator.generate_jurisdiction_hubs(permits_df)
+        site_generator.generate_transaction_pages(permits_df)
+
+    bench('render', 'permits', size, render)
+    return site_generator.output_dir
+
+
+def test_load(permits_df, size):
+    assert len(permits_df) == size
+    assert len(permits_df.columns) == 29
+
+
+def test_render(permit_site):
+    assert os.path.exists(os.path.join(permit_site, 'index.html'))
+
+
+def test_sitemap(bench, size, site_generator, permits_df, permit_site):
+    bench('sitemap', 'permits', size, site_generator.generate_sitemap, permits_df)
+    assert os.path.exists(os.path.join(permit_site, 'sitemap.xml'))
+
+
+def test_search_index(bench, size, site_generator, permits_df, permit_site):
+    bench('search_index', 'permits', size, site_generator.generate_data_json, permits_df)
+    assert os.path.exists(os.path.join(permit_site, 'data.json'))
+
+
+def test_link_validation(bench, size, permit_site):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(validate_links, 'OUTPUT_DIR', permit_site)
+        bench('link_validation', 'permits', size, validate_links.validate_local_links)
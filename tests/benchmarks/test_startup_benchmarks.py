@@ -0,0 +1,50 @@
+"""Cold start of the build entry points (a fresh interpreter per measurement)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = ('pandas', 'numpy', 'playwright')
+
+# Interpreter start plus module import; fails the benchmark when exceeded
+COLD_START_BUDGET_SECONDS = 0.5
+
+
+def cold_import(module):
+    """
+    Import `module` in a new interpreter with -X importtime
+
+    Returns:
+        (import seconds reported by the interpreter, top-level packages loaded)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    packages = set()
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        packages.add(name.strip().split('.')[0])
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1e6, packages
+
+
+@pytest.mark.parametrize('module', ['generator', 'generator_v1_backup', 'dev_server'])
+def test_cold_start(bench, module):
+    # Startup does not depend on the dataset; recorded with size 0
+    import_seconds, packages = bench(f'import:{module}', 'startup', 0, cold_import, module)
+
+    assert not packages & set(HEAVY_MODULES), f"{module} imports {sorted(packages & set(HEAVY_MODULES))}"
+    assert import_seconds < COLD_START_BUDGET_SECONDS
@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.fixture
+def permits():
+    """Five normalized permits: Austin (2), Dallas, Fresno and statewide Texas"""
+    pd = pytest.importorskip('pandas')
+    from permit_fields import normalize_permits
+
+    return normalize_permits(pd.DataFrame({
+        'agency_short': ['City of Austin', 'City of Dallas', 'City of Fresno', 'TX Comptroller', 'City of Austin'],
+        'agency_full': ['Austin BL', 'Dallas BL', 'Fresno BL', 'Texas Comptroller', 'Austin BL'],
+        'request_type': ['Business License', 'Business License', 'Business License', 'Sales Tax Permit',
+                         'Sign Permit'],
+        'location_applicability': ['Austin, Texas', 'Dallas, Texas', 'Fresno, California', 'Statewide in Texas',
+                                   'Austin, Texas'],
+        'processing_time': ['1 week', '2 weeks', '1 week', '1 day', '3 days'],
+        'cost': ['50-150', '100', 'Varies', 'Free', '25'],
+        'online_available': ['Yes', 'No', 'Yes', 'Yes', 'No'],
+        'api_available': ['No', 'No', 'Yes', 'Yes', 'No'],
+    }))
+
+
+@pytest.fixture
+def make_articles():
+    """Factory of `count` article records, with quotes, braces and non-ASCII text"""
+    def make(count):
+        return [
+            {
+                'id': f'a{i}',
+                'title': f'Story [{i}] with "quotes" and ünïcode',
+                'slug': f'story-{i}',
+                'category': 'Technology' if i % 2 else 'Business',
+                'category_slug': 'technology' if i % 2 else 'business',
+                'excerpt': 'Short, {braced} excerpt',
+                'content': '<p>' + 'x' * (200 + i) + '</p>',
+                'author': 'Sam Lee',
+                'published_date': f'2024-11-{i % 28 + 1:02d}',
+                'source': 'Tech Daily',
+                'reading_time': i,
+            }
+            for i in range(count)
+        ]
+
+    return make
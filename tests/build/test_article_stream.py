@@ -0,0 +1,67 @@
+import filecmp
+import json
+import os
+
+import pytest
+
+from article_stream import ArticleStream, RECORD_OVERHEAD, iter_json_records, parse_size
+from generator import generate_site, load_articles, prepare_article
+
+
+def test_records_decode_across_buffer_boundaries(tmp_path, make_articles):
+    """Tiny read buffers split records, strings and numbers anywhere"""
+    articles = make_articles(12)
+    path = tmp_path / 'articles.json'
+    path.write_text(json.dumps(articles, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    for buffer_size in (7, 64, 4096):
+        assert [r for r, _ in iter_json_records(str(path), buffer_size)] == articles
+
+    single = tmp_path / 'single.json'
+    single.write_text(json.dumps(articles[0]), encoding='utf-8')
+    assert [r for r, _ in iter_json_records(str(single), 5)] == [articles[0]]
+
+
+def test_chunks_stay_within_budget(tmp_path, make_articles):
+    """Full articles come in chunks under the budget; scan keeps listing fields only"""
+    (tmp_path / 'articles.json').write_text(json.dumps(make_articles(40)), encoding='utf-8')
+    budget = 4 * (RECORD_OVERHEAD + 400)
+    stream = ArticleStream(str(tmp_path), budget=budget)
+
+    listings = stream.scan()
+    assert len(listings) == 40
+    assert 'content' not in listings[0] and listings[0]['title'].startswith('Story [0]')
+
+    chunks = list(stream.chunks())
+    assert sum(len(chunk) for chunk in chunks) == 40
+    assert len(chunks) > 1
+    assert max(stream.chunk_sizes) <= budget
+
+    assert [a['id'] for chunk in stream.chunks({'a3', 'a7'}) for a in chunk] == ['a3', 'a7']
+
+
+def test_streaming_build_matches_normal_build(tmp_path, make_articles):
+    """--stream writes the same pages as an in-memory build"""
+    data_dir = tmp_path / 'articles'
+    data_dir.mkdir()
+    (data_dir / 'articles.json').write_text(json.dumps(make_articles(10)), encoding='utf-8')
+    targets = ['render:index.html', 'render:article_page.html', 'render:category_page.html', 'sitemap']
+
+    generate_site(load_articles(str(data_dir)), str(tmp_path / 'normal'), targets=targets, jobs=1)
+    stream = ArticleStream(str(data_dir), budget=8 * 1024, prepare=prepare_article)
+    generate_site(stream.scan(), str(tmp_path / 'stream'), targets=targets, jobs=1, stream=stream)
+
+    assert len(stream.chunk_sizes) > 1
+    for root, _, files in os.walk(tmp_path / 'normal'):
+        for filename in files:
+            path = os.path.join(root, filename)
+            other = os.path.join(tmp_path / 'stream', os.path.relpath(path, tmp_path / 'normal'))
+            assert filecmp.cmp(path, other, shallow=False), path
+
+
+def test_parse_size():
+    assert parse_size('64MB') == 64 * 1024 * 1024
+    assert parse_size('512k') == 512 * 1024
+    assert parse_size('1000') == 1000
+    with pytest.raises(ValueError):
+        parse_size('lots')
@@ -0,0 +1,70 @@
+import os
+import pytest
+
+pytest.importorskip('PIL')
+
+from PIL import Image
+from brand_assets import render_assets
+
+DRAWN_SIZES = []
+
+
+def draw_square(size):
+    """Test drawing function that records the size it was asked for"""
+    DRAWN_SIZES.append(size)
+    return Image.new('RGBA', (size, size), '#003366')
+
+
+def make_asset(tmp_path, sizes):
+    return {
+        'name': 'test-icon',
+        'renderer': 'draw',
+        'draw': draw_square,
+        'outputs': {str(tmp_path / f'icon-{size}.png'): size for size in sizes},
+        'ico': {'path': str(tmp_path / 'favicon.ico'), 'sizes': [16, 32]},
+    }
+
+
+def test_rasterizes_once_and_downscales(tmp_path):
+    """The source is drawn once at the largest size; other sizes are derived"""
+    DRAWN_SIZES.clear()
+    asset = make_asset(tmp_path, [16, 180, 512])
+    results = render_assets([asset], manifest_path=str(tmp_path / 'manifest.json'), workers=1)
+
+    assert results['test-icon']['status'] == 'rendered'
+    assert DRAWN_SIZES == [512]
+    for size in (16, 180, 512):
+        with Image.open(tmp_path / f'icon-{size}.png') as img:
+            assert img.size == (size, size)
+    assert os.path.exists(tmp_path / 'favicon.ico')
+
+
+def test_skips_unchanged_assets(tmp_path):
+    """Same source and sizes -> no work; changed sizes or touched files -> re-render"""
+    manifest = str(tmp_path / 'manifest.json')
+    render_assets([make_asset(tmp_path, [16, 64])], manifest_path=manifest, workers=1)
+
+    DRAWN_SIZES.clear()
+    results = render_assets([make_asset(tmp_path, [16, 64])], manifest_path=manifest, workers=1)
+    assert results['test-icon']['status'] == 'skipped'
+    assert DRAWN_SIZES == []
+
+    results = render_assets([make_asset(tmp_path, [16, 128])], manifest_path=manifest, workers=1)
+    assert results['test-icon']['status'] == 'rendered'
+
+    os.remove(tmp_path / 'icon-16.png')
+    results = render_assets([make_asset(tmp_path, [16, 128])], manifest_path=manifest, workers=1)
+    assert results['test-icon']['status'] == 'rendered'
+
+
+def test_independent_assets_render_in_parallel(tmp_path):
+    """Several assets go through the process pool and all succeed"""
+    assets = []
+    for name in ('a', 'b', 'c'):
+        asset = make_asset(tmp_path / name, [32, 64])
+        asset['name'] = name
+        assets.append(asset)
+
+    results = render_assets(assets, manifest_path=str(tmp_path / 'manifest.json'), workers=3)
+    assert {r['status'] for r in results.values()} == {'rendered'}
+    assert os.path.exists(tmp_path / 'c' / 'icon-64.png')
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from build_dag import BuildGraph
+from build_telemetry import BuildTelemetry
+
+
+def site_graph(calls):
+    """load -> (homepage, sitemap); robots has no inputs"""
+    graph = BuildGraph('news')
+
+    def task(name, result=None):
+        def run(*args):
+            calls.append((name, args))
+            return result
+        return run
+
+    graph.add('load', task('load', ['a', 'b']))
+    graph.add('homepage', task('homepage'), inputs=['load'], outputs=['index.html'])
+    graph.add('sitemap', task('sitemap', 'sitemap.xml'), inputs=['load'], outputs=['sitemap.xml'])
+    graph.add('robots', task('robots'), outputs=['robots.txt'])
+    return graph
+
+
+def test_target_builds_only_its_dependencies():
+    """--target sitemap runs load and sitemap, passing load's result in"""
+    calls = []
+    graph = site_graph(calls)
+
+    assert graph.plan(['sitemap']) == ['load', 'sitemap']
+    results = graph.run(['sitemap'], jobs=1)
+
+    assert calls == [('load', ()), ('sitemap', (['a', 'b'],))]
+    assert results == {'load': ['a', 'b'], 'sitemap': 'sitemap.xml'}
+    assert set(graph.timings) == {'load', 'sitemap'}
+
+
+def test_invalid_graphs_and_targets_are_rejected():
+    """Unknown targets, unknown inputs, cycles and shared outputs raise ValueError"""
+    graph = site_graph([])
+    with pytest.raises(ValueError, match='Unknown build target'):
+        graph.plan(['feeds'])
+
+    graph.add('feeds', lambda: None, outputs=['sitemap.xml'])
+    with pytest.raises(ValueError, match='both write sitemap.xml'):
+        graph.plan()
+
+    cyclic = BuildGraph('news')
+    cyclic.add('a', lambda b: None, inputs=['b'])
+    cyclic.add('b', lambda a: None, inputs=['a'])
+    with pytest.raises(ValueError, match='Dependency cycle'):
+        cyclic.plan()
+
+
+def test_independent_tasks_run_concurrently(tmp_path):
+    """Tasks that share no inputs overlap; telemetry credits each its own files"""
+    telemetry = BuildTelemetry('news')
+    barrier = threading.Barrier(2, timeout=5)
+
+    def write(name):
+        def run():
+            # Both tasks must be running at the same time to pass the barrier
+            barrier.wait()
+            path = tmp_path / f'{name}.html'
+            path.write_text(name * 10)
+            telemetry.record_file(str(path), page=True)
+        return run
+
+    graph = BuildGraph('news')
+    graph.add('homepage', write('homepage'))
+    graph.add('hubs', write('hubs'))
+    graph.run(jobs=2, telemetry=telemetry)
+
+    report = telemetry.report()
+    assert report['phases']['homepage']['bytes_written'] == len('homepage') * 10
+    assert report['phases']['hubs']['bytes_written'] == len('hubs') * 10
+    assert report['pages'] == 2
+    assert graph.timings['homepage']['thread'] != graph.timings['hubs']['thread']
+
+
+def test_failed_task_stops_its_dependents():
+    """A failing task is re-raised and nothing that needs it runs"""
+    calls = []
+    graph = BuildGraph('permits')
+
+    def fail():
+        raise RuntimeError('CSV not found')
+
+    graph.add('load', fail)
+    graph.add('sitemap', lambda df: calls.append('sitemap'), inputs=['load'])
+    with pytest.raises(RuntimeError, match='CSV not found'):
+        graph.run(jobs=2)
+    assert calls == []
@@ -0,0 +1,56 @@
+import json
+import pstats
+
+from jinja2 import Environment, DictLoader
+
+from build_profiler import RenderProfiler
+
+
+def render(profiler, template, path, **context):
+    with profiler.page(template.name, str(path)) as timer:
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in timer.time_render(template.generate(**context)):
+                f.write(chunk)
+
+
+def test_ranks_templates_and_pages(tmp_path):
+    """Per-template totals are ranked and the slowest page is named"""
+    env = Environment(loader=DictLoader({
+        'big.html': '{% for i in range(n) %}<p>{{ i }}</p>{% endfor %}',
+        'small.html': '<p>{{ title }}</p>',
+    }))
+    profiler = RenderProfiler('news')
+    profiler.start()
+    render(profiler, env.get_template('big.html'), tmp_path / 'a.html', n=20000)
+    render(profiler, env.get_template('big.html'), tmp_path / 'b.html', n=10)
+    render(profiler, env.get_template('small.html'), tmp_path / 'c.html', title='hi')
+    profiler.stop()
+
+    summary = profiler.template_summary()
+    assert [entry['template'] for entry in summary] == ['big.html', 'small.html']
+    assert summary[0]['pages'] == 2
+    assert summary[0]['slowest_page'] == str(tmp_path / 'a.html')
+    assert profiler.slowest_pages(1)[0]['path'] == str(tmp_path / 'a.html')
+
+
+def test_export_writes_prof_and_speedscope(tmp_path):
+    """Exports load as pstats input and as a two-profile speedscope file"""
+    env = Environment(loader=DictLoader({'page.html': '<p>{{ title }}</p>'}))
+    profiler = RenderProfiler('permits')
+    profiler.start()
+    render(profiler, env.get_template('page.html'), tmp_path / 'page.html', title='hi')
+    profiler.stop()
+
+    prof_path, speedscope_path, pages_path = profiler.export(str(tmp_path / 'profile'))
+    assert pstats.Stats(prof_path).total_calls > 0
+
+    with open(speedscope_path, encoding='utf-8') as f:
+        document = json.load(f)
+    call_tree, timeline = document['profiles']
+    frame_count = len(document['shared']['frames'])
+    assert len(call_tree['samples']) == len(call_tree['weights']) > 0
+    assert all(0 <= index < frame_count for stack in call_tree['samples'] for index in stack)
+    assert [event['type'] for event in timeline['events']] == ['O', 'O', 'C', 'C']
+
+    with open(pages_path, encoding='utf-8') as f:
+        assert json.load(f)['templates'][0]['template'] == 'page.html'
@@ -0,0 +1,81 @@
+import json
+
+from build_telemetry import BuildTelemetry, compare_reports
+
+
+def test_phases_accumulate_pages_and_bytes(tmp_path):
+    """Each phase records its own wall/CPU time, pages and bytes"""
+    telemetry = BuildTelemetry('news')
+
+    with telemetry.phase('render:article_page.html'):
+        for i in range(3):
+            page = tmp_path / f'page{i}.html'
+            page.write_text('<p>hello</p>')
+            telemetry.record_file(str(page), page=True)
+
+    with telemetry.phase('sitemap'):
+        sitemap = tmp_path / 'sitemap.xml'
+        sitemap.write_text('<urlset></urlset>')
+        telemetry.record_file(str(sitemap))
+
+    report = telemetry.report()
+    render = report['phases']['render:article_page.html']
+    assert render['pages'] == 3
+    assert render['bytes_written'] == 3 * len('<p>hello</p>')
+    assert render['wall_seconds'] >= 0 and render['cpu_seconds'] >= 0
+    assert report['phases']['sitemap']['pages'] == 0
+    assert report['pages'] == 3
+    assert report['files_written'] == 4
+
+
+def test_unchanged_files_are_counted_as_skipped(tmp_path):
+    """Files the output writer skipped add pages but no writes or bytes"""
+    telemetry = BuildTelemetry('news')
+    page = tmp_path / 'page.html'
+    page.write_text('<p>hello</p>')
+
+    with telemetry.phase('render:article_page.html'):
+        telemetry.record_file(str(page), page=True)
+        telemetry.record_file(str(page), page=True, written=False)
+
+    report = telemetry.report()
+    render = report['phases']['render:article_page.html']
+    assert (render['pages'], render['files_skipped'], render['bytes_written']) == (2, 1, len('<p>hello</p>'))
+    assert (report['files_written'], report['files_skipped']) == (1, 1)
+
+
+def test_trace_memory_records_peaks(tmp_path):
+    """--trace-memory adds tracemalloc peaks to the phase and the report"""
+    telemetry = BuildTelemetry('permits', trace_memory=True)
+    with telemetry.phase('load'):
+        data = [bytes(1024) for _ in range(1000)]
+        del data
+
+    report = telemetry.report()
+    assert report['phases']['load']['peak_traced_bytes'] >= 1024 * 1000
+    assert report['peak_traced_bytes'] >= report['phases']['load']['peak_traced_bytes']
+
+    path = telemetry.write(str(tmp_path / 'permits.json'))
+    assert json.loads(open(path).read())['build'] == 'permits'
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Slower phases and lower throughput are flagged; noise is not"""
+    baseline = {
+        'wall_seconds': 10.0, 'cpu_seconds': 9.0, 'pages_per_second': 100.0,
+        'phases': {
+            'render:article_page.html': {'wall_seconds': 8.0, 'cpu_seconds': 7.5},
+            'robots': {'wall_seconds': 0.001, 'cpu_seconds': 0.001},
+        },
+    }
+    current = {
+        'wall_seconds': 10.5, 'cpu_seconds': 9.2, 'pages_per_second': 70.0,
+        'phases': {
+            'render:article_page.html': {'wall_seconds': 12.0, 'cpu_seconds': 7.6},
+            'robots': {'wall_seconds': 0.004, 'cpu_seconds': 0.004},
+        },
+    }
+
+    flagged = {r['metric'] for r in compare_reports(current, baseline, threshold=0.2)}
+    assert flagged == {'pages_per_second', 'render:article_page.html.wall_seconds'}
+    assert compare_reports(baseline, baseline) == []
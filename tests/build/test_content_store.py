@@ -0,0 +1,93 @@
+import filecmp
+import json
+import os
+
+from content_store import BlobReader, ContentHandle, ContentStore
+from generator import generate_site, load_articles
+from render_pool import _shared_page
+
+
+def test_bodies_are_appended_once_and_read_back(tmp_path):
+    """Unchanged bodies are reused across builds, changed ones appended"""
+    store = ContentStore(str(tmp_path))
+    handles = [store.put(f'a{i}', f'<p>body {i} ünïcode</p>') for i in range(3)]
+    assert str(handles[1]) == '<p>body 1 ünïcode</p>'
+    assert handles[2].__html__() == '<p>body 2 ünïcode</p>'
+    store.save()
+    store.close()
+
+    store = ContentStore(str(tmp_path))
+    store.put('a0', '<p>body 0 ünïcode</p>')
+    store.put('a1', '<p>edited</p>')
+    store.put('a2', '<p>body 2 ünïcode</p>')
+    assert (store.appended, store.reused) == (1, 2)
+    assert store.get('a1') == '<p>edited</p>'
+    assert store.get('a2') == '<p>body 2 ünïcode</p>'
+    size = os.path.getsize(store.blob_path)
+    store.save()
+    assert os.path.getsize(store.blob_path) == size
+
+    # Once superseded copies outweigh the live ones, save() compacts
+    for _ in range(4):
+        store.put('a1', '<p>edited again and again</p>' * 4)
+        store.put('a1', '<p>edited</p>')
+    store.save()
+    assert os.path.getsize(store.blob_path) == store.live_bytes()
+    assert [store.get(f'a{i}') for i in range(3)] == ['<p>body 0 ünïcode</p>', '<p>edited</p>', '<p>body 2 ünïcode</p>']
+    store.close()
+
+
+def test_deleted_articles_are_dropped_and_compacted(tmp_path):
+    """Ids not put by a build leave the index, and their bodies the blob"""
+    store = ContentStore(str(tmp_path))
+    for i in range(4):
+        store.put(f'a{i}', f'<p>body {i}</p>' * 10)
+    store.save()
+    store.close()
+
+    store = ContentStore(str(tmp_path))
+    store.put('a0', '<p>body 0</p>' * 10)
+    store.save()
+    assert list(store.index) == ['a0']
+    assert os.path.getsize(store.blob_path) == store.live_bytes()
+    store.close()
+    assert list(ContentStore(str(tmp_path)).index) == ['a0']
+
+
+def test_build_with_content_store_matches_in_memory_build(tmp_path, make_articles):
+    """Articles hold handles, and the pages match a build with bodies in memory"""
+    data_dir = tmp_path / 'articles'
+    data_dir.mkdir()
+    (data_dir / 'articles.json').write_text(json.dumps(make_articles(8)), encoding='utf-8')
+    targets = ['render:index.html', 'render:article_page.html', 'render:category_page.html']
+
+    generate_site(load_articles(str(data_dir)), str(tmp_path / 'memory'), targets=targets, jobs=1)
+    store = ContentStore(str(tmp_path / 'cache'))
+    articles = load_articles(str(data_dir), content_store=store)
+    assert all(isinstance(a['content'], ContentHandle) for a in articles)
+    generate_site(articles, str(tmp_path / 'store'), targets=targets, jobs=1)
+    generate_site(articles, str(tmp_path / 'pool'), targets=targets, jobs=1, render_workers=2)
+    store.close()
+
+    for root, _, files in os.walk(tmp_path / 'memory'):
+        for filename in files:
+            path = os.path.join(root, filename)
+            relative = os.path.relpath(path, tmp_path / 'memory')
+            assert filecmp.cmp(path, os.path.join(tmp_path / 'store', relative), shallow=False), path
+            assert filecmp.cmp(path, os.path.join(tmp_path / 'pool', relative), shallow=False), path
+
+
+def test_workers_get_body_positions_not_bodies(tmp_path):
+    """Shared page records point into the blob; a BlobReader reads the body back"""
+    store = ContentStore(str(tmp_path))
+    store.put('a0', '<p>first</p>')
+    article = {'id': 'a1', 'title': 'T', 'content': store.put('a1', '<p>ünïcode body</p>')}
+    blob_paths = set()
+    record = _shared_page({'article': article, 'related': []}, blob_paths)
+
+    assert 'content' not in record['article'] and 'body' not in json.dumps(record)
+    assert blob_paths == {store.blob_path}
+    reader = BlobReader(store.blob_path)
+    assert reader.read(*record['article']['content_span']) == '<p>ünïcode body</p>'
+    reader.close()
+    store.close()
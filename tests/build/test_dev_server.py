@@ -0,0 +1,141 @@
+import json
+import os
+import urllib.request
+
+import pytest
+
+import article_stream
+from dev_server import LISTING_FIELDS, SiteSession, SourceWatcher, start_server
+
+
+ARTICLES = [
+    {
+        'id': f'tech-{i}',
+        'title': f'Tech story {i}',
+        'slug': f'tech-story-{i}',
+        'category': 'Technology',
+        'category_slug': 'technology',
+        'excerpt': 'Excerpt',
+        'content': '<p>Body</p>',
+        'author': 'Sam Lee',
+        'published_date': f'2024-11-2{i}',
+        'source': 'Tech Daily',
+    }
+    for i in range(3)
+] + [
+    {
+        'id': 'sports-0',
+        'title': 'Sports story',
+        'slug': 'sports-story',
+        'category': 'Sports',
+        'category_slug': 'sports',
+        'excerpt': 'Excerpt',
+        'content': '<p>Body</p>',
+        'author': 'Alex Kim',
+        'published_date': '2024-11-10',
+        'source': 'Sports Central',
+    }
+]
+
+
+@pytest.fixture
+def session(tmp_path):
+    data_dir = tmp_path / 'articles'
+    data_dir.mkdir()
+    (data_dir / 'articles.json').write_text(json.dumps(ARTICLES))
+    session = SiteSession(data_dir=str(data_dir), output_dir=str(tmp_path / 'output'), jobs=1)
+    session.build()
+    return session
+
+
+def save(session, articles):
+    path = os.path.join(session.data_dir, 'articles.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(articles, f)
+    return path
+
+
+def read(session, *parts):
+    with open(os.path.join(session.output_dir, *parts), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_content_edit_renders_only_that_article(session):
+    """Fields not shown in listings only affect the article's own page"""
+    articles = json.loads(json.dumps(ARTICLES))
+    articles[0]['content'] = '<p>Corrected body</p>'
+    summary = session.update({save(session, articles)})
+
+    assert summary['changed'] == ['tech-0']
+    assert summary['pages'] == 1
+    assert 'Corrected body' in read(session, 'technology', 'tech-story-0', 'index.html')
+
+
+def test_title_edit_updates_listings_of_its_category(session):
+    """A new title reaches the homepage, category page and related cards, not other categories"""
+    articles = json.loads(json.dumps(ARTICLES))
+    articles[1]['title'] = 'Renamed story'
+    summary = session.update({save(session, articles)})
+
+    # homepage + 3 technology articles + technology category page
+    assert summary['pages'] == 5
+    assert 'Renamed story' in read(session, 'index.html')
+    assert 'Renamed story' in read(session, 'category', 'technology', 'index.html')
+    assert 'Renamed story' in read(session, 'technology', 'tech-story-0', 'index.html')
+
+
+def test_listing_fields_match_the_streamed_build():
+    """An image change re-renders listings, as a streamed build would"""
+    assert set(LISTING_FIELDS) >= set(article_stream.LISTING_FIELDS)
+
+
+def test_image_edit_updates_listings(session):
+    articles = json.loads(json.dumps(ARTICLES))
+    articles[2]['image_url'] = 'https://example.com/photo.jpg'
+    summary = session.update({save(session, articles)})
+
+    assert summary['changed'] == ['tech-2']
+    assert summary['pages'] == 5
+
+
+def test_moved_and_deleted_articles_lose_their_pages(session):
+    """Changing a slug or deleting an article removes the stale page"""
+    articles = json.loads(json.dumps(ARTICLES))
+    articles[0]['slug'] = 'new-slug'
+    del articles[3]
+    summary = session.update({save(session, articles)})
+
+    assert summary['removed'] == ['sports-0']
+    out = session.output_dir
+    assert not os.path.exists(os.path.join(out, 'technology', 'tech-story-0'))
+    assert os.path.exists(os.path.join(out, 'technology', 'new-slug', 'index.html'))
+    assert not os.path.exists(os.path.join(out, 'sports', 'sports-story'))
+    assert not os.path.exists(os.path.join(out, 'category', 'sports'))
+    assert 'new-slug' in read(session, 'sitemap.xml')
+
+
+def test_template_edit_renders_pages_that_include_it(session):
+    """An included component re-renders every page whose template pulls it in"""
+    assert session.templates_using({'article_page.html'}) == ['article_page.html']
+    assert set(session.templates_using({'components/footer.html'})) == {
+        'index.html', 'article_page.html', 'category_page.html'
+    }
+    summary = session.update({os.path.join('templates', 'components', 'footer.html')})
+    assert summary['pages'] == 1 + len(ARTICLES) + 2  # homepage, articles, 2 category pages
+
+
+def test_watcher_reports_changed_files_and_server_serves_output(session):
+    """The watcher sees edits; the HTTP server serves the output directory"""
+    watcher = SourceWatcher([session.data_dir])
+    assert watcher.poll() == set()
+    path = save(session, ARTICLES[:2])
+    assert watcher.poll() == {path}
+
+    server = start_server(session.output_dir, port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/sitemap.xml') as response:
+            assert b'<urlset' in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
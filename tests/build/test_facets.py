@@ -0,0 +1,48 @@
+import pytest
+
+from facets import FacetIndex, bitset, cost_band
+
+
+def test_conjunctive_select_and_count(permits):
+    facets = FacetIndex.from_permits(permits)
+    assert facets.ids(facets.select(state='texas', online=True)) == [0, 3]
+    assert facets.count(state='texas', cost='free') == 1
+    assert facets.count(state='texas', online=True, api=True) == 1
+    assert facets.count(city='texas/austin') == 2
+    assert facets.count(type=['sign-permit', 'sales-tax-permit']) == 2
+    assert facets.count(state='ohio', online=True) == 0
+    assert facets.count(bitset([1, 2, 4]), online=False) == 2
+
+
+def test_counts_within_filter(permits):
+    facets = FacetIndex.from_permits(permits)
+    assert facets.counts('cost', state='texas') == {'free': 1, 'under-100': 2, '100-500': 1}
+    assert facets.counts('city', state='texas') == {'texas/austin': 2, 'texas/dallas': 1, '': 1}
+
+
+@pytest.mark.parametrize('cost_max, band', [(0.0, 'free'), (100.0, 'under-100'), (101.0, '100-500'),
+                                            (5000.0, 'over-500'), (float('nan'), 'varies')])
+def test_cost_band(cost_max, band):
+    assert cost_band(cost_max) == band
+
+
+def test_bitset_round_trip():
+    ids = [0, 7, 8, 63, 64, 1000]
+    assert FacetIndex.ids(bitset(ids)) == ids
+    assert bitset([]) == 0 and FacetIndex.ids(0) == []
+
+
+def test_rare_values_are_kept_sparse():
+    facets = FacetIndex(1000)
+    facets.add_facet('city', [f'city-{i % 250}' for i in range(1000)])
+    facets.add_facet('online', [i % 2 == 0 for i in range(1000)])
+    assert not isinstance(facets.facets['city']['city-3'], int)
+    assert isinstance(facets.facets['online'][True], int)
+
+    assert facets.ids(facets.select(city='city-4', online=True)) == [4, 254, 504, 754]
+    assert facets.ids(facets.select(city=['city-1', 'city-2'])) == [1, 2, 251, 252, 501, 502, 751, 752]
+    assert facets.count(facets.select(city='city-4'), city=['city-4', 'city-5']) == 4
+    assert facets.count(bitset([4, 5, 254]), city='city-4') == 2
+    counts = facets.counts('city', online=True)
+    assert len(counts) == 125 and counts['city-0'] == 4 and 'city-1' not in counts
+    assert facets.counts('online', city='city-3') == {False: 4}
@@ -0,0 +1,109 @@
+import re
+import threading
+
+import pytest
+from html_minifier import FLUSH_SIZE, HTMLMinifier, MinifyReport, collapse_whitespace, minify_html
+
+SAMPLE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <!-- Primary Meta Tags -->
+    <title>News123   Home</title>
+    <!--[if lt IE 9]><script src="shim.js"></script><![endif]-->
+    <script type="application/ld+json">
+    {
+      "@context": "https://schema.org",
+      "headline": "Two  spaces   kept"
+    }
+    </script>
+</head>
+<body>
+    <main>
+        <p>Some    text
+           across lines</p>
+        <pre>
+  indented    code
+    stays</pre>
+        <textarea name="feedback">  keep   me  </textarea>
+    </main>
+</body>
+</html>"""
+
+
+def test_strips_comments_and_collapses_whitespace():
+    """Indentation collapses and ordinary comments are removed"""
+    html = minify_html(SAMPLE_PAGE)
+
+    assert 'Primary Meta Tags' not in html
+    assert '<title>News123 Home</title>' in html
+    assert '<p>Some text\nacross lines</p>' in html
+    assert '<body>\n<main>\n<p>' in html
+
+
+def test_preserves_pre_textarea_and_scripts():
+    """<pre>, <textarea>, JSON-LD and conditional comments pass through untouched"""
+    html = minify_html(SAMPLE_PAGE)
+
+    assert '<pre>\n  indented    code\n    stays</pre>' in html
+    assert '<textarea name="feedback">  keep   me  </textarea>' in html
+    assert '"headline": "Two  spaces   kept"\n    }\n    </script>' in html
+    assert '<!--[if lt IE 9]><script src="shim.js"></script><![endif]-->' in html
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+def test_output_independent_of_chunk_boundaries(chunk_size):
+    """Streaming in small chunks gives the same result as one pass"""
+    minifier = HTMLMinifier()
+    pieces = [minifier.feed(SAMPLE_PAGE[i:i + chunk_size])
+              for i in range(0, len(SAMPLE_PAGE), chunk_size)]
+    pieces.append(minifier.close())
+
+    assert ''.join(pieces) == minify_html(SAMPLE_PAGE)
+
+
+@pytest.mark.parametrize('chunk_size', [5, 333, FLUSH_SIZE + 1])
+def test_output_independent_of_flushes(chunk_size):
+    """Pages longer than FLUSH_SIZE are flushed in several passes with the same result"""
+    page = SAMPLE_PAGE * (3 * FLUSH_SIZE // len(SAMPLE_PAGE))
+    minifier = HTMLMinifier()
+    pieces = [minifier.feed(page[i:i + chunk_size]) for i in range(0, len(page), chunk_size)]
+    assert any(pieces)
+    pieces.append(minifier.close())
+
+    assert ''.join(pieces) == minify_html(page)
+
+
+def test_collapse_whitespace_runs():
+    """A run with a newline becomes one newline, any other run one space"""
+    text = 'a \t b\t\tc\td \n\t e\r\n\nf  g h\xa0\xa0i'
+    expected = re.sub(r'\s+', lambda m: '\n' if '\n' in m.group() else ' ', text)
+    assert collapse_whitespace(text) == expected == 'a b c d\ne\nf g h i'
+
+
+def test_report_tracks_bytes_per_template():
+    """MinifyReport accumulates pages and byte savings per template"""
+    report = MinifyReport()
+    for _ in range(2):
+        ''.join(report.stream('article_page.html', [SAMPLE_PAGE[:100], SAMPLE_PAGE[100:]]))
+
+    counts = report.to_dict()['article_page.html']
+    assert counts['pages'] == 2
+    assert counts['bytes_in'] == 2 * len(SAMPLE_PAGE.encode('utf-8'))
+    assert counts['bytes_saved'] > 0
+    assert report.bytes_saved == counts['bytes_saved']
+
+
+def test_report_counts_pages_from_threads():
+    """Concurrent streams all land in the counts"""
+    report = MinifyReport()
+
+    def render():
+        for _ in range(50):
+            ''.join(report.stream('article_page.html', [SAMPLE_PAGE]))
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert report.to_dict()['article_page.html']['pages'] == 200
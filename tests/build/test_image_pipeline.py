@@ -0,0 +1,69 @@
+import os
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from image_pipeline import build_responsive_images, build_variants, variant_widths
+
+
+@pytest.fixture
+def static_image(tmp_path):
+    """A 1600x900 PNG served at /img/hero.png"""
+    static_dir = tmp_path / 'static'
+    (static_dir / 'img').mkdir(parents=True)
+    Image.new('RGB', (1600, 900), '#1a1a2e').save(static_dir / 'img' / 'hero.png')
+    return static_dir
+
+
+def test_variant_widths_never_upscale():
+    """Widths above the intrinsic size are dropped"""
+    assert variant_widths(1600) == [480, 768, 1200]
+    assert variant_widths(600) == [480, 600]
+    assert variant_widths(300) == [300]
+
+
+def test_variants_cached_by_source_hash(static_image, tmp_path):
+    """The second run reuses the encoded variants"""
+    cache_dir = str(tmp_path / 'cache')
+    source = str(static_image / 'img' / 'hero.png')
+
+    first = build_variants(source, cache_dir)
+    second = build_variants(source, cache_dir)
+
+    assert first['cached'] is False
+    assert second['cached'] is True
+    assert [v['width'] for v in second['variants']] == [480, 768, 1200]
+    assert second['variants'][0]['height'] == 270
+
+
+def test_build_responsive_images_emits_srcset(static_image, tmp_path):
+    """Local images get srcset/sizes data; remote ones are skipped"""
+    output_dir = tmp_path / 'output'
+    images, stats = build_responsive_images(
+        ['/img/hero.png', 'https://example.com/remote.jpg'],
+        output_dir=str(output_dir),
+        cache_dir=str(tmp_path / 'cache'),
+        static_dir=str(static_image),
+    )
+
+    hero = images['/img/hero.png']
+    assert (hero['width'], hero['height']) == (1600, 900)
+    assert hero['srcset'].count('w, ') == 2
+    assert hero['sizes']
+    assert stats == {'images': 1, 'encoded': 1, 'cached': 0, 'skipped': 1}
+
+    for entry in hero['srcset'].split(', '):
+        url = entry.split()[0]
+        assert os.path.exists(os.path.join(output_dir, url.lstrip('/')))
+
+
+def test_relative_urls_are_published_at_the_site_root(static_image, tmp_path, monkeypatch):
+    """'static/...' paths get a root-relative src; files the site does not serve are skipped"""
+    monkeypatch.chdir(tmp_path)
+    Image.new('RGB', (800, 600)).save(tmp_path / 'draft.png')
+    images, stats = build_responsive_images(
+        ['static/img/hero.png', 'draft.png'], output_dir='output', cache_dir='cache', static_dir='static', workers=1,
+    )
+
+    assert images['static/img/hero.png']['src'] == '/img/hero.png'
+    assert 'draft.png' not in images and stats['skipped'] == 1
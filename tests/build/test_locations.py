@@ -0,0 +1,81 @@
+import pytest
+
+from locations import LocationIndex, LocationResolver, TokenTrie, load_gazetteer, tokenize
+from permit_fields import normalize_permits
+
+
+@pytest.mark.parametrize('text, state, city', [
+    ('Applies to all businesses operating within the city limits of Chandler, Arizona.', 'arizona', 'chandler'),
+    ('Applies to businesses operating within the City and County of Denver, Colorado.', 'colorado', 'denver'),
+    ('This business license applies to all businesses operating within the District of Columbia.',
+     'district-of-columbia', ''),
+    ('This transaction applies to businesses operating within New York City, New York.', 'new-york', 'new-york-city'),
+    ('Applies within the city limits of Virginia Beach, Virginia.', 'virginia', 'virginia-beach'),
+    ('Applies within the city limits of Kansas City, Missouri.', 'missouri', 'kansas-city'),
+    ('Applies within the Municipality of Anchorage city limits, Alaska.', 'alaska', 'anchorage'),
+    ('Applies within the city limits of St. Petersburg, Florida.', 'florida', 'st-petersburg'),
+    # Not in the gazetteer: taken from the words before the state
+    ('Applies within the city limits of Smallville, Kansas.', 'kansas', 'smallville'),
+    ('Department of Motor Vehicles, CA', 'california', ''),
+    ('Motor Vehicles Division, Salem OR', 'oregon', 'salem'),
+])
+def test_resolve(text, state, city):
+    location = LocationResolver().resolve(text)
+    assert (location.state_slug, location.city_slug) == (state, city)
+
+
+@pytest.mark.parametrize('text', [
+    'DEPT OF PARKS OR RECREATION',
+    'OK CORRAL TOURS IN TOMBSTONE',
+    'HI-VIS SIGNS AND OR PERMITS LLC',
+])
+def test_capitalized_words_are_not_state_codes(text):
+    assert LocationResolver().resolve(text) is None
+
+
+def test_resolve_is_memoized_per_string():
+    resolver = LocationResolver()
+    assert resolver.resolve('City of Austin') is None
+    first = resolver.resolve('Seattle, Washington')
+    assert resolver.resolve('Seattle, Washington') is first
+    assert len(resolver.memo) == 2
+
+
+def test_census_gazetteer_layout(tmp_path):
+    path = tmp_path / 'places.txt'
+    path.write_text('USPS\tGEOID\tNAME\tALAND  \nAZ\t0412000\tChandler city\t1\n'
+                    'NV\t3223770\tEnterprise CDP\t2\nXX\t0\tNowhere town\t3\n', encoding='utf-8')
+    tries = load_gazetteer(str(path))
+    assert set(tries) == {'AZ', 'NV'}
+    assert tries['NV'].matches(tokenize('in Enterprise, Nevada')) == [('Enterprise', 1, 2)]
+
+
+def test_trie_prefers_longest_match():
+    trie = TokenTrie()
+    trie.add('Las Vegas', 'LV')
+    trie.add('North Las Vegas', 'NLV')
+    assert [m[0] for m in trie.matches(tokenize('North Las Vegas and Las Vegas'))] == ['NLV', 'LV']
+
+
+def test_index_tree_paths_and_breadcrumbs():
+    pd = pytest.importorskip('pandas')
+    df = normalize_permits(pd.DataFrame({
+        'agency_short': ['City of Phoenix', 'DCRA', 'City of Mesa', 'City of Phoenix', 'City of Austin'],
+        'request_type': ['Business License', 'Business License', 'Business License', 'Sign Permit', 'Sign Permit'],
+        'location_applicability': ['Phoenix, Arizona', 'District of Columbia', 'Mesa, Arizona',
+                                   'Phoenix, Arizona', None],
+    }))
+    assert df['url_path'].tolist() == [
+        '/arizona/phoenix/business-license/', '/district-of-columbia/business-license/',
+        '/arizona/mesa/business-license/', '/arizona/phoenix/sign-permit/', '/city/sign-permit/',
+    ]
+    assert df['url_slug'][0] == 'arizona-phoenix-business-license'
+
+    index = LocationIndex.from_permits(df)
+    assert index.states['arizona']['cities']['phoenix']['permits'] == [0, 3]
+    assert index.states['district-of-columbia']['statewide'] == [1]
+    assert index.unresolved == [4]
+    assert index.permit_ids(index.states['arizona']) == [2, 0, 3]
+    assert index.paths() == ['/states/', '/arizona/', '/arizona/mesa/', '/arizona/phoenix/',
+                             '/district-of-columbia/']
+    assert [crumb['path'] for crumb in index.breadcrumbs('arizona', 'mesa')] == ['/', '/arizona/', '/arizona/mesa/']
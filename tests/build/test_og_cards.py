@@ -0,0 +1,57 @@
+import os
+import pytest
+
+pytest.importorskip('PIL')
+
+from og_cards import CARD_HEIGHT, CARD_WIDTH, card_key, render_cards
+from PIL import Image
+
+
+CARDS = [
+    {'id': 'tech-001', 'title': 'AI Revolution: How Machine Learning is Transforming Industries',
+     'label': 'Technology', 'theme': 'news'},
+    {'id': 'ak-license', 'title': 'Apply for a business license',
+     'label': 'Finance Department', 'theme': 'permits'},
+]
+
+
+def test_card_key_depends_only_on_text_inputs():
+    """Same text -> same key; a title edit changes the key"""
+    same = dict(CARDS[0], id='other-id')
+    edited = dict(CARDS[0], title='AI Revolution, Revisited')
+
+    assert card_key(same) == card_key(CARDS[0])
+    assert card_key(edited) != card_key(CARDS[0])
+
+
+def test_render_cards_publishes_and_caches(tmp_path):
+    """Cards are drawn once, published by hash, and reused on rebuild"""
+    output_dir = str(tmp_path / 'output')
+    cache_dir = str(tmp_path / 'cache')
+
+    urls, stats = render_cards(CARDS, output_dir, cache_dir, workers=2)
+    assert stats == {'cards': 2, 'drawn': 2, 'cached': 0}
+
+    path = os.path.join(output_dir, urls['tech-001'].lstrip('/'))
+    with Image.open(path) as img:
+        assert img.size == (CARD_WIDTH, CARD_HEIGHT)
+
+    edited = [dict(CARDS[0], title='A different headline'), CARDS[1]]
+    new_urls, stats = render_cards(edited, output_dir, cache_dir)
+    assert stats == {'cards': 2, 'drawn': 1, 'cached': 1}
+    assert new_urls['ak-license'] == urls['ak-license']
+    assert new_urls['tech-001'] != urls['tech-001']
+
+
+def test_default_font_without_sized_bitmap_fonts(monkeypatch):
+    """Pillow 10.0 has no load_default(size=...): fall back to the fixed-size font"""
+    import og_cards
+
+    def load_default(**kwargs):
+        if kwargs:
+            raise TypeError("load_default() got an unexpected keyword argument 'size'")
+        return 'bitmap font'
+
+    monkeypatch.setattr(og_cards, 'FONT_CANDIDATES', ())
+    monkeypatch.setattr(og_cards.ImageFont, 'load_default', load_default)
+    assert og_cards._load_font(48) == 'bitmap font'
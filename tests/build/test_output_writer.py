@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import generator
+from generator import generate_site, load_articles
+from output_writer import OutputWriter
+
+
+def test_identical_writes_are_skipped(tmp_path):
+    """Unchanged bytes leave the file (and its mtime) alone"""
+    writer = OutputWriter()
+    path = str(tmp_path / 'a' / 'b' / 'page.html')
+
+    assert writer.write_chunks(path, ['<p>', 'ünïcode', '</p>'])
+    os.utime(path, (1, 1))
+    assert not writer.write(path, '<p>ünïcode</p>')
+    assert os.stat(path).st_mtime == 1
+    assert writer.write(path, b'<p>changed</p>')
+    assert open(path, encoding='utf-8').read() == '<p>changed</p>'
+    assert (writer.written, writer.skipped) == (2, 1)
+    assert writer.summary() == '2 files written, 1 unchanged'
+
+    # A cached directory that was removed is created again
+    shutil.rmtree(tmp_path / 'a')
+    assert writer.write(path, 'again')
+
+
+def test_interrupted_write_keeps_the_old_file(tmp_path):
+    """A failure mid-render leaves the previous file and no temporary file"""
+    writer = OutputWriter()
+    path = str(tmp_path / 'page.html')
+    writer.write(path, 'old')
+
+    def chunks():
+        yield 'new, half'
+        raise RuntimeError('render failed')
+
+    with pytest.raises(RuntimeError):
+        writer.write_chunks(path, chunks())
+    assert open(path).read() == 'old'
+    assert os.listdir(tmp_path) == ['page.html']
+
+
+def test_rebuild_writes_nothing(tmp_path, make_articles):
+    """A second build of unchanged articles skips every page"""
+    data_dir = tmp_path / 'articles'
+    data_dir.mkdir()
+    (data_dir / 'articles.json').write_text(json.dumps(make_articles(6)), encoding='utf-8')
+    articles = load_articles(str(data_dir))
+    targets = ['render:index.html', 'render:article_page.html', 'render:category_page.html', 'sitemap', 'robots']
+
+    generate_site(articles, str(tmp_path / 'site'), targets=targets, jobs=1)
+    first = generator.output_writer.written
+    generate_site(articles, str(tmp_path / 'site'), targets=targets, jobs=1)
+
+    assert first > 6
+    assert (generator.output_writer.written, generator.output_writer.skipped) == (0, first)
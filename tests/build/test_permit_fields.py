@@ -0,0 +1,121 @@
+import pytest
+
+from permit_fields import (
+    DERIVED_COLUMNS, ParseCache, normalize_permits, page_records, parse_range, parse_ranges, slugify,
+    slugify_column, write_parse_report,
+)
+
+pd = pytest.importorskip('pandas')
+
+
+def make_permits():
+    return pd.DataFrame({
+        'agency_short': ['CA DMV', 'City of Austin', None, 'NY  Dept. of State'],
+        'request_type': ['Food Truck Permit', 'Sign  Permit (Temporary)', '__Odd__ Name!', 'Notary_Commission'],
+        'how_to_description': ['1. Apply online. 2. Pay the fee of $5.50. 3. Wait.', '', None, 'Just apply.'],
+        'faqs': ['[{"question": "Q?", "answer": "A."}]', 'not json', None, '[]'],
+        'user_tips': [None, '["Tip"]', '', None],
+        'source_url': ['https://example.gov'] * 4,
+    })
+
+
+def test_vectorized_slugs_match_scalar_slugify():
+    values = pd.Series(['Food Truck Permit', '  Ünïcode & Co. ', '--a__b--', 'x/y', 'MIXED case-Slug'])
+    assert slugify_column(values).tolist() == [slugify(v) for v in values]
+
+
+def test_normalize_adds_derived_columns_once():
+    df = normalize_permits(make_permits())
+
+    assert df['jurisdiction_slug'].tolist() == ['california', 'city', '', 'new-york']
+    assert df['permit_slug'].tolist() == ['food-truck-permit', 'sign-permit-temporary', 'odd-name', 'notary-commission']
+    assert df['url_path'][0] == '/california/food-truck-permit/'
+    assert df['url_slug'][0] == 'california-food-truck-permit'
+    assert df['how_to_steps'].tolist() == [['Apply online.', 'Pay the fee of $5.50.', 'Wait.'], [], [], ['Just apply.']]
+    assert normalize_permits(df) is df
+
+
+def test_categorical_columns_normalize_like_strings():
+    expected = normalize_permits(make_permits())
+    df = normalize_permits(make_permits().astype('category'))
+    derived = [name for name in DERIVED_COLUMNS if name in expected.columns]
+    pd.testing.assert_frame_equal(df[derived], expected[derived])
+
+    # A missing request type maps too, which keeps map() one-to-one
+    permits = make_permits().assign(request_type=['Sign Permit', 'Dog License', None, 'Notary'])
+    assert normalize_permits(permits.astype('category'))['permit_type'].dtype == object
+
+
+def test_page_records_decode_json_columns():
+    records = page_records(normalize_permits(make_permits()))
+
+    assert records[0]['faqs'] == [{'question': 'Q?', 'answer': 'A.'}]
+    assert records[1]['faqs'] == [] and records[1]['user_tips'] == ['Tip']
+    assert records[0]['community_feedback'] == []
+    assert not any(column in records[0] for column in DERIVED_COLUMNS if column.endswith('_parsed'))
+
+
+def test_parse_cache_skips_unchanged_rows(tmp_path):
+    """Only rows whose raw cells changed are parsed again; warnings survive the cache"""
+    path = str(tmp_path / 'parsed_fields.json')
+    df = make_permits()
+
+    cache = ParseCache(path)
+    warnings = []
+    first = normalize_permits(df, cache, warnings)
+    cache.save()
+    assert (cache.hits, cache.misses) == (0, 4)
+    assert warnings == [{'file': None, 'row': 3, 'column': 'faqs', 'error': warnings[0]['error'],
+                         'request_type': 'Sign  Permit (Temporary)'}]
+    assert warnings[0]['error'].startswith('Invalid JSON')
+
+    df.loc[3, 'how_to_description'] = '1. Apply. 2. Sign.'
+    cache = ParseCache(path)
+    warnings = []
+    second = normalize_permits(df, cache, warnings)
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert len(warnings) == 1
+    assert second['how_to_steps'][3] == ['Apply.', 'Sign.']
+    assert second['faqs_parsed'].tolist() == first['faqs_parsed'].tolist()
+
+    report = write_parse_report(warnings, str(tmp_path / 'report.json'))
+    assert '"by_column": {\n    "faqs": 1' in open(report, encoding='utf-8').read()
+
+
+def test_warnings_name_the_file_and_line_of_their_row():
+    """Rows combined from several files are reported where they were read"""
+    df = make_permits().drop(index=0)
+    sources = {1: ('a.csv', 3), 2: ('b.json', 14), 3: ('b.json', 45)}
+    warnings = []
+    normalize_permits(df, warnings=warnings, sources=sources)
+    assert [(w['file'], w['row']) for w in warnings] == [('a.csv', 3)]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('50-200', (50, 200)),
+    ('1', (1, 1)),
+    ('$1,000 - $5,000', (1000, 5000)),
+    ('5 to 10', (5, 10)),
+    ('500+', (500, 500)),
+    ('Free', (0, 0)),
+    ('200-50', (50, 200)),
+    ('Varies', None),
+    ('', None),
+])
+def test_parse_range(text, expected):
+    assert parse_range(text) == expected
+
+
+def test_parse_ranges_adds_numeric_columns():
+    df = pd.DataFrame({
+        'cost': ['50-200', 'Varies', None, '50-200', 'Varies'],
+        'effort_hours': ['1-3', '2', '1-3', None, '4-6'],
+    })
+    unparseable = {}
+    parse_ranges(df, unparseable=unparseable)
+
+    assert df['cost_min'].tolist()[:1] == [50.0] and df['cost_mid'][3] == 125.0
+    assert df['cost_max'].isna().tolist() == [False, True, True, False, True]
+    assert df['effort_hours_mid'].tolist()[:3] == [2.0, 2.0, 2.0]
+    assert 'estimated_monthly_volume_min' not in df.columns
+    assert unparseable == {'cost': {'Varies': 2}}
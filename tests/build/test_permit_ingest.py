@@ -0,0 +1,96 @@
+import json
+
+from permit_ingest import discover_permit_files, format_issue, ingest_permits, iter_json_array
+from permit_schema import JSON_SCHEMA
+
+HEADER = ('agency_short,agency_full,request_type,cost,effort_hours,location_applicability,online_available,'
+          'api_available')
+
+
+def json_permit(**fields):
+    """A permit object with every JSON_SCHEMA.md field"""
+    permit = dict.fromkeys(JSON_SCHEMA.columns)
+    permit.update(id='2e89cc1d-215d-4281-824b-003bffe05fc6', name='Other Permit', related_pages=[], cost='50',
+                  effort_hours='1 hour', online_available='Yes', api_available='No', request_type='Other Permit',
+                  location_applicability='Statewide (Other State)')
+    permit.update(fields)
+    return permit
+
+
+def write_files(tmp_path):
+    """The scenarios of test_multi_csv.py, plus a JSON file"""
+    (tmp_path / 'a_valid.csv').write_text(
+        f'{HEADER}\n'
+        'TEST Dept,Test State Department,Test Permit,100,2 hours,Statewide (Test State),Yes,No\n'
+        'OTHER Dept,"Other\nDepartment",Other Permit,100,2 hours,Statewide (Other State),Yes,No\n'
+        ',Empty Agency Dept,Empty Field Test,400,5 hours,Statewide (Empty State),Yes,No\n'
+    )
+    (tmp_path / 'b_duplicate.csv').write_text(
+        f'{HEADER},extra_field\n'
+        'test dept,Test State Department,Test  Permit,200,3 hours,Statewide (Test State),Yes,No,x\n'
+    )
+    (tmp_path / 'c_missing_column.csv').write_text(
+        'agency_short,agency_full,request_type,cost,effort_hours,online_available,api_available\n'
+        'MISSING Dept,Missing State Dept,Missing Column Test,300,4 hours,Yes,No\n'
+    )
+    (tmp_path / 'd_permits.json').write_text(json.dumps([
+        json_permit(agency_short='JSON Dept', agency_full='JSON Department',
+                    faqs=[{'question': 'Q?', 'answer': 'A.'}]),
+        json_permit(agency_short='OTHER Dept', agency_full='Other', online_available='yes'),
+    ], indent=2))
+
+
+def test_ingest_reports_issues_with_provenance(tmp_path):
+    write_files(tmp_path)
+    ingest = ingest_permits(str(tmp_path), workers=1)
+
+    assert len(ingest.records) == 7
+    assert ingest.sources[1] == (str(tmp_path / 'a_valid.csv'), 3)
+    assert ingest.sources[6] == (str(tmp_path / 'd_permits.json'), 40)
+    messages = [format_issue(item).replace(str(tmp_path) + '/', '') for item in ingest.issues]
+    assert messages == [
+        'a_valid.csv:5: error: agency_short: required field is empty',
+        'b_duplicate.csv:1: warning: unknown columns: extra_field',
+        'c_missing_column.csv:1: error: missing columns: location_applicability',
+        "d_permits.json:40: error: online_available: expected 'Yes' or 'No'",
+        'b_duplicate.csv:2: error: duplicate permit (first at a_valid.csv:2)',
+        'd_permits.json:40: error: duplicate permit (first at a_valid.csv:3)',
+    ]
+    assert ingest.issues[3]['rule'] == 'yes_no' and ingest.issues[-1]['first_line'] == 3
+    assert len(ingest.errors) == 5 and len(ingest.warnings) == 1
+
+
+def test_json_rows_match_csv_layout(tmp_path):
+    write_files(tmp_path)
+    records = ingest_permits(str(tmp_path), workers=1).records
+
+    assert records[5]['faqs'] == '[{"question": "Q?", "answer": "A."}]'
+    assert records[6]['verified_by'] is None and records[1]['agency_full'] == 'Other\nDepartment'
+
+
+def test_parallel_ingest_matches_serial(tmp_path):
+    write_files(tmp_path)
+    serial = ingest_permits(str(tmp_path), workers=1)
+    parallel = ingest_permits(str(tmp_path), workers=2)
+
+    assert parallel.records == serial.records
+    assert parallel.issues == serial.issues
+
+
+def test_json_export_of_a_csv_is_skipped(tmp_path):
+    (tmp_path / 'permits.csv').write_text(HEADER + '\n')
+    (tmp_path / 'permits.json').write_text('[]')
+    (tmp_path / 'texas.json').write_text('[]')
+    (tmp_path / 'notes.txt').write_text('')
+
+    paths, skipped = discover_permit_files(str(tmp_path))
+    assert paths == [str(tmp_path / 'permits.csv'), str(tmp_path / 'texas.json')]
+    assert skipped == [str(tmp_path / 'permits.json')]
+
+
+def test_invalid_json_is_an_error(tmp_path):
+    (tmp_path / 'broken.json').write_text('[\n  {"agency_short": "A"},\n  {"agency_short": }\n]')
+    ingest = ingest_permits(str(tmp_path))
+
+    assert [(item['line'], item['message'][:12]) for item in ingest.errors] == [(3, 'invalid JSON')]
+    assert list(iter_json_array('[ ]')) == []
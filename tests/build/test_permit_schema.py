@@ -0,0 +1,92 @@
+import json
+
+from permit_schema import ABSENT, CSV_SCHEMA, JSON_SCHEMA, format_error, validate_file
+
+UUID_1 = '2e89cc1d-215d-4281-824b-003bffe05fc6'
+UUID_2 = '85fef12f-ad0a-464d-ac6c-139fb8a28c67'
+
+
+def make_rows(count=3):
+    return {
+        'agency_short': ['A Dept'] * count,
+        'agency_full': ['A Department'] * count,
+        'request_type': ['Sign Permit'] * count,
+        'cost': ['$50'] * count,
+        'location_applicability': ['Austin, Texas'] * count,
+        'effort_hours': ['1-2'] * count,
+        'online_available': ['Yes'] * count,
+        'api_available': ['No'] * count,
+    }
+
+
+def rules(errors):
+    return [(error['row'], error['column'], error['rule']) for error in errors]
+
+
+def test_valid_rows_have_no_errors():
+    assert CSV_SCHEMA.validate(make_rows()) == []
+
+
+def test_row_level_errors():
+    columns = make_rows(4)
+    columns['agency_short'][1] = 'NA'
+    columns['online_available'][2] = 'yes'
+    columns['cost'][3] = '-5'
+    columns['source_url'] = ['https://example.gov', 'example.gov', '', 'ftp://example.gov']
+    columns['date_extracted'] = ['2025-11-19', '2025-02-30', '19/11/2025', None]
+    columns['faqs'] = ['[{"question": "Q?", "answer": "A."}]', '[{"question": "Q?"}]', '{}', '[broken']
+    columns['extra'] = [''] * 4
+
+    errors = CSV_SCHEMA.validate(columns)
+    assert rules(errors) == [
+        (None, 'extra', 'column'),
+        (1, 'agency_short', 'required'),
+        (1, 'date_extracted', 'date'),
+        (1, 'source_url', 'url'),
+        (1, 'faqs', 'json'),
+        (2, 'online_available', 'yes_no'),
+        (2, 'date_extracted', 'date'),
+        (2, 'faqs', 'json'),
+        (3, 'cost', 'cost'),
+        (3, 'source_url', 'url'),
+        (3, 'faqs', 'json'),
+    ]
+    assert errors[0]['level'] == 'warning' and errors[1]['level'] == 'error'
+    assert format_error(errors[3]) == "row 3 source_url: not an http(s) URL with a host ('example.gov')"
+    assert errors[4]['message'] == 'item 0: expected an object with question and answer'
+
+
+def test_missing_columns():
+    columns = make_rows()
+    del columns['location_applicability']
+    assert rules(CSV_SCHEMA.validate(columns)) == [(None, 'location_applicability', 'column')]
+
+
+def test_json_records_need_every_field():
+    record = {name: None for name in JSON_SCHEMA.columns}
+    record.update({name: values[0] for name, values in make_rows(1).items()})
+    record.update(id=UUID_1, name='Austin Permit', related_pages=[UUID_2], faqs=[])
+    broken = dict(record, id='not-a-uuid', name='Austin', related_pages=None, cost=50)
+    del broken['verified_by']
+
+    errors = JSON_SCHEMA.validate_records([record, broken])
+    assert rules(errors) == [
+        (1, 'id', 'uuid'),
+        (1, 'name', 'two_words'),
+        (1, 'cost', 'cost'),
+        (1, 'related_pages', 'json'),
+        (1, 'verified_by', 'missing'),
+    ]
+    assert errors[2]['message'] == 'expected a string, got int'
+    assert JSON_SCHEMA.validate({'id': [ABSENT]})[0]['rule'] == 'column'
+
+
+def test_validate_file_is_memoized_per_version(tmp_path):
+    path = tmp_path / 'permits.json'
+    path.write_text(json.dumps([{'id': UUID_1}]))
+    report = validate_file(str(path))
+    assert report.rows == 1 and report.columns == ['id']
+    assert validate_file(str(path)) is report
+
+    path.write_text(json.dumps([{'id': UUID_1}, {'id': UUID_2}]))
+    assert validate_file(str(path)).rows == 2
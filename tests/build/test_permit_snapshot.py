@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+from pandas.testing import assert_frame_equal
+
+import permit_snapshot
+from permit_ingest import ingest_permits
+from permit_snapshot import PermitSnapshot, load_permits
+
+HEADER = ('agency_short,agency_full,request_type,cost,effort_hours,location_applicability,online_available,'
+          'api_available,verified_by')
+
+
+def write_permits(path, rows=('A Dept,A Department,Sign Permit,$50,1 hour,"Austin, Texas",Yes,No,',)):
+    path.write_text(HEADER + '\n' + '\n'.join(rows) + '\n', encoding='utf-8')
+
+
+def ingested_frame(permits_dir):
+    ingest = ingest_permits(permits_dir, workers=1)
+    return pd.DataFrame.from_records(ingest.records, columns=ingest.columns).fillna(float('nan'))
+
+
+def test_snapshot_matches_ingested_frame(tmp_path):
+    write_permits(tmp_path / 'permits.csv', [
+        'A Dept,A Department,Sign Permit,$50,1 hour,"Austin, Texas",Yes,No,',
+        'B Dept,B Department,"Café\nPermit",N/A,1 hour,"Austin, Texas",No,No,',
+        'A Dept,A Department,Sign Permit,$50,1 hour,"Waco, Texas",Yes,No,',
+    ])
+    snapshot = PermitSnapshot(str(tmp_path / 'cache'))
+    df, manifest, hit = load_permits(str(tmp_path), snapshot)
+
+    assert not hit and manifest['rows'] == 3
+    assert df['agency_short'].dtype == 'category' and df['agency_short'].cat.categories.tolist() == ['A Dept', 'B Dept']
+    decoded = df.apply(lambda values: values.astype(object) if values.dtype == 'category' else values)
+    assert_frame_equal(decoded, ingested_frame(str(tmp_path)))
+    assert df['verified_by'].dtype == float and df['request_type'][1] == 'Café\nPermit'
+    assert df['cost'].isna().tolist() == [False, True, False]
+    assert [spec['kind'] for spec in manifest['columns']][-1] == 'empty'
+
+
+def test_unchanged_files_load_from_snapshot(tmp_path, monkeypatch):
+    write_permits(tmp_path / 'permits.csv')
+    snapshot = PermitSnapshot(str(tmp_path / 'cache'))
+    expected, _, _ = load_permits(str(tmp_path), snapshot)
+
+    monkeypatch.setattr(permit_snapshot, 'ingest_permits', None)
+    df, _, hit = load_permits(str(tmp_path), snapshot)
+    assert hit
+    assert_frame_equal(df, expected)
+
+    df, _, _ = load_permits(str(tmp_path), snapshot, columns=['cost', 'online_available', 'unknown'])
+    assert df.columns.tolist() == ['cost', 'online_available']
+
+
+def test_changed_files_replace_the_snapshot(tmp_path):
+    path = tmp_path / 'permits.csv'
+    write_permits(path)
+    snapshot = PermitSnapshot(str(tmp_path / 'cache'))
+    _, first, _ = load_permits(str(tmp_path), snapshot)
+
+    # Same contents, new mtime: same key
+    os.utime(path, ns=(0, 0))
+    assert snapshot.key([str(path)]) == first['key']
+
+    # Another build's snapshot still being written is left alone
+    in_progress = os.path.join(snapshot.path, f"{first['key']}.tmp-1")
+    os.makedirs(in_progress)
+
+    write_permits(path, ['A Dept,A Department,Sign Permit,$75,1 hour,"Austin, Texas",Yes,No,'])
+    df, second, hit = load_permits(str(tmp_path), snapshot)
+    assert not hit and second['key'] != first['key']
+    assert df['cost'].tolist() == ['$75']
+    assert not os.path.exists(os.path.join(snapshot.path, first['key']))
+    assert os.path.isdir(in_progress)
+
+
+def test_snapshot_keeps_issues_and_ignores_incomplete_ones(tmp_path):
+    write_permits(tmp_path / 'permits.csv', [
+        'A Dept,A Department,Sign Permit,$50,1 hour,"Austin, Texas",maybe,No,',
+    ])
+    snapshot = PermitSnapshot(str(tmp_path / 'cache'))
+    _, manifest, _ = load_permits(str(tmp_path), snapshot)
+    assert [item['rule'] for item in manifest['issues']] == ['yes_no']
+
+    os.remove(os.path.join(snapshot.path, manifest['key'], 'manifest.json'))
+    assert snapshot.load(manifest['key']) is None
+    _, manifest, hit = load_permits(str(tmp_path), snapshot)
+    assert not hit and manifest['issues'][0]['line'] == 2
+
+
+def test_row_sources_follow_the_files(tmp_path):
+    write_permits(tmp_path / 'a.csv')
+    write_permits(tmp_path / 'b.csv', [
+        'B Dept,B Department,"Multi\nline",$50,1 hour,"Austin, Texas",Yes,No,',
+        'C Dept,C Department,Sign Permit,$50,1 hour,"Austin, Texas",Yes,No,',
+    ])
+    snapshot = PermitSnapshot(str(tmp_path / 'cache'))
+    _, manifest, _ = load_permits(str(tmp_path), snapshot)
+
+    sources = snapshot.sources(manifest)
+    assert len(sources) == 3
+    assert sources[0] == (str(tmp_path / 'a.csv'), 2)
+    assert sources[2] == (str(tmp_path / 'b.csv'), 4)
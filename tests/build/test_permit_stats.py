@@ -0,0 +1,37 @@
+from permit_stats import aggregate_permits, format_cost, permit_stats
+
+
+def test_aggregates_per_type_state_and_city(permits):
+    stats = aggregate_permits(permits)
+
+    license = stats.by_type.loc['business-license']
+    assert (license['jurisdiction_count'], license['online_count'], license['online_percent']) == (3, 2, 67)
+    assert license['avg_cost'] == 100.0 and license['processing_time'] == '1 week'
+
+    texas = stats.by_state.loc['texas']
+    assert (texas['permits'], texas['city_count'], texas['api_count']) == (4, 2, 1)
+    assert stats.by_city.loc[('texas', 'austin'), 'type_count'] == 2
+    assert stats.totals == {'permits': 5, 'agencies': 4, 'jurisdictions': 4, 'types': 3,
+                            'online': 3, 'api': 2, 'mcp': 0}
+
+
+def test_type_records_sorted_and_formatted(permits):
+    records = aggregate_permits(permits).type_records()
+    assert [record['slug'] for record in records] == ['business-license', 'sales-tax-permit', 'sign-permit']
+    assert records[0]['avg_cost'] == '$100' and not records[0]['should_noindex']
+    assert records[1]['avg_cost'] == '$0' and records[1]['should_noindex']
+
+
+def test_permit_stats_shared_by_dataset_hash(permits):
+    df = permits
+    stats = permit_stats(df)
+    assert permit_stats(df.copy()) is stats
+
+    changed = df.copy()
+    changed.loc[0, 'online_available'] = 'No'
+    assert permit_stats(changed) is not stats
+
+
+def test_format_cost():
+    assert format_cost(1234.9) == '$1,234'
+    assert format_cost(float('nan')) == 'Varies'
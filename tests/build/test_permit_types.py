@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from permit_types import PermitTypeMap, cluster_keys, type_key
+
+
+def test_type_key_drops_filler_and_folds_spellings():
+    assert type_key('Apply for a business license') == 'business license'
+    assert type_key('General Business Licences') == 'business license'
+    assert type_key('License, Business') == 'business license'
+    assert type_key('Apply') == 'apply'
+    assert type_key(None) == ''
+
+
+def test_cluster_keys_merges_near_duplicates_only():
+    roots = cluster_keys(['busine license', 'business license', 'business license privilege', 'permit sign'])
+    assert roots['busine license'] == roots['business license']
+    assert len(set(roots.values())) == 3
+
+
+def test_assign_clusters_request_types():
+    type_map = PermitTypeMap()
+    assigned = type_map.assign([
+        'Apply for a business license', 'Business License', 'General Business Licence', 'Busines License',
+        'Business License', 'Business Privilege License', 'Sign Permit',
+    ])
+
+    assert set(assigned.values()) == {'business-license', 'business-privilege-license', 'sign-permit'}
+    assert assigned['Busines License'] == assigned['Apply for a business license'] == 'business-license'
+    assert type_map.name('business-license') == 'Business License'
+    assert type_map.added == 3
+
+
+def test_mapping_file_is_reviewable_and_applied_incrementally(tmp_path):
+    path = str(tmp_path / 'permit_types.json')
+    type_map = PermitTypeMap(path)
+    type_map.assign(['Business License', 'Sign Permit'])
+    type_map.save()
+
+    # A reviewer renames a type and moves an alias into it
+    data = json.load(open(path, encoding='utf-8'))
+    data['types']['business-license'].update(name='Business Tax Registration', reviewed=True)
+    data['types']['business-license']['aliases'].append('Business Privilege License')
+    json.dump(data, open(path, 'w', encoding='utf-8'))
+
+    type_map = PermitTypeMap(path)
+    assigned = type_map.assign(['Business Privilege License', 'business licenses', 'Sign Permits', 'Dog License'])
+    assert assigned == {
+        'Business Privilege License': 'business-license',
+        'business licenses': 'business-license',
+        'Sign Permits': 'sign-permit',
+        'Dog License': 'dog-license',
+    }
+    assert type_map.added == 1
+    type_map.save()
+
+    saved = json.load(open(path, encoding='utf-8'))['types']
+    assert saved['business-license']['name'] == 'Business Tax Registration'
+    assert saved['business-license']['reviewed'] is True
+    assert 'business licenses' in saved['business-license']['aliases']
+    assert saved['dog-license'] == {'name': 'Dog License', 'aliases': ['Dog License'], 'reviewed': False}
+
+
+def test_new_aliases_of_known_types_are_saved(tmp_path):
+    path = str(tmp_path / 'permit_types.json')
+    type_map = PermitTypeMap(path)
+    type_map.assign(['Business License'])
+    type_map.save()
+
+    type_map = PermitTypeMap(path)
+    type_map.assign(['Business Licenses'])
+    assert type_map.added == 0 and type_map.changed
+    type_map.save()
+    saved = json.load(open(path, encoding='utf-8'))['types']
+    assert saved['business-license']['aliases'] == ['Business License', 'Business Licenses']
+
+
+def test_normalize_adds_canonical_types():
+    pd = pytest.importorskip('pandas')
+    from permit_fields import normalize_permits
+
+    df = normalize_permits(pd.DataFrame({
+        'agency_short': ['City of Austin', 'City of Dallas', 'City of Fresno', 'City of Waco'],
+        'request_type': ['Apply for a business license', 'Business Licenses', 'Sign Permit',
+                         'Apply for a business license'],
+        'location_applicability': ['Austin, Texas', 'Dallas, Texas', 'Fresno, California', 'Waco, Texas'],
+    }))
+    assert df['permit_type'].tolist() == ['apply-for-a-business-license'] * 2 + ['sign-permit'] + [
+        'apply-for-a-business-license']
+    assert df['permit_type_name'][1] == 'Apply for a business license'
+    assert df['permit_slug'][1] == 'business-licenses'
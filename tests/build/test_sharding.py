@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from sharding import MANIFEST_NAME, Shard, merge_sitemaps, merge_trees, shard_of
+
+URLS = [f'/technology/article-{i}/' for i in range(200)]
+
+
+def sitemap(paths):
+    blocks = '\n'.join(f'  <url>\n    <loc>https://news123.com{p}</loc>\n  </url>' for p in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset>\n{blocks}\n</urlset>'
+
+
+def test_partition_is_stable_and_disjoint():
+    """Every URL belongs to exactly one shard, independent of input order"""
+    shards = [Shard(i, 4) for i in range(1, 5)]
+    owners = [[s.index for s in shards if s.owns(url)] for url in URLS]
+
+    assert all(len(owner) == 1 for owner in owners)
+    assert all(owner[0] == shard_of(url, 4) for url, owner in zip(URLS, owners))
+    assert {owner[0] for owner in owners} == {1, 2, 3, 4}
+
+
+def test_parse_rejects_bad_shards():
+    assert str(Shard.parse('2/4')) == '2/4'
+    assert Shard.parse(None) is None
+    for value in ('0/4', '5/4', '2', 'a/b'):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+def test_merged_sitemap_matches_unsharded_order():
+    """keep() records global positions; merging restores the original order"""
+    parts = []
+    for index in (1, 2, 3):
+        shard = Shard(index, 3)
+        # Built in two sections, like the generators do
+        kept = shard.keep('sitemap', URLS[:50], lambda url: url)
+        kept += shard.keep('sitemap', URLS[50:], lambda url: url)
+        parts.append((sitemap(kept), shard.positions['sitemap']))
+
+    assert merge_sitemaps(parts) == sitemap(URLS)
+
+
+def write_tree(root, index, files, positions):
+    os.makedirs(root)
+    for path, content in files.items():
+        os.makedirs(os.path.dirname(os.path.join(root, path)) or root, exist_ok=True)
+        with open(os.path.join(root, path), 'w') as f:
+            f.write(content)
+    with open(os.path.join(root, MANIFEST_NAME), 'w') as f:
+        json.dump({'build': 'permits', 'shard': index, 'count': 2, 'positions': positions}, f)
+
+
+def test_merge_trees_combines_search_shards_and_flags_conflicts(tmp_path):
+    """data.json is rebuilt in order; differing shared files are reported"""
+    write_tree(str(tmp_path / 's1'), 1, {
+        'a/index.html': 'A',
+        'robots.txt': 'User-agent: *',
+        'favicon/site.webmanifest': '{}',
+        'data.json': json.dumps({'generated_at': '1', 'total_permits': 1, 'permits': [{'id': 'b'}]}),
+    }, {'search': [1]})
+    write_tree(str(tmp_path / 's2'), 2, {
+        'b/index.html': 'B',
+        'robots.txt': 'User-agent: *',
+        'favicon/site.webmanifest': '{"changed": true}',
+        'data.json': json.dumps({'generated_at': '2', 'total_permits': 2, 'permits': [{'id': 'a'}, {'id': 'c'}]}),
+    }, {'search': [0, 2]})
+
+    out = str(tmp_path / 'merged')
+    merged = merge_trees([str(tmp_path / 's2'), str(tmp_path / 's1')], out)
+
+    with open(os.path.join(out, 'data.json')) as f:
+        data = json.load(f)
+    assert [p['id'] for p in data['permits']] == ['a', 'b', 'c']
+    assert data['total_permits'] == 3
+    assert merged['pages'] == 2
+    assert merged['conflicts'] == [os.path.join('favicon', 'site.webmanifest')]
+    assert not os.path.exists(os.path.join(out, MANIFEST_NAME))
+
+
+def test_merge_requires_every_shard(tmp_path):
+    write_tree(str(tmp_path / 's1'), 1, {'index.html': 'x'}, {})
+    with pytest.raises(ValueError, match='Expected shards 1..2'):
+        merge_trees([str(tmp_path / 's1')], str(tmp_path / 'merged'))
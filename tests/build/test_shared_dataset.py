@@ -0,0 +1,51 @@
+import filecmp
+import json
+import os
+
+import pytest
+
+from generator import generate_site, load_articles
+from shared_dataset import SharedDataset
+
+
+def test_publish_and_attach(tmp_path, make_articles):
+    """Workers attach to the published file and fetch records by id"""
+    records = make_articles(5) + [{'id': 7, 'title': 'Numeric id'}]
+    path = str(tmp_path / 'shared' / 'articles.shds')
+
+    with SharedDataset.publish(records, path):
+        pass
+
+    with SharedDataset.attach(path) as dataset:
+        assert len(dataset) == 6
+        assert dataset.ids() == ['a0', 'a1', 'a2', 'a3', 'a4', '7']
+        assert dataset.get('a3') == records[3]
+        assert dataset.get(7) == records[5] and 7 in dataset
+        assert 'missing' not in dataset
+        assert json.loads(bytes(dataset.raw('a0'))) == records[0]
+
+    (tmp_path / 'bogus.shds').write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        SharedDataset.attach(str(tmp_path / 'bogus.shds'))
+
+
+def test_render_workers_match_in_process_build(tmp_path, make_articles):
+    """--render-workers writes the same article pages as an in-process build"""
+    data_dir = tmp_path / 'articles'
+    data_dir.mkdir()
+    (data_dir / 'articles.json').write_text(json.dumps(make_articles(12)), encoding='utf-8')
+    articles = load_articles(str(data_dir))
+    targets = ['render:article_page.html']
+
+    generate_site(articles, str(tmp_path / 'local'), targets=targets, jobs=1)
+    graph = generate_site(articles, str(tmp_path / 'pool'), targets=targets, jobs=1, render_workers=2)
+
+    pages = 0
+    for root, _, files in os.walk(tmp_path / 'local'):
+        for filename in files:
+            path = os.path.join(root, filename)
+            other = os.path.join(tmp_path / 'pool', os.path.relpath(path, tmp_path / 'local'))
+            assert filecmp.cmp(path, other, shallow=False), path
+            pages += path.endswith('index.html')
+    assert pages == 12
+    assert 'render:article_page.html' in graph.timings
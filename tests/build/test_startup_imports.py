@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that must only be imported by the code paths that use them
+HEAVY_MODULES = ('pandas', 'numpy', 'playwright')
+
+# Entry points and test modules whose import must stay light
+LIGHT_MODULES = [
+    'generator',
+    'generator_v1_backup',
+    'dev_server',
+    'permit_data',
+    'permit_ingest',
+    'permit_schema',
+    'permit_snapshot',
+    'convert_csv_to_json',
+    'tests.conftest',
+    'tests.data.test_csv_schema',
+    'tests.data.test_json_schema',
+    'tests.data.test_required_fields',
+    'tests.data.test_data_quality',
+    'tests.data.test_user_feedback_csv',
+]
+
+
+def test_entry_points_do_not_import_heavy_modules():
+    """Cold start guard: importing the generators, scripts and data tests loads no pandas/numpy/playwright"""
+    code = (
+        "import importlib, json, sys\n"
+        "sys.path.insert(0, 'scripts')\n"
+        "loaded = {}\n"
+        f"for name in {LIGHT_MODULES!r}:\n"
+        "    before = set(sys.modules)\n"
+        "    importlib.import_module(name)\n"
+        "    loaded[name] = sorted({m.split('.')[0] for m in set(sys.modules) - before})\n"
+        "print(json.dumps(loaded))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR,
+                            capture_output=True, text=True, check=True)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    offenders = {
+        name: [m for m in modules if m in HEAVY_MODULES]
+        for name, modules in loaded.items()
+        if any(m in HEAVY_MODULES for m in modules)
+    }
+    assert offenders == {}
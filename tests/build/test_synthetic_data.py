@@ -0,0 +1,46 @@
+import csv
+import json
+
+from synthetic_data import PERMIT_CSV_COLUMNS, iter_records, write_dataset
+
+
+def test_permit_csv_matches_real_header(tmp_path):
+    """Synthetic CSV uses the 29 columns of data/permits/permits.csv, in order"""
+    with open('data/permits/permits.csv', encoding='utf-8') as f:
+        real_header = next(csv.reader(f))
+
+    paths = write_dataset('permits', 120, str(tmp_path), fmt='csv', records_per_file=50)
+    assert len(paths) == 3
+
+    rows = 0
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            assert reader.fieldnames == real_header == PERMIT_CSV_COLUMNS
+            for row in reader:
+                rows += 1
+                assert all(row[c] for c in ('agency_short', 'request_type', 'cost', 'effort_hours',
+                                            'location_applicability', 'online_available', 'api_available'))
+                for faq in json.loads(row['faqs']):
+                    assert set(faq) == {'question', 'answer'}
+    assert rows == 120
+
+
+def test_permit_json_matches_real_fields(tmp_path):
+    """Synthetic JSON permits carry the 31 fields of permits.json"""
+    with open('data/permits/permits.json', encoding='utf-8') as f:
+        real_fields = set(json.load(f)[0])
+
+    [path] = write_dataset('permits', 10, str(tmp_path))
+    with open(path, encoding='utf-8') as f:
+        permits = json.load(f)
+    assert all(set(permit) == real_fields for permit in permits)
+    assert all(len(permit['name'].split()) == 2 for permit in permits)
+
+
+def test_records_are_deterministic_and_unique():
+    """Same seed -> same records; article slugs and ids never collide"""
+    first = list(iter_records('articles', 500))
+    assert first == list(iter_records('articles', 500))
+    assert first != list(iter_records('articles', 500, seed=1))
+    assert len({a['slug'] for a in first}) == len({a['id'] for a in first}) == 500
@@ -1,10 +1,12 @@
 import pytest
-from playwright.sync_api import sync_playwright
 import os
 
 @pytest.fixture(scope="session")
 def browser():
     """Shared browser instance for all tests"""
+    # Imported on first use so data and build tests don't pay for playwright
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(
             headless=True,
@@ -1,7 +1,8 @@
 import pytest
-import pandas as pd
 import os
 
+from permit_schema import CSV_SCHEMA, errors_for, format_error, validate_file
+
 @pytest.mark.critical
 def test_permits_csv_exists():
     """Test that permits.csv exists"""
@@ -10,7 +11,7 @@ def test_permits_csv_exists():
 @pytest.mark.critical
 def test_permits_csv_has_correct_columns():
     """Validate permits.csv has complete 29-column schema"""
-    df = pd.read_csv('data/permits/permits.csv')
+    columns = validate_file('data/permits/permits.csv').columns
 
     # Complete expected schema (29 columns) - NEW ORDER as of 2025-11-19
     expected_columns = [
@@ -38,10 +39,11 @@ def test_permits_csv_has_correct_columns():
         'verified_by'
     ]
 
-    actual_columns = list(df.columns)
+    actual_columns = columns
 
     assert len(actual_columns) == 29, f"Expected 29 columns, found {len(actual_columns)}"
     assert actual_columns == expected_columns, f"Column mismatch. Expected: {expected_columns}, Got: {actual_columns}"
+    assert list(CSV_SCHEMA.columns) == expected_columns, "permit_schema.FIELDS out of date"
 
 @pytest.mark.critical
 def test_csv_valid_utf8():
@@ -55,47 +57,31 @@ def test_csv_valid_utf8():
 @pytest.mark.critical
 def test_required_columns_not_empty():
     """Validate that required columns have data"""
-    df = pd.read_csv('data/permits/permits.csv')
+    report = validate_file('data/permits/permits.csv')
 
     # Skip if CSV is empty (just headers)
-    if len(df) == 0:
+    if report.rows == 0:
         pytest.skip("CSV is empty (no data rows)")
 
-    required_columns = [
+    assert set(CSV_SCHEMA.required) == {
         'agency_short', 'agency_full', 'request_type',
         'cost', 'location_applicability', 'effort_hours',
         'online_available', 'api_available'
-    ]
+    }
 
-    for col in required_columns:
-        empty_count = df[col].isna().sum() + (df[col] == '').sum()
-        assert empty_count == 0, f"Required column '{col}' has {empty_count} empty values"
+    errors = errors_for(report, 'required')
+    assert not errors, [format_error(error) for error in errors]
 
 def test_json_columns_valid_format():
     """Validate JSON columns have valid JSON array format when populated"""
-    import json
-
-    df = pd.read_csv('data/permits/permits.csv')
+    report = validate_file('data/permits/permits.csv')
 
     # Skip if CSV is empty
-    if len(df) == 0:
+    if report.rows == 0:
         pytest.skip("CSV is empty (no data rows)")
 
     json_columns = ['community_feedback', 'user_tips', 'faqs']
 
-    for col in json_columns:
-        for idx, value in enumerate(df[col]):
-            if pd.notna(value) and value != '':
-                try:
-                    parsed = json.loads(value)
-                    assert isinstance(parsed, list), f"{col} row {idx+2}: Must be JSON array, got {type(parsed).__name__}"
-
-                    # Special validation for FAQs structure
-                    if col == 'faqs':
-                        for faq in parsed:
-                            assert isinstance(faq, dict), f"{col} row {idx+2}: FAQ items must be objects"
-                            assert 'question' in faq, f"{col} row {idx+2}: FAQ missing 'question' field"
-                            assert 'answer' in faq, f"{col} row {idx+2}: FAQ missing 'answer' field"
-
-                except json.JSONDecodeError as e:
-                    pytest.fail(f"{col} row {idx+2}: Invalid JSON - {str(e)}")
+    # Arrays, and FAQ items are objects with question and answer
+    errors = [error for error in errors_for(report, 'json') if error['column'] in json_columns]
+    assert not errors, [format_error(error) for error in errors]
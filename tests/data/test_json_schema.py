@@ -1,7 +1,17 @@
 import pytest
 import json
 import os
-import re
+
+from permit_schema import JSON_SCHEMA, errors_for, format_error, validate_file
+
+
+def column_errors(*columns, rules=None):
+    """permits.json's schema errors in these fields (and rules)"""
+    errors = [
+        error for error in validate_file('data/permits/permits.json').errors
+        if error['column'] in columns and (rules is None or error['rule'] in rules)
+    ]
+    return [format_error(error, first_line=0) for error in errors]
 
 @pytest.mark.critical
 def test_permits_json_exists():
@@ -20,8 +30,7 @@ def test_permits_json_valid_format():
 @pytest.mark.critical
 def test_permits_json_has_correct_fields():
     """Validate permits.json has complete 31-field schema"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    report = validate_file('data/permits/permits.json')
 
     # Complete expected schema (31 fields) - as of 2025-11-19
     expected_fields = [
@@ -50,8 +59,8 @@ def test_permits_json_has_correct_fields():
     ]
 
     # Check first permit object
-    first_permit = data[0]
-    actual_fields = list(first_permit.keys())
+    actual_fields = report.columns
+    assert set(JSON_SCHEMA.columns) == set(expected_fields), "permit_schema.JSON_FIELDS out of date"
 
     assert len(actual_fields) == 31, f"Expected 31 fields, found {len(actual_fields)}"
 
@@ -63,14 +72,13 @@ def test_permits_json_has_correct_fields():
     extra_fields = set(actual_fields) - set(expected_fields)
     assert not extra_fields, f"Unexpected extra fields: {extra_fields}"
 
+    # Every other permit object has the same fields
+    assert not errors_for(report, 'missing', 'column')
+
 @pytest.mark.critical
 def test_required_fields_not_empty():
     """Validate that required fields have data"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Skip if JSON is empty
-    if len(data) == 0:
+    if validate_file('data/permits/permits.json').rows == 0:
         pytest.skip("JSON is empty (no permits)")
 
     required_fields = [
@@ -78,127 +86,54 @@ def test_required_fields_not_empty():
         'cost', 'location_applicability', 'effort_hours',
         'online_available', 'api_available'
     ]
+    assert set(JSON_SCHEMA.required) == set(required_fields)
 
-    for idx, permit in enumerate(data):
-        for field in required_fields:
-            value = permit.get(field)
-            assert value is not None, f"Permit {idx}: Required field '{field}' is None"
-            assert value != '', f"Permit {idx}: Required field '{field}' is empty string"
+    errors = column_errors(*required_fields, rules=('required', 'missing'))
+    assert not errors, errors
 
 def test_array_fields_valid_format():
     """Validate array fields are actual arrays when populated"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Skip if JSON is empty
-    if len(data) == 0:
+    if validate_file('data/permits/permits.json').rows == 0:
         pytest.skip("JSON is empty (no permits)")
 
-    array_fields = ['community_feedback', 'user_tips', 'faqs']
-
-    for idx, permit in enumerate(data):
-        for field in array_fields:
-            value = permit.get(field)
-
-            # Field should exist (can be empty array)
-            assert field in permit, f"Permit {idx}: Missing field '{field}'"
-
-            # If not empty string or None, must be array
-            if value and value != '':
-                assert isinstance(value, list), f"Permit {idx}: Field '{field}' must be array, got {type(value).__name__}"
-
-                # Special validation for FAQs structure
-                if field == 'faqs':
-                    for faq_idx, faq in enumerate(value):
-                        assert isinstance(faq, dict), f"Permit {idx}, FAQ {faq_idx}: Must be object"
-                        assert 'question' in faq, f"Permit {idx}, FAQ {faq_idx}: Missing 'question' field"
-                        assert 'answer' in faq, f"Permit {idx}, FAQ {faq_idx}: Missing 'answer' field"
+    # Present in every permit, arrays when not empty, FAQ items with
+    # question and answer
+    errors = column_errors('community_feedback', 'user_tips', 'faqs')
+    assert not errors, errors
 
 @pytest.mark.critical
 def test_id_field_format():
     """Validate that id field is present and has valid UUID format (required field)"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Skip if JSON is empty
-    if len(data) == 0:
+    if validate_file('data/permits/permits.json').rows == 0:
         pytest.skip("JSON is empty (no permits)")
 
-    # UUID v4 pattern
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
-
-    for idx, permit in enumerate(data):
-        # ID field must exist (required)
-        assert 'id' in permit, f"Permit {idx}: Missing required 'id' field"
-        
-        id_value = permit.get('id')
-        # ID is required, must not be empty or null
-        assert id_value is not None, f"Permit {idx}: 'id' field cannot be None"
-        assert id_value != '', f"Permit {idx}: 'id' field cannot be empty string"
-        assert isinstance(id_value, str), f"Permit {idx}: 'id' must be a string"
-        assert uuid_pattern.match(id_value), f"Permit {idx}: 'id' must be a valid UUID format, got '{id_value}'"
+    # Present, non-empty string, UUID v4
+    errors = column_errors('id')
+    assert not errors, errors
 
 def test_related_pages_format():
     """Validate that related_pages field contains valid UUIDs (permit IDs)"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Skip if JSON is empty
-    if len(data) == 0:
+    if validate_file('data/permits/permits.json').rows == 0:
         pytest.skip("JSON is empty (no permits)")
 
-    # UUID v4 pattern
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
+    # Present in every permit, an array (possibly empty) of UUID strings
+    errors = column_errors('related_pages')
+    assert not errors, errors
 
-    # Create a set of all permit IDs for reference validation
-    all_permit_ids = {permit['id'] for permit in data}
+    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
 
     for idx, permit in enumerate(data):
-        # related_pages field must exist
-        assert 'related_pages' in permit, f"Permit {idx}: Missing 'related_pages' field"
-
-        related_pages = permit.get('related_pages')
-
-        # Must be an array
-        assert isinstance(related_pages, list), f"Permit {idx}: 'related_pages' must be an array, got {type(related_pages).__name__}"
-
-        # If not empty, validate each item is a valid UUID
-        if len(related_pages) > 0:
-            for page_idx, page_id in enumerate(related_pages):
-                assert isinstance(page_id, str), f"Permit {idx}, related_pages[{page_idx}]: Must be a string, got {type(page_id).__name__}"
-                assert page_id != '', f"Permit {idx}, related_pages[{page_idx}]: Cannot be empty string"
-                assert uuid_pattern.match(page_id), f"Permit {idx}, related_pages[{page_idx}]: Must be a valid UUID format, got '{page_id}'"
-
-                # Optional: Validate that the ID references an actual permit (not self)
-                if page_id in all_permit_ids:
-                    assert page_id != permit['id'], f"Permit {idx}, related_pages[{page_idx}]: Cannot reference itself"
-                # Note: We don't fail if ID doesn't exist, as permits might be in separate files
+        for page_idx, page_id in enumerate(permit['related_pages']):
+            # IDs missing from this file are fine: permits might be in separate files
+            assert page_id != permit['id'], f"Permit {idx}, related_pages[{page_idx}]: Cannot reference itself"
 
 @pytest.mark.critical
 def test_name_field_format():
     """Validate that name field is present and has 2-word format (required field)"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Skip if JSON is empty
-    if len(data) == 0:
+    if validate_file('data/permits/permits.json').rows == 0:
         pytest.skip("JSON is empty (no permits)")
 
-    for idx, permit in enumerate(data):
-        # name field must exist (required)
-        assert 'name' in permit, f"Permit {idx}: Missing required 'name' field"
-        
-        name_value = permit.get('name')
-        
-        # name is required, must not be empty or null
-        assert name_value is not None, f"Permit {idx}: 'name' field cannot be None"
-        assert name_value != '', f"Permit {idx}: 'name' field cannot be empty string"
-        assert isinstance(name_value, str), f"Permit {idx}: 'name' must be a string"
-        words = name_value.split()
-        assert len(words) == 2, f"Permit {idx}: 'name' must be exactly 2 words, got '{name_value}' ({len(words)} words)"
+    # Present, non-empty string of exactly 2 words
+    errors = column_errors('name')
+    assert not errors, errors
@@ -1,19 +1,17 @@
 import pytest
 import json
 
+from permit_schema import errors_for, format_error, validate_file
+
 @pytest.mark.critical
 def test_no_empty_required_fields():
     """Confirms no empty values in required fields"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    report = validate_file('data/permits/permits.json')
 
     required_fields = ['agency_short', 'request_type', 'cost', 'effort_hours']
 
-    for idx, permit in enumerate(data):
-        for field in required_fields:
-            value = permit.get(field)
-            assert value is not None, f"Permit {idx}: Field '{field}' is None"
-            assert value != '', f"Permit {idx}: Field '{field}' is empty string"
+    errors = [error for error in errors_for(report, 'required', 'missing') if error['column'] in required_fields]
+    assert not errors, [format_error(error, first_line=0) for error in errors]
 
 @pytest.mark.critical
 def test_unique_composite_key():
@@ -35,13 +33,8 @@ def test_unique_composite_key():
 @pytest.mark.critical
 def test_boolean_fields_valid():
     """Checks boolean fields contain only 'Yes' or 'No'"""
-    with open('data/permits/permits.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    report = validate_file('data/permits/permits.json')
 
-    boolean_fields = ['online_available', 'api_available', 'mcp_available']
-
-    for idx, permit in enumerate(data):
-        for field in boolean_fields:
-            value = permit.get(field, '')
-            valid_values = ['Yes', 'No', '']  # Allow empty for optional fields like mcp_available
-            assert value in valid_values, f"Permit {idx}: Field '{field}' has invalid value '{value}' (expected 'Yes', 'No', or empty)"
+    # online_available and api_available are required; mcp_available may be empty
+    errors = errors_for(report, 'yes_no')
+    assert not errors, [format_error(error, first_line=0) for error in errors]
@@ -1,7 +1,8 @@
 import pytest
-import pandas as pd
 import os
 
+from permit_data import read_csv_rows
+
 def test_user_feedback_csv_schema():
     """Validates user_feedback.csv schema if it exists"""
     csv_path = 'data/feedback/user_feedback.csv'
@@ -9,14 +10,14 @@ def test_user_feedback_csv_schema():
     if not os.path.exists(csv_path):
         pytest.skip("user_feedback.csv does not exist yet")
 
-    df = pd.read_csv(csv_path)
+    columns, _ = read_csv_rows(csv_path)
 
     expected_columns = [
         'permit_slug', 'feedback_type', 'feedback_text',
         'helpful_count', 'created_at', 'approved', 'github_issue_number'
     ]
 
-    assert list(df.columns) == expected_columns, f"Column mismatch: {list(df.columns)}"
+    assert columns == expected_columns, f"Column mismatch: {columns}"
 
 def test_feedback_type_values():
     """Checks feedback_type values are valid"""
@@ -25,12 +26,12 @@ def test_feedback_type_values():
     if not os.path.exists(csv_path):
         pytest.skip("user_feedback.csv does not exist yet")
 
-    df = pd.read_csv(csv_path)
+    _, rows = read_csv_rows(csv_path)
 
     valid_types = ['tip', 'common_mistake', 'time_estimate', 'cost_note']
-    invalid = df[~df['feedback_type'].isin(valid_types)]
+    invalid = sorted({row['feedback_type'] for row in rows if row['feedback_type'] not in valid_types})
 
-    assert len(invalid) == 0, f"Invalid feedback_type values: {invalid['feedback_type'].unique()}"
+    assert len(invalid) == 0, f"Invalid feedback_type values: {invalid}"
 
 def test_approved_field():
     """Verifies approved field contains only 'yes' or 'no'"""
@@ -39,9 +40,9 @@ def test_approved_field():
     if not os.path.exists(csv_path):
         pytest.skip("user_feedback.csv does not exist yet")
 
-    df = pd.read_csv(csv_path)
+    _, rows = read_csv_rows(csv_path)
 
     valid_values = ['yes', 'no']
-    invalid = df[~df['approved'].isin(valid_values)]
+    invalid = sorted({row['approved'] for row in rows if row['approved'] not in valid_values})
 
-    assert len(invalid) == 0, f"Invalid approved values: {invalid['approved'].unique()}"
+    assert len(invalid) == 0, f"Invalid approved values: {invalid}"